@@ -20,11 +20,21 @@ Examples:
     python label-pr.py 1234 '[{"name":"label1"}]' --replace
     python label-pr.py 1234 '[{"name":"label1"}]' -r -d
     python label-pr.py 1234 '[]' --config custom-config.json
+
+Path patterns:
+    A pattern is a path prefix: "Bitwarden/" matches every file under Bitwarden/,
+    "project-pm.yml" matches that file. Path components may also be globs: "*", "?"
+    and "[...]" match within a component and "**" matches any number of components,
+    e.g. "**/*.xcstrings" or "BitwardenShared/**/Fixtures/". A pattern starting with
+    "!" keeps its label from being applied because of the files it matches, e.g.
+    "!BitwardenShared/**/*Tests.swift".
 """
 
 import argparse
+import fnmatch
 import json
 import os
+import re
 import subprocess
 import sys
 
@@ -109,19 +119,135 @@ def gh_replace_labels(pr_number: str, labels: list[str]) -> None:
         check=True
     )
 
+class _PathNode:
+    """A node of the path pattern trie, reached after matching some leading path components."""
+
+    def __init__(self):
+        self.children = {}     # Literal component -> node
+        self.globs = []        # (compiled glob, node) for glob components
+        self.any_depth = None  # Node for "**", which loops on any component
+        self.loops = False     # Whether this node is a "**" node
+        self.below = []        # (label, negated) for patterns ending in "/" here
+        self.prefixes = []     # (component prefix, (label, negated)) for patterns ending here
+        self.glob_ends = []    # (compiled glob, (label, negated)) for glob patterns ending here
+        self.closure = ()      # This node and the "**" nodes reachable from it without a component
+
+class PathMatcher:
+    """Path patterns for all labels, compiled into one trie of path components.
+
+    Each file is matched in a single walk of its path components, so the cost is linear
+    in the number of changed files rather than labels x files x patterns. See the module
+    docstring for the pattern syntax.
+    """
+
+    def __init__(self, path_patterns: dict):
+        self.root = _PathNode()
+        self.labels = set()
+        for label, patterns in path_patterns.items():
+            self.labels.add(label)
+            for pattern in patterns:
+                self._add(pattern, label)
+        self._link(self.root)
+
+    def _add(self, pattern: str, label: str) -> None:
+        negated = pattern.startswith("!")
+        mark = (label, negated)
+        pattern = pattern[1:] if negated else pattern
+        if pattern.endswith("/**"):
+            pattern = pattern[:-2]
+        components = pattern.split("/")
+        node = self.root
+        for component in components[:-1]:
+            node = self._child(node, component)
+        last = components[-1]
+        if last == "":
+            node.below.append(mark)  # Trailing "/": everything under the directory
+        elif last == "**":
+            self._child(node, last).below.append(mark)
+        elif _is_glob(last):
+            node.glob_ends.append((_compile_glob(last), mark))
+        else:
+            node.prefixes.append((last, mark))
+
+    @staticmethod
+    def _child(node: _PathNode, component: str) -> _PathNode:
+        if component == "**":
+            if node.any_depth is None:
+                node.any_depth = _PathNode()
+                node.any_depth.loops = True
+            return node.any_depth
+        if _is_glob(component):
+            glob = _compile_glob(component)
+            for existing, child in node.globs:
+                if existing.pattern == glob.pattern:
+                    return child
+            child = _PathNode()
+            node.globs.append((glob, child))
+            return child
+        return node.children.setdefault(component, _PathNode())
+
+    def _link(self, node: _PathNode) -> None:
+        """Precompute each node's closure once all patterns are added."""
+        closure = [node]
+        while closure[-1].any_depth is not None:
+            closure.append(closure[-1].any_depth)
+        node.closure = tuple(closure)
+        children = list(node.children.values()) + [child for _, child in node.globs]
+        if node.any_depth is not None:
+            children.append(node.any_depth)
+        for child in children:
+            self._link(child)
+
+    def match(self, file: str) -> set:
+        """Return the labels whose patterns match the file and whose negated patterns don't."""
+        matched = set()
+        active = self.root.closure
+        for component in file.split("/"):
+            next_nodes = []
+            for node in active:
+                if node.below:
+                    matched.update(node.below)
+                for prefix, mark in node.prefixes:
+                    if component.startswith(prefix):
+                        matched.add(mark)
+                for glob, mark in node.glob_ends:
+                    if glob.match(component):
+                        matched.add(mark)
+                child = node.children.get(component)
+                if child is not None:
+                    next_nodes.extend(child.closure)
+                for glob, child in node.globs:
+                    if glob.match(component):
+                        next_nodes.extend(child.closure)
+                if node.loops:
+                    next_nodes.append(node)
+            if not next_nodes:
+                break
+            # Several patterns can lead to the same node through "**".
+            active = dict.fromkeys(next_nodes) if len(next_nodes) > 1 else next_nodes
+        negated = {label for label, is_negated in matched if is_negated}
+        return {label for label, is_negated in matched if not is_negated and label not in negated}
+
+def _is_glob(component: str) -> bool:
+    return any(char in component for char in "*?[")
+
+def _compile_glob(component: str) -> re.Pattern:
+    return re.compile(fnmatch.translate(component))
+
 def label_filepaths(changed_files: list[str], path_patterns: dict) -> list[str]:
     """Check changed files against path patterns and return labels to apply."""
     if not changed_files:
         return []
 
     labels_to_apply = set()  # Use set to avoid duplicates
-
-    for label, patterns in path_patterns.items():
-        for file in changed_files:
-            if any(file.startswith(pattern) for pattern in patterns):
-                print(f"👀 File '{file}' matches pattern for label '{label}'")
-                labels_to_apply.add(label)
-                break
+    matcher = PathMatcher(path_patterns)
+
+    for file in changed_files:
+        for label in sorted(matcher.match(file) - labels_to_apply):
+            print(f"👀 File '{file}' matches pattern for label '{label}'")
+            labels_to_apply.add(label)
+        if labels_to_apply == matcher.labels:
+            break
 
     if "app:shared" in labels_to_apply:
         labels_to_apply.add("app:password-manager")
@@ -0,0 +1,100 @@
+"""Tests for label-pr.py's path pattern matching."""
+
+import contextlib
+import importlib.util
+import io
+import os
+import unittest
+
+_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "label-pr.py")
+_spec = importlib.util.spec_from_file_location("label_pr", _SCRIPT)
+label_pr = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(label_pr)
+
+
+class TestPathMatcher(unittest.TestCase):
+    """PathMatcher.match applies prefix, glob, "**" and negated patterns."""
+
+    def _match(self, patterns: dict, file: str) -> set:
+        return label_pr.PathMatcher(patterns).match(file)
+
+    def test_trailing_slash_matches_everything_under_the_directory(self):
+        patterns = {"app:password-manager": ["Bitwarden/"]}
+        self.assertEqual(self._match(patterns, "Bitwarden/Application/AppDelegate.swift"), {"app:password-manager"})
+        self.assertEqual(self._match(patterns, "Bitwarden"), set())
+        self.assertEqual(self._match(patterns, "BitwardenShared/Core.swift"), set())
+
+    def test_last_literal_component_matches_as_a_prefix(self):
+        self.assertEqual(self._match({"t:ci": ["project-pm.yml"]}, "project-pm.yml"), {"t:ci"})
+        self.assertEqual(self._match({"t:ci": ["project-pm.yml"]}, "project-pm.yml.orig"), {"t:ci"})
+        self.assertEqual(self._match({"t:ci": [".github/work"]}, ".github/workflows/test.yml"), {"t:ci"})
+        self.assertEqual(self._match({"app:shared": ["Bitwarden"]}, "BitwardenShared/Core.swift"),
+                         {"app:shared"})
+        self.assertEqual(self._match({"t:ci": ["project-pm.yml"]}, "Configs/project-pm.yml"), set())
+
+    def test_double_star_suffix_does_not_match_the_directory_itself(self):
+        patterns = {"t:docs": ["docs/**"]}
+        self.assertEqual(self._match(patterns, "docs"), set())
+        self.assertEqual(self._match(patterns, "docs/README.md"), {"t:docs"})
+        self.assertEqual(self._match(patterns, "docs/images/a/b.png"), {"t:docs"})
+
+    def test_double_star_matches_any_number_of_components(self):
+        patterns = {"t:l10n": ["**/*.xcstrings"], "t:fixtures": ["BitwardenShared/**/Fixtures/"]}
+        self.assertEqual(self._match(patterns, "Localizable.xcstrings"), {"t:l10n"})
+        self.assertEqual(self._match(patterns, "BitwardenResources/Localizations/Localizable.xcstrings"),
+                         {"t:l10n"})
+        self.assertEqual(self._match(patterns, "BitwardenShared/Fixtures/a.json"), {"t:fixtures"})
+        self.assertEqual(self._match(patterns, "BitwardenShared/Core/Vault/Fixtures/a.json"), {"t:fixtures"})
+        self.assertEqual(self._match(patterns, "BitwardenShared/Core/Fixtures.swift"), set())
+
+    def test_globs_match_within_one_component(self):
+        patterns = {"t:tests": ["BitwardenShared/*/Test?.swift", "Scripts/[ab]*.sh"]}
+        self.assertEqual(self._match(patterns, "BitwardenShared/Core/Tests.swift"), {"t:tests"})
+        self.assertEqual(self._match(patterns, "BitwardenShared/Core/Vault/Tests.swift"), set())
+        self.assertEqual(self._match(patterns, "Scripts/bootstrap.sh"), {"t:tests"})
+        self.assertEqual(self._match(patterns, "Scripts/update.sh"), set())
+
+    def test_negated_pattern_suppresses_its_own_label_only(self):
+        patterns = {
+            "app:shared": ["BitwardenShared/", "!BitwardenShared/**/*Tests.swift"],
+            "t:tests": ["**/*Tests.swift"],
+        }
+        self.assertEqual(self._match(patterns, "BitwardenShared/UI/VaultTests.swift"), {"t:tests"})
+        self.assertEqual(self._match(patterns, "BitwardenShared/UI/Vault.swift"), {"app:shared"})
+
+    def test_negated_pattern_wins_over_a_positive_pattern_for_the_same_label(self):
+        patterns = {"app:shared": ["BitwardenShared/", "!BitwardenShared/Sourcery/"]}
+        self.assertEqual(self._match(patterns, "BitwardenShared/Sourcery/Generated.swift"), set())
+
+
+class TestLabelFilepaths(unittest.TestCase):
+    """label_filepaths collects labels over every changed file."""
+
+    def _labels(self, changed_files: list, path_patterns: dict) -> list:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sorted(label_pr.label_filepaths(changed_files, path_patterns))
+
+    def test_labels_from_every_file(self):
+        patterns = {"app:password-manager": ["Bitwarden/"], "t:ci": [".github/"], "t:docs": ["docs/**"]}
+        files = ["Bitwarden/App.swift", ".github/workflows/test.yml", "README.md"]
+        self.assertEqual(self._labels(files, patterns), ["app:password-manager", "t:ci"])
+
+    def test_shared_label_expands_to_both_apps(self):
+        patterns = {"app:shared": ["BitwardenShared/"]}
+        self.assertEqual(self._labels(["BitwardenShared/Core.swift"], patterns),
+                         ["app:authenticator", "app:password-manager"])
+
+    def test_negated_files_do_not_label(self):
+        patterns = {"app:shared": ["BitwardenShared/", "!BitwardenShared/**/*Tests.swift"]}
+        self.assertEqual(self._labels(["BitwardenShared/UI/VaultTests.swift"], patterns), [])
+        self.assertEqual(
+            self._labels(["BitwardenShared/UI/VaultTests.swift", "BitwardenShared/UI/Vault.swift"], patterns),
+            ["app:authenticator", "app:password-manager"],
+        )
+
+    def test_no_changed_files(self):
+        self.assertEqual(self._labels([], {"t:ci": [".github/"]}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,21 +4,27 @@ delete_unused_strings
 Finds and removes string entries from a Localizable.strings file whose keys are
 never referenced in Swift source code. Keys are assumed to be accessed via
 ``Localizations.X``, where ``X`` is the SwiftGen-generated identifier for the
-key (first character lowercased). Any comment block immediately preceding a
-removed entry (with no blank lines between them) is also removed.
+key (first character lowercased). References inside comments and string
+literals are ignored. A key that appears verbatim as a Swift string literal
+(e.g. ``NSLocalizedString("Key", ...)`` or ``String(localized: "Key")``) is
+also treated as used. Any comment block immediately preceding a removed entry
+(with no blank lines between them) is also removed.
+
+Because keys are matched by a normalized identifier, two keys that normalize
+to the same identifier cannot be told apart, so the table is checked for such
+collisions before anything is removed.
 """
 
 import os
-import re
 
-from strings_file_utils import filter_entries
+from key_collisions import KeyCollisionError, KeyLocation, find_collisions, normalized_identifier
+from strings_file_utils import filter_entries, iter_entries
+from swift_lexer import find_localization_references, scan_swift_source
 
-# Matches any `Localizations.identifier` reference in Swift source, including
-# cases where the identifier is on the next line (e.g. `Localizations\n    .foo`).
-_LOCALIZATIONS_RE = re.compile(r'Localizations\s*\.([a-zA-Z_][a-zA-Z0-9_]*)')
-
-# Matches any character that is not valid in a Swift identifier.
-_NON_IDENTIFIER_RE = re.compile(r'[^a-zA-Z0-9_]')
+# Appear in the header of SwiftGen output and of `generate_localizations`
+# output. The generated Localizations.swift passes every key to `tr(...)` as a
+# literal, so its literals must not count.
+_GENERATED_MARKERS = ("Generated using SwiftGen", "Generated using fix-localizable-strings")
 
 
 def _normalize_key(key: str) -> str:
@@ -36,7 +42,7 @@ def _normalize_key(key: str) -> str:
     Returns:
         The normalized, lowercased key suitable for comparison.
     """
-    return _NON_IDENTIFIER_RE.sub('', key).lower()
+    return normalized_identifier(key)
 
 
 def find_used_keys(swift_sources: list[str]) -> set[str]:
@@ -48,7 +54,9 @@ def find_used_keys(swift_sources: list[str]) -> set[str]:
     treated as the same key, in practice we're not likely to have keys that
     only differ by case.
 
-    The internal helper ``Localizations.tr(...)`` is excluded.
+    References inside comments (including commented-out code) and string
+    literals are ignored; see ``swift_lexer``. The internal helper
+    ``Localizations.tr(...)`` is excluded.
 
     Args:
         swift_sources: A list of strings, each being the full text of a Swift
@@ -60,41 +68,135 @@ def find_used_keys(swift_sources: list[str]) -> set[str]:
     """
     result: set[str] = set()
     for content in swift_sources:
-        for identifier in _LOCALIZATIONS_RE.findall(content):
-            if identifier == "tr":
+        for reference in find_localization_references(content):
+            if reference.identifier == "tr":
                 continue
-            result.add(identifier.lower())
+            result.add(reference.identifier.lower())
     return result
 
 
+def scan_swift_sources(swift_sources: list[str]) -> tuple[set[str], set[str]]:
+    """Scan Swift file contents for ``Localizations.X`` references and literals.
+
+    Like ``find_used_keys``, but also collects the contents of every constant
+    string literal in the same pass, so that keys looked up by a raw string
+    can be found with one set intersection rather than a search per key.
+    Literals in generated Localizations files are skipped.
+
+    Args:
+        swift_sources: A list of strings, each being the full text of a Swift
+            source file.
+
+    Returns:
+        A tuple of ``(used_keys, string_literals)`` where ``used_keys`` is the
+        set of lowercased identifiers, as returned by ``find_used_keys``, and
+        ``string_literals`` is the set of raw string literal contents.
+    """
+    used_keys: set[str] = set()
+    string_literals: set[str] = set()
+    for content in swift_sources:
+        scan = scan_swift_source(content)
+        for reference in scan.references:
+            if reference.identifier == "tr":
+                continue
+            used_keys.add(reference.identifier.lower())
+        header = content[:500]
+        if not any(marker in header for marker in _GENERATED_MARKERS):
+            string_literals |= scan.string_literals
+    return used_keys, string_literals
+
+
+def find_swift_files(swift_dirs: list[str]) -> list[str]:
+    """Find every ``.swift`` file recursively under ``swift_dirs``.
+
+    Args:
+        swift_dirs: List of directory paths to search recursively for Swift
+            source files.
+
+    Returns:
+        The path of each Swift file.
+    """
+    paths: list[str] = []
+    for swift_dir in swift_dirs:
+        for dirpath, _, filenames in os.walk(swift_dir):
+            for filename in filenames:
+                if filename.endswith(".swift"):
+                    paths.append(os.path.join(dirpath, filename))
+    return paths
+
+
+def read_swift_sources(swift_dirs: list[str]) -> list[str]:
+    """Read every ``.swift`` file found recursively under ``swift_dirs``.
+
+    Args:
+        swift_dirs: List of directory paths to search recursively for Swift
+            source files.
+
+    Returns:
+        The contents of each Swift file.
+    """
+    swift_sources: list[str] = []
+    for filepath in find_swift_files(swift_dirs):
+        with open(filepath, encoding="utf-8") as f:
+            swift_sources.append(f.read())
+    return swift_sources
+
+
 def delete_unused_content(
-    strings_content: str, used_keys: set[str]
+    strings_content: str,
+    used_keys: set[str],
+    string_literals: set[str] | frozenset[str] = frozenset(),
 ) -> tuple[str, list[str]]:
     """Remove unused key entries from Localizable.strings content.
 
-    Processes content line by line. Any key not present in ``used_keys`` is
-    removed. Any comment block (``/* */`` or ``//``) immediately preceding a
-    removed entry — with no intervening blank lines — is also removed.
+    Processes content line by line. Any key not present in ``used_keys``, and
+    not itself one of ``string_literals``, is removed. Any comment block
+    (``/* */`` or ``//``) immediately preceding a removed entry — with no
+    intervening blank lines — is also removed.
+
+    Before filtering, the keys are checked for identifier collisions (see
+    ``key_collisions``), since a reference to one colliding key would keep
+    them all, or a missing reference drop them all.
 
     Args:
         strings_content: The full text of the ``.strings`` file.
         used_keys: The set of lowercased identifiers (as returned by
             ``find_used_keys``) that are considered in-use. Each key from the
             strings file is lowercased before lookup to match.
+        string_literals: The set of Swift string literal contents (as
+            returned by ``scan_swift_sources``). A raw key in this set is
+            considered in-use.
 
     Returns:
         A tuple of ``(new_content, removed_keys)`` where ``new_content`` is the
         filtered file text and ``removed_keys`` is a list of keys that were
         removed, in file order.
+
+    Raises:
+        KeyCollisionError: If two distinct keys share an identifier.
     """
-    return filter_entries(strings_content, lambda key: _normalize_key(key) in used_keys)
+    entries = list(iter_entries(strings_content.splitlines(keepends=True)))
+    collisions = find_collisions(
+        KeyLocation(entry.key, None, entry.line_number) for entry in entries
+    )
+    if collisions:
+        raise KeyCollisionError(collisions)
+
+    keys = {entry.key for entry in entries}
+    literal_keys = keys & string_literals
+
+    return filter_entries(
+        strings_content,
+        lambda key: key in literal_keys or _normalize_key(key) in used_keys,
+    )
 
 
 def delete_unused(strings_path: str, swift_dirs: list[str]) -> list[str]:
     """Remove unused entries from a Localizable.strings file in place.
 
     Walks each directory in ``swift_dirs`` recursively for ``.swift`` files,
-    reads them, determines which keys are referenced, then removes any
+    reads them, determines which keys are referenced either as
+    ``Localizations.X`` or as a raw string literal, then removes any
     unreferenced keys from the strings file.
 
     Args:
@@ -105,22 +207,17 @@ def delete_unused(strings_path: str, swift_dirs: list[str]) -> list[str]:
     Returns:
         A list of keys that were removed, in file order. Returns an empty list
         if no unused keys were found.
-    """
-    swift_sources: list[str] = []
-    for swift_dir in swift_dirs:
-        for dirpath, _, filenames in os.walk(swift_dir):
-            for filename in filenames:
-                if filename.endswith(".swift"):
-                    filepath = os.path.join(dirpath, filename)
-                    with open(filepath, encoding="utf-8") as f:
-                        swift_sources.append(f.read())
 
-    used_keys = find_used_keys(swift_sources)
+    Raises:
+        KeyCollisionError: If two distinct keys share an identifier. The file
+            is left unchanged.
+    """
+    used_keys, string_literals = scan_swift_sources(read_swift_sources(swift_dirs))
 
     with open(strings_path, encoding="utf-8") as f:
         content = f.read()
 
-    new_content, removed = delete_unused_content(content, used_keys)
+    new_content, removed = delete_unused_content(content, used_keys, string_literals)
 
     if removed:
         with open(strings_path, "w", encoding="utf-8") as f:
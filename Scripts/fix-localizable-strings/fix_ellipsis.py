@@ -2,18 +2,15 @@
 fix_ellipsis
 
 Converts literal three-dot sequences (...) to the Unicode ellipsis character (…)
-in the values of Localizable.strings entries.
+in the values of Localizable.strings entries. This is the ``ellipsis`` rule of
+``normalize_strings`` on its own, for the pre-commit hook and cleanup script.
 """
 
-import re
+from normalize_strings import Normalizer, normalize
 
-# Matches a complete key/value entry line, capturing key and value separately.
-_ENTRY_VALUE_RE = re.compile(
-    r'^\s*"(?P<key>(?:[^"\\]|\\.)*)"'
-    r'\s*=\s*"'
-    r'(?P<value>(?:[^"\\]|\\.)*)'
-    r'"\s*;\s*$'
-)
+# The ellipsis rule is the one every locale shares, so it is applied without
+# regard to the file's locale.
+_ELLIPSIS_NORMALIZER = Normalizer.for_locale(None, ["ellipsis"])
 
 
 def fix_ellipsis(content: str) -> tuple[str, list[str]]:
@@ -33,22 +30,8 @@ def fix_ellipsis(content: str) -> tuple[str, list[str]]:
         updated file text and ``changed_keys`` is a list of keys whose values
         were modified, in the order they were encountered.
     """
-    lines = content.splitlines(keepends=True)
-    output: list[str] = []
-    changed_keys: list[str] = []
-
-    for line in lines:
-        m = _ENTRY_VALUE_RE.match(line)
-        if m and "..." in m.group("value"):
-            start = m.start("value")
-            end = m.end("value")
-            new_value = m.group("value").replace("...", "…")
-            output.append(line[:start] + new_value + line[end:])
-            changed_keys.append(m.group("key"))
-        else:
-            output.append(line)
-
-    return "".join(output), changed_keys
+    new_content, changed = normalize(content, _ELLIPSIS_NORMALIZER)
+    return new_content, changed.get("ellipsis", [])
 
 
 def fix_ellipsis_file(strings_path: str) -> list[str]:
@@ -0,0 +1,355 @@
+"""
+generate_localizations
+
+Generates the ``Localizations`` Swift enum from the English strings table,
+following the layout of SwiftGen's ``structured-swift5`` strings template, so
+that the build does not need to run SwiftGen when the strings are unchanged.
+
+A digest of the inputs and options is written into the header of the
+generated file. When it matches, nothing is parsed or written, so the file's
+modification time is untouched and Xcode does not recompile the module that
+contains it.
+"""
+
+import hashlib
+import os
+import re
+from typing import NamedTuple
+
+from key_collisions import swiftgen_identifier
+from strings_file_utils import iter_entries, unescape_value
+from stringsdict_file_utils import iter_stringsdict_entries
+
+# Bump when the generated output changes, so existing files are regenerated.
+_GENERATOR_VERSION = "1"
+
+_HASH_PREFIX = "// Inputs: "
+
+_HEADER = (
+    "// swiftlint:disable all\n"
+    "// Generated using fix-localizable-strings generate, following SwiftGen's structured-swift5 template.\n"
+    "{hash_line}\n"
+    "\n"
+    "import Foundation\n"
+    "\n"
+    "// swiftlint:disable superfluous_disable_command file_length implicit_return prefer_self_in_static_references\n"
+    "\n"
+    "// MARK: - Strings\n"
+    "\n"
+    "// swiftlint:disable explicit_type_interface function_parameter_count identifier_name line_length\n"
+    "// swiftlint:disable nesting type_body_length type_name vertical_whitespace_opening_braces\n"
+)
+
+_FOOTER = (
+    "// swiftlint:enable explicit_type_interface function_parameter_count identifier_name line_length\n"
+    "// swiftlint:enable nesting type_body_length type_name vertical_whitespace_opening_braces\n"
+    "\n"
+    "// MARK: - Implementation Details\n"
+    "\n"
+    "extension {enum_name} {{\n"
+    "  private static func tr(_ table: String, _ key: String, _ args: CVarArg..., fallback value: String) -> String {{\n"
+    "    let format = {lookup}\n"
+    "    return String(format: format, locale: Locale.current, arguments: args)\n"
+    "  }}\n"
+    "}}\n"
+)
+
+_BUNDLE_TOKEN = (
+    "\n"
+    "// swiftlint:disable convenience_type\n"
+    "private final class BundleToken {\n"
+    "  static let bundle: Bundle = {\n"
+    "    #if SWIFT_PACKAGE\n"
+    "    return Bundle.module\n"
+    "    #else\n"
+    "    return Bundle(for: BundleToken.self)\n"
+    "    #endif\n"
+    "  }()\n"
+    "}\n"
+    "// swiftlint:enable convenience_type\n"
+)
+
+# Matches a printf-style placeholder, or `%%`, in a format string.
+_PLACEHOLDER_RE = re.compile(
+    r'%(?:(?P<position>[1-9]\d*)\$)?[-+# 0]*\d*(?:\.\d*)?'
+    r'(?:hh|h|ll|l|q|z|t|j|L)?(?P<type>[@%dDiuUxXoOfFeEgGaAcCsSp])'
+)
+
+# Matches a `%#@name@` or positional `%1$#@name@` stringsdict variable.
+_VARIABLE_RE = re.compile(r'%(?:(?P<position>[1-9]\d*)\$)?#@(?P<name>[^@]+)@')
+
+_PLACEHOLDER_TYPES = {
+    **dict.fromkeys("@", "String"),
+    **dict.fromkeys("dDiuUxXoO", "Int"),
+    **dict.fromkeys("fFeEgGaA", "Float"),
+    **dict.fromkeys("cC", "CChar"),
+    **dict.fromkeys("sS", "UnsafePointer<CChar>"),
+    **dict.fromkeys("p", "UnsafeRawPointer"),
+}
+
+# Swift keywords that SwiftGen's `escapeReservedKeywords` wraps in backticks.
+_SWIFT_KEYWORDS = frozenset({
+    "associatedtype", "class", "deinit", "enum", "extension", "fileprivate",
+    "func", "import", "init", "inout", "internal", "let", "open", "operator",
+    "private", "protocol", "public", "static", "struct", "subscript",
+    "typealias", "var", "break", "case", "continue", "default", "defer", "do",
+    "else", "fallthrough", "for", "guard", "if", "in", "repeat", "return",
+    "switch", "where", "while", "as", "Any", "catch", "false", "is", "nil",
+    "rethrows", "super", "self", "Self", "throw", "throws", "true", "try", "_",
+})
+
+
+class LocalizedString(NamedTuple):
+    """One member of the generated enum.
+
+    ``translation`` is the English text used as the lookup fallback and,
+    when there is no comment, as the documentation comment. ``types`` are the
+    Swift types of the format arguments, in argument order.
+    """
+
+    key: str
+    comment: str | None
+    translation: str
+    types: list[str]
+
+
+def placeholder_types(format_string: str) -> list[str]:
+    """Return the Swift types of the arguments of a format string.
+
+    Args:
+        format_string: A printf-style format string such as ``"%1$@ of %2$d"``.
+
+    Returns:
+        The type of each argument, in argument order.
+    """
+    types: dict[int, str] = {}
+    next_position = 1
+    for m in _PLACEHOLDER_RE.finditer(format_string):
+        if m.group("type") == "%":
+            continue
+        position = int(m.group("position") or next_position)
+        types.setdefault(position, _PLACEHOLDER_TYPES[m.group("type")])
+        next_position = position + 1
+    return [types[position] for position in sorted(types)]
+
+
+def _stringsdict_types(format_string: str, value_types: dict[str, str]) -> list[str]:
+    # Each `%#@name@` variable stands for one argument of its value type.
+    resolved = _VARIABLE_RE.sub(
+        lambda m: f"%{m.group('position') + '$' if m.group('position') else ''}"
+        f"{value_types.get(m.group('name'), '@')}",
+        format_string,
+    )
+    return placeholder_types(resolved)
+
+
+def read_localized_strings(strings_path: str, stringsdict_path: str | None = None) -> list[LocalizedString]:
+    """Read the members of the enum from a strings table.
+
+    When a key occurs more than once, the first occurrence wins. Keys are
+    sorted case-insensitively, as SwiftGen sorts them.
+
+    Args:
+        strings_path: Path to the source language ``.strings`` file.
+        stringsdict_path: Path to the matching ``.stringsdict`` file, if any.
+
+    Returns:
+        The members, sorted by key.
+    """
+    strings: dict[str, LocalizedString] = {}
+    with open(strings_path, encoding="utf-8") as f:
+        for entry in iter_entries(f):
+            key = unescape_value(entry.key)
+            if key in strings:
+                continue
+            translation = unescape_value(entry.value)
+            strings[key] = LocalizedString(
+                key, entry.comment, translation, placeholder_types(translation)
+            )
+
+    if stringsdict_path is not None:
+        for entry in iter_stringsdict_entries(stringsdict_path):
+            value_types = {variable.name: variable.value_type for variable in entry.variables}
+            strings[entry.key] = LocalizedString(
+                entry.key,
+                None,
+                f'Plural format key: "{entry.format}"',
+                _stringsdict_types(entry.format, value_types),
+            )
+
+    return sorted(strings.values(), key=lambda string: string.key.lower())
+
+
+def _swift_literal(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+    )
+
+
+def _member_name(key: str) -> str:
+    name = swiftgen_identifier(key)
+    return f"`{name}`" if name in _SWIFT_KEYWORDS else name
+
+
+def _render_member(string: LocalizedString, table: str, enum_name: str, access: str, lookup: bool) -> str:
+    lines = [f"  /// {line}" for line in (string.comment or string.translation).split("\n")]
+    name = _member_name(string.key)
+    key = _swift_literal(string.key)
+    fallback = _swift_literal(string.translation)
+    if string.types:
+        parameters = ", ".join(
+            f"_ p{index}: {'Any' if type_ == 'String' else type_}"
+            for index, type_ in enumerate(string.types, start=1)
+        )
+        arguments = ", ".join(
+            f"String(describing: p{index})" if type_ == "String"
+            else f"Int(bitPattern: p{index})" if type_ == "UnsafeRawPointer"
+            else f"p{index}"
+            for index, type_ in enumerate(string.types, start=1)
+        )
+        lines.append(f"  {access} static func {name}({parameters}) -> String {{")
+        lines.append(
+            f'    return {enum_name}.tr("{table}", "{key}", {arguments}, fallback: "{fallback}")'
+        )
+        lines.append("  }")
+    elif lookup:
+        lines.append(
+            f'  {access} static var {name}: String {{ return {enum_name}.tr("{table}", "{key}", '
+            f'fallback: "{fallback}") }}'
+        )
+    else:
+        lines.append(
+            f'  {access} static let {name} = {enum_name}.tr("{table}", "{key}", fallback: "{fallback}")'
+        )
+    return "\n".join(lines) + "\n"
+
+
+def render_localizations(
+    strings: list[LocalizedString],
+    table: str = "Localizable",
+    enum_name: str = "Localizations",
+    public_access: bool = True,
+    lookup_function: str | None = None,
+    inputs_hash: str = "",
+) -> str:
+    """Render the Swift source of the enum.
+
+    Args:
+        strings: The members, as returned by ``read_localized_strings``.
+        table: The strings table name passed to the lookup.
+        enum_name: The name of the generated enum.
+        public_access: Whether the enum and its members are ``public``.
+        lookup_function: A function with the signature ``(key:table:
+            fallbackValue:)`` used to look strings up, as SwiftGen's
+            ``lookupFunction`` parameter. ``None`` uses the bundle of the
+            generated file.
+        inputs_hash: The digest to record in the header.
+
+    Returns:
+        The Swift source.
+    """
+    access = "public" if public_access else "internal"
+    parts = [
+        _HEADER.format(hash_line=f"{_HASH_PREFIX}{inputs_hash}"),
+        f"{access} enum {enum_name} {{\n",
+    ]
+    parts.extend(
+        _render_member(string, table, enum_name, access, lookup_function is not None)
+        for string in strings
+    )
+    parts.append("}\n")
+    if lookup_function is not None:
+        lookup = f"{lookup_function}(key, table, value)"
+    else:
+        lookup = "BundleToken.bundle.localizedString(forKey: key, value: value, table: table)"
+    parts.append(_FOOTER.format(enum_name=enum_name, lookup=lookup))
+    if lookup_function is None:
+        parts.append(_BUNDLE_TOKEN)
+    return "".join(parts)
+
+
+def inputs_digest(paths: list[str], options: tuple) -> str:
+    """Return a digest of the contents of ``paths`` and the generator options.
+
+    Args:
+        paths: The input files. Missing files are hashed as absent.
+        options: Any options that affect the output.
+
+    Returns:
+        A hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((_GENERATOR_VERSION, options)).encode("utf-8"))
+    for path in paths:
+        digest.update(b"\0")
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _recorded_digest(output_path: str) -> str | None:
+    if not os.path.isfile(output_path):
+        return None
+    with open(output_path, encoding="utf-8") as f:
+        for _ in range(3):
+            line = f.readline()
+            if line.startswith(_HASH_PREFIX):
+                return line[len(_HASH_PREFIX):].strip()
+    return None
+
+
+def generate_localizations(
+    strings_path: str,
+    output_path: str,
+    stringsdict_path: str | None = None,
+    enum_name: str = "Localizations",
+    public_access: bool = True,
+    lookup_function: str | None = None,
+    force: bool = False,
+) -> bool:
+    """Write the enum for a strings table, unless its inputs are unchanged.
+
+    Args:
+        strings_path: Path to the source language ``.strings`` file.
+        output_path: Path of the Swift file to write.
+        stringsdict_path: Path to the matching ``.stringsdict`` file. ``None``
+            uses the file next to ``strings_path`` if there is one.
+        enum_name: The name of the generated enum.
+        public_access: Whether the enum and its members are ``public``.
+        lookup_function: See ``render_localizations``.
+        force: Regenerate even if the recorded digest matches.
+
+    Returns:
+        ``True`` if the file was written, ``False`` if it was up to date.
+    """
+    if stringsdict_path is None:
+        candidate = os.path.splitext(strings_path)[0] + ".stringsdict"
+        if os.path.isfile(candidate):
+            stringsdict_path = candidate
+
+    table = os.path.splitext(os.path.basename(strings_path))[0]
+    digest = inputs_digest(
+        [strings_path] + ([stringsdict_path] if stringsdict_path else []),
+        (table, enum_name, public_access, lookup_function),
+    )
+    if not force and _recorded_digest(output_path) == digest:
+        return False
+
+    content = render_localizations(
+        read_localized_strings(strings_path, stringsdict_path),
+        table=table,
+        enum_name=enum_name,
+        public_access=public_access,
+        lookup_function=lookup_function,
+        inputs_hash=digest,
+    )
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
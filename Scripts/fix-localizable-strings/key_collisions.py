@@ -0,0 +1,241 @@
+"""
+key_collisions
+
+Finds keys of a strings table that map to the same Swift identifier.
+
+SwiftGen turns each key into a property name by dropping characters that are
+not valid in Swift identifiers and camel-casing the rest, so distinct keys
+such as ``"Name?"`` and ``"Name"`` produce the same ``Localizations.name``.
+``delete_unused`` compares keys case-insensitively as well, so ``"Ok"`` and
+``"OK"`` are indistinguishable to it. When two keys collide like this,
+either SwiftGen output is ambiguous or ``delete_unused`` may keep or drop the
+wrong entry, so collisions are reported up front.
+"""
+
+import os
+import re
+import xml.parsers.expat
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from strings_file_utils import iter_entries
+
+# Matches any run of characters that are not valid in a Swift identifier.
+# Swift identifiers may use Unicode letters and digits, not just ASCII ones.
+_NON_IDENTIFIER_RE = re.compile(r'\W+')
+
+# Collision kinds, in the order they are reported.
+IDENTIFIER = "identifier"
+NORMALIZED = "normalized"
+
+
+class KeyLocation(NamedTuple):
+    """Where a key is defined. ``path`` is ``None`` for in-memory content."""
+
+    key: str
+    path: str | None
+    line_number: int
+
+
+class CollisionGroup(NamedTuple):
+    """Two or more distinct keys that share an identifier.
+
+    ``kind`` is ``"identifier"`` when the keys produce the same SwiftGen
+    property name, or ``"normalized"`` when they only match once lowercased,
+    as ``delete_unused`` compares them.
+    """
+
+    kind: str
+    identifier: str
+    locations: list[KeyLocation]
+
+
+class KeyCollisionError(Exception):
+    """Raised when a strings table has keys whose identifiers collide."""
+
+    def __init__(self, groups: list[CollisionGroup]):
+        self.groups = groups
+        keys = "; ".join(
+            ", ".join(location.key for location in group.locations) for group in groups
+        )
+        super().__init__(f"Keys with colliding identifiers: {keys}")
+
+
+def _lower_first_word(name: str) -> str:
+    # Lowercases the leading run of capitals, leaving the last one alone when
+    # it starts the next word: "URLSession" -> "urlSession", "OK" -> "ok".
+    index = 0
+    while index < len(name) and name[index].isupper():
+        index += 1
+    if 1 < index < len(name) and name[index].islower():
+        index -= 1
+    return name[:index].lower() + name[index:]
+
+
+def swiftgen_identifier(key: str) -> str:
+    """Return the property name SwiftGen generates for a key.
+
+    This mirrors the ``swiftIdentifier:"pretty"|lowerFirstWord`` filters used
+    by the structured-swift5 template: invalid characters split the key into
+    words, which are joined in camel case, and the first word is lowercased.
+    A name that would start with a digit is prefixed with ``_``. Keywords are
+    returned without the backticks the template adds.
+
+    Args:
+        key: A raw ``.strings`` key.
+
+    Returns:
+        The Swift property name, e.g. ``"needSomeInspiration"`` for
+        ``"NeedSomeInspiration?"`` or ``"_1Password"`` for ``"1Password"``.
+    """
+    words = [word for word in _NON_IDENTIFIER_RE.split(key) if word]
+    words = [word for part in words for word in part.split("_") if word]
+    if any(c.islower() for c in key):
+        name = "".join(word[0].upper() + word[1:] for word in words)
+    else:
+        name = "".join(word.capitalize() for word in words)
+    return _prefix_leading_digit(_lower_first_word(name))
+
+
+def _prefix_leading_digit(name: str) -> str:
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def normalized_identifier(key: str) -> str:
+    """Return the case-insensitive form of a key used by ``delete_unused``.
+
+    Characters that are not valid in Swift identifiers are stripped, as
+    SwiftGen does when generating property names (e.g.
+    ``"NeedSomeInspiration?"`` becomes ``needSomeInspiration``), a leading
+    digit is prefixed with ``_`` as it is in the property name, and the result
+    is lowercased.
+
+    Args:
+        key: A raw ``.strings`` key.
+
+    Returns:
+        The normalized, lowercased key.
+    """
+    return _prefix_leading_digit(_NON_IDENTIFIER_RE.sub('', key)).lower()
+
+
+def find_collisions(locations: Iterable[KeyLocation]) -> list[CollisionGroup]:
+    """Group distinct keys by their SwiftGen and normalized identifiers.
+
+    Both groupings are built in a single pass. A key defined more than once
+    is not a collision with itself (see ``delete_duplicates``); only its first
+    location is kept. A normalized group is only reported when its keys do
+    not all share one SwiftGen identifier, since that is already reported.
+
+    Args:
+        locations: The keys of a table and where they are defined.
+
+    Returns:
+        The collision groups, SwiftGen identifier collisions first, each
+        ordered by first definition.
+    """
+    first_locations: dict[str, KeyLocation] = {}
+    by_identifier: dict[str, list[str]] = {}
+    by_normalized: dict[str, list[str]] = {}
+    for location in locations:
+        if location.key in first_locations:
+            continue
+        first_locations[location.key] = location
+        by_identifier.setdefault(swiftgen_identifier(location.key), []).append(location.key)
+        by_normalized.setdefault(normalized_identifier(location.key), []).append(location.key)
+
+    groups: list[CollisionGroup] = []
+    for identifier, keys in by_identifier.items():
+        if len(keys) > 1:
+            groups.append(
+                CollisionGroup(IDENTIFIER, identifier, [first_locations[key] for key in keys])
+            )
+    for identifier, keys in by_normalized.items():
+        if len(keys) > 1 and len({swiftgen_identifier(key) for key in keys}) > 1:
+            groups.append(
+                CollisionGroup(NORMALIZED, identifier, [first_locations[key] for key in keys])
+            )
+    return groups
+
+
+def stringsdict_key_locations(stringsdict_path: str) -> list[KeyLocation]:
+    """Return the top-level keys of a ``.stringsdict`` file with line numbers.
+
+    Args:
+        stringsdict_path: Path to the ``.stringsdict`` file to read.
+
+    Returns:
+        The keys of the root dictionary, in file order.
+    """
+    locations: list[KeyLocation] = []
+    parser = xml.parsers.expat.ParserCreate()
+    depth = 0
+    current: list[str] | None = None
+    line_number = 0
+
+    def start(name: str, _attributes: dict) -> None:
+        nonlocal depth, current, line_number
+        depth += 1
+        # <plist> is depth 1, the root <dict> depth 2 and its keys depth 3.
+        if depth == 3 and name == "key":
+            current = []
+            line_number = parser.CurrentLineNumber
+
+    def end(name: str) -> None:
+        nonlocal depth, current
+        if depth == 3 and current is not None:
+            locations.append(KeyLocation("".join(current), stringsdict_path, line_number))
+            current = None
+        depth -= 1
+
+    def characters(data: str) -> None:
+        if current is not None:
+            current.append(data)
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = characters
+    with open(stringsdict_path, "rb") as f:
+        parser.ParseFile(f)
+    return locations
+
+
+def table_key_locations(strings_path: str, stringsdict_path: str | None = None) -> list[KeyLocation]:
+    """Return every key of a strings table with where it is defined.
+
+    SwiftGen puts the keys of a ``.strings`` file and the ``.stringsdict``
+    file with the same table name into one enum, so both are included.
+
+    Args:
+        strings_path: Path to the ``.strings`` file.
+        stringsdict_path: Path to the matching ``.stringsdict`` file. ``None``
+            uses the file next to ``strings_path`` if there is one.
+
+    Returns:
+        The keys of the ``.strings`` file followed by those of the
+        ``.stringsdict`` file, in file order.
+    """
+    with open(strings_path, encoding="utf-8") as f:
+        locations = [
+            KeyLocation(entry.key, strings_path, entry.line_number)
+            for entry in iter_entries(f)
+        ]
+    if stringsdict_path is None:
+        stringsdict_path = os.path.splitext(strings_path)[0] + ".stringsdict"
+        if not os.path.isfile(stringsdict_path):
+            return locations
+    return locations + stringsdict_key_locations(stringsdict_path)
+
+
+def check_collisions(strings_path: str, stringsdict_path: str | None = None) -> list[CollisionGroup]:
+    """Find the colliding keys of a strings table.
+
+    Args:
+        strings_path: Path to the ``.strings`` file.
+        stringsdict_path: Path to the matching ``.stringsdict`` file; see
+            ``table_key_locations``.
+
+    Returns:
+        The collision groups, as returned by ``find_collisions``.
+    """
+    return find_collisions(table_key_locations(strings_path, stringsdict_path))
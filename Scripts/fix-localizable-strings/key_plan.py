@@ -0,0 +1,140 @@
+"""
+key_plan
+
+Reads a plan of key renames and deletions to apply with ``rename_keys`` in a
+single run, rather than one ``rename-key`` run (and one pass over every table
+and Swift file) per key.
+
+A plan is a JSON object mapping each key to its action::
+
+    {
+        "About": {"action": "rename", "to": "AboutApp"},
+        "OldFeature": "delete"
+    }
+
+or a CSV file (by its ``.csv`` extension) with a ``key,action,to`` header::
+
+    key,action,to
+    About,rename,AboutApp
+    OldFeature,delete,
+
+Whitespace around CSV fields is ignored. Keys are raw, still-escaped keys as
+they appear in ``.strings`` files.
+"""
+
+import csv
+import io
+import json
+import os
+
+RENAME = "rename"
+DELETE = "delete"
+
+
+class PlanError(Exception):
+    """Raised when a plan file is malformed."""
+
+
+def _add_action(
+    renames: dict[str, str],
+    deletions: set[str],
+    key: str,
+    action: str,
+    to: str | None,
+    where: str,
+) -> None:
+    if not key:
+        raise PlanError(f"{where}: missing key")
+    if key in renames or key in deletions:
+        raise PlanError(f"{where}: duplicate key {key}")
+    if action == DELETE:
+        deletions.add(key)
+    elif action == RENAME:
+        if not to:
+            raise PlanError(f"{where}: rename of {key} has no target")
+        renames[key] = to
+    else:
+        raise PlanError(f"{where}: unknown action {action!r} for {key}")
+
+
+def parse_json_plan(text: str) -> tuple[dict[str, str], frozenset[str]]:
+    """Parse a JSON plan.
+
+    Args:
+        text: The JSON text; see the module docstring for the format.
+
+    Returns:
+        A tuple of ``(renames, deletions)``: a dict mapping each old key to
+        its new key, and the set of keys to delete.
+
+    Raises:
+        PlanError: If the JSON is invalid or an action is malformed.
+    """
+    try:
+        plan = json.loads(text)
+    except json.JSONDecodeError as error:
+        raise PlanError(f"Invalid JSON: {error}") from error
+    if not isinstance(plan, dict):
+        raise PlanError("Plan must be a JSON object mapping keys to actions")
+
+    renames: dict[str, str] = {}
+    deletions: set[str] = set()
+    for key, value in plan.items():
+        if isinstance(value, str):
+            action, to = value, None
+        elif isinstance(value, dict):
+            action, to = value.get("action"), value.get("to")
+        else:
+            raise PlanError(f"{key}: action must be a string or an object")
+        _add_action(renames, deletions, key, action, to, key)
+    return renames, frozenset(deletions)
+
+
+def parse_csv_plan(text: str) -> tuple[dict[str, str], frozenset[str]]:
+    """Parse a CSV plan.
+
+    Args:
+        text: The CSV text, with a ``key,action,to`` header row.
+
+    Returns:
+        A tuple of ``(renames, deletions)``; see ``parse_json_plan``.
+
+    Raises:
+        PlanError: If the header is missing a column or a row is malformed.
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    missing = {"key", "action"} - set(reader.fieldnames or ())
+    if missing:
+        raise PlanError(f"CSV header is missing: {', '.join(sorted(missing))}")
+
+    renames: dict[str, str] = {}
+    deletions: set[str] = set()
+    for row in reader:
+        _add_action(
+            renames,
+            deletions,
+            (row["key"] or "").strip(),
+            (row["action"] or "").strip(),
+            (row.get("to") or "").strip(),
+            f"line {reader.line_num}",
+        )
+    return renames, frozenset(deletions)
+
+
+def load_plan(path: str) -> tuple[dict[str, str], frozenset[str]]:
+    """Read a plan file, choosing the format by extension.
+
+    Args:
+        path: Path to a ``.csv`` or JSON plan file.
+
+    Returns:
+        A tuple of ``(renames, deletions)``; see ``parse_json_plan``.
+
+    Raises:
+        PlanError: If the plan is malformed.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        text = f.read()
+    if os.path.splitext(path)[1].lower() == ".csv":
+        return parse_csv_plan(text)
+    return parse_json_plan(text)
@@ -0,0 +1,242 @@
+"""
+length_report
+
+Compares the length of every translation with the length of the source
+language value to flag strings that are likely to be truncated in
+fixed-width UI, such as on the watch app.
+
+Every locale's value lengths are loaded into a matrix aligned by source key,
+so the ratios can be computed for all locales at once. NumPy is used for this
+when it is installed; otherwise an equivalent pure-Python implementation is
+used, so the tool has no required dependencies.
+"""
+
+import os
+from typing import NamedTuple
+
+from prune_identical_strings import read_values
+from strings_file_utils import find_locale_dirs, process_map, unescape_value
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Marks a key that is missing from a locale's table.
+_MISSING = -1
+
+
+class LengthTable(NamedTuple):
+    """Value lengths of every locale, aligned by source key.
+
+    ``lengths[i][j]`` is the length of ``keys[j]`` in ``locales[i]``, or
+    ``-1`` when the locale does not have the key. Lengths are measured in
+    characters of the unescaped value.
+    """
+
+    keys: list[str]
+    source_lengths: list[int]
+    locales: list[str]
+    lengths: list[list[int]]
+
+
+class Outlier(NamedTuple):
+    """A translation that is much longer than its source value."""
+
+    locale: str
+    key: str
+    source_length: int
+    length: int
+    ratio: float
+
+
+class LengthReport(NamedTuple):
+    """Outliers grouped by locale and by key.
+
+    ``by_locale`` and ``by_key`` map each locale or key with at least one
+    outlier to its outliers, worst ratio first. Both are ordered by outlier
+    count, most first.
+    """
+
+    outliers: list[Outlier]
+    by_locale: dict[str, list[Outlier]]
+    by_key: dict[str, list[Outlier]]
+
+    def to_json(self) -> dict:
+        """Return the report as a JSON-serializable dict."""
+        return {
+            "by_locale": {
+                locale: [
+                    {"key": o.key, "length": o.length, "ratio": round(o.ratio, 2)}
+                    for o in outliers
+                ]
+                for locale, outliers in self.by_locale.items()
+            },
+            "by_key": {
+                key: [
+                    {"locale": o.locale, "length": o.length, "ratio": round(o.ratio, 2)}
+                    for o in outliers
+                ]
+                for key, outliers in self.by_key.items()
+            },
+        }
+
+
+def _value_lengths(strings_path: str) -> dict[str, int]:
+    return {
+        key: len(unescape_value(value))
+        for key, value in read_values(strings_path).items()
+    }
+
+
+def _locale_lengths(task: tuple[str, list[str]]) -> list[int]:
+    strings_path, keys = task
+    lengths = _value_lengths(strings_path)
+    return [lengths.get(key, _MISSING) for key in keys]
+
+
+def load_lengths(
+    localizations_dir: str,
+    table: str = "Localizable",
+    source_language: str = "en",
+    jobs: int | None = None,
+) -> LengthTable:
+    """Load the value lengths of every locale, aligned by source key.
+
+    Keys that are not in the source table are ignored.
+
+    Args:
+        localizations_dir: A directory of ``*.lproj`` directories, such as
+            ``BitwardenResources/Localizations``.
+        table: The strings table name, without extension.
+        source_language: The development language to align against.
+        jobs: The number of worker processes; see ``process_map``.
+
+    Returns:
+        A ``LengthTable`` with one row per locale other than the source
+        language, sorted by locale.
+    """
+    filename = f"{table}.strings"
+    source = _value_lengths(
+        os.path.join(localizations_dir, f"{source_language}.lproj", filename)
+    )
+    keys = list(source)
+    locales: list[str] = []
+    tasks: list[tuple[str, list[str]]] = []
+    for locale, lproj_path in find_locale_dirs(localizations_dir):
+        strings_path = os.path.join(lproj_path, filename)
+        if locale != source_language and os.path.isfile(strings_path):
+            locales.append(locale)
+            tasks.append((strings_path, keys))
+    lengths = process_map(_locale_lengths, tasks, jobs=jobs)
+    return LengthTable(keys, [source[key] for key in keys], locales, lengths)
+
+
+def _outlier_indexes_numpy(
+    table: LengthTable, max_ratio: float, min_source_length: int
+) -> list[tuple[int, int, float]]:
+    source = numpy.asarray(table.source_lengths, dtype=numpy.float64)
+    lengths = numpy.asarray(table.lengths, dtype=numpy.float64).reshape(
+        len(table.locales), len(table.keys)
+    )
+    eligible = (source >= max(min_source_length, 1)) & (lengths >= 0)
+    ratios = numpy.divide(
+        lengths, source, out=numpy.zeros_like(lengths), where=eligible
+    )
+    rows, columns = numpy.nonzero(ratios > max_ratio)
+    return [
+        (int(row), int(column), float(ratios[row, column]))
+        for row, column in zip(rows, columns)
+    ]
+
+
+def _outlier_indexes_python(
+    table: LengthTable, max_ratio: float, min_source_length: int
+) -> list[tuple[int, int, float]]:
+    eligible = [
+        (column, source)
+        for column, source in enumerate(table.source_lengths)
+        if source >= max(min_source_length, 1)
+    ]
+    outliers: list[tuple[int, int, float]] = []
+    for row, lengths in enumerate(table.lengths):
+        for column, source in eligible:
+            ratio = lengths[column] / source
+            if ratio > max_ratio:
+                outliers.append((row, column, ratio))
+    return outliers
+
+
+def find_outliers(
+    table: LengthTable,
+    max_ratio: float = 1.5,
+    min_source_length: int = 5,
+    use_numpy: bool | None = None,
+) -> list[Outlier]:
+    """Find translations whose length exceeds ``max_ratio`` times the source.
+
+    Args:
+        table: The lengths to compare, as returned by ``load_lengths``.
+        max_ratio: Translations longer than this multiple of the source length
+            are outliers.
+        min_source_length: Source values shorter than this are skipped, since
+            the ratio of very short strings is mostly noise.
+        use_numpy: Force or forbid the NumPy implementation. ``None`` uses
+            NumPy when it is installed.
+
+    Returns:
+        The outliers, ordered by locale and then by key as in ``table``.
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy and table.locales and table.keys:
+        indexes = _outlier_indexes_numpy(table, max_ratio, min_source_length)
+    else:
+        indexes = _outlier_indexes_python(table, max_ratio, min_source_length)
+    return [
+        Outlier(
+            table.locales[row],
+            table.keys[column],
+            table.source_lengths[column],
+            table.lengths[row][column],
+            ratio,
+        )
+        for row, column, ratio in indexes
+    ]
+
+
+def _group(outliers: list[Outlier], field: str) -> dict[str, list[Outlier]]:
+    groups: dict[str, list[Outlier]] = {}
+    for outlier in outliers:
+        groups.setdefault(getattr(outlier, field), []).append(outlier)
+    for group in groups.values():
+        group.sort(key=lambda o: o.ratio, reverse=True)
+    return dict(sorted(groups.items(), key=lambda item: len(item[1]), reverse=True))
+
+
+def length_report(
+    localizations_dir: str,
+    table: str = "Localizable",
+    source_language: str = "en",
+    max_ratio: float = 1.5,
+    min_source_length: int = 5,
+    jobs: int | None = None,
+) -> LengthReport:
+    """Find translations that are much longer than their source values.
+
+    Args:
+        localizations_dir: A directory of ``*.lproj`` directories, such as
+            ``BitwardenResources/Localizations``.
+        table: The strings table name, without extension.
+        source_language: The development language to compare against.
+        max_ratio: Translations longer than this multiple of the source length
+            are outliers.
+        min_source_length: Source values shorter than this are skipped.
+        jobs: The number of worker processes; see ``process_map``.
+
+    Returns:
+        A ``LengthReport`` of the outliers.
+    """
+    lengths = load_lengths(localizations_dir, table, source_language, jobs)
+    outliers = find_outliers(lengths, max_ratio, min_source_length)
+    return LengthReport(outliers, _group(outliers, "locale"), _group(outliers, "key"))
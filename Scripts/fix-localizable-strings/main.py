@@ -14,18 +14,77 @@ Usage:
         --swift-source <dir> [--swift-source <dir> ...] \\
         [--dry-run]
 
+    python Scripts/fix-localizable-strings/main.py check-collisions \\
+        --strings <path/to/Localizable.strings> \\
+        [--stringsdict <path/to/Localizable.stringsdict>]
+
+    python Scripts/fix-localizable-strings/main.py rename-key OLD NEW \\
+        --localizations <path/to/Localizations> \\
+        [--swift-source <dir> ...] [--table Localizable] \\
+        [--source-language en] [--jobs N] [--dry-run]
+
+    python Scripts/fix-localizable-strings/main.py apply-plan PLAN \\
+        --localizations <path/to/Localizations> \\
+        [--swift-source <dir> ...] [--table Localizable] \\
+        [--source-language en] [--jobs N] [--dry-run]
+
     python Scripts/fix-localizable-strings/main.py fix-ellipsis \\
         --strings <path/to/Localizable.strings> \\
         [--dry-run]
+
+    python Scripts/fix-localizable-strings/main.py normalize \\
+        --localizations <path/to/Localizations> \\
+        [--table Localizable] [--rule NAME ...] [--jobs N] \\
+        [--dry-run]
+
+    python Scripts/fix-localizable-strings/main.py prune-identical \\
+        --localizations <path/to/Localizations> \\
+        [--table Localizable] [--source-language en] \\
+        [--allow KEY ...] [--allowlist <path>] [--jobs N] \\
+        [--dry-run]
+
+    python Scripts/fix-localizable-strings/main.py stale \\
+        --localizations <path/to/Localizations> \\
+        --manifests <dir> \\
+        [--table Localizable] [--source-language en] [--jobs N] \\
+        [--update]
+
+    python Scripts/fix-localizable-strings/main.py size-report \\
+        --localizations <path/to/Localizations> \\
+        [--table Localizable] [--top N] [--format text|json] \\
+        [--output <path>] [--jobs N]
+
+    python Scripts/fix-localizable-strings/main.py length-report \\
+        --localizations <path/to/Localizations> \\
+        [--table Localizable] [--source-language en] \\
+        [--max-ratio 1.5] [--min-source-length 5] [--top N] \\
+        [--format text|json] [--jobs N]
+
+    python Scripts/fix-localizable-strings/main.py generate \\
+        --strings <path/to/en.lproj/Localizable.strings> \\
+        --output <path/to/Localizations.swift> \\
+        [--stringsdict <path>] [--enum-name Localizations] \\
+        [--lookup-function <function>] [--internal] [--force]
+
+    python Scripts/fix-localizable-strings/main.py to-xcstrings \\
+        --localizations <path/to/Localizations> \\
+        --output <path/to/Localizable.xcstrings> \\
+        [--table Localizable] [--source-language en]
+
+    python Scripts/fix-localizable-strings/main.py from-xcstrings \\
+        --catalog <path/to/Localizable.xcstrings> \\
+        --output-dir <dir> \\
+        [--table Localizable]
 """
 
 import argparse
-import os
+import json
 import sys
 
-from delete_duplicate_strings import delete_duplicates, deduplicate
-from delete_unused_strings import delete_unused, delete_unused_content, find_used_keys
-from fix_ellipsis import fix_ellipsis, fix_ellipsis_file
+# Each command imports its own module, so a run only pays for what it uses:
+# a no-op `generate` shouldn't load the Swift lexer or the process pool. The
+# normalize rule names are needed to build the parser.
+from normalize_strings import RULE_NAMES
 
 
 def _pluralize(count: int, singular: str, plural: str) -> str:
@@ -33,6 +92,8 @@ def _pluralize(count: int, singular: str, plural: str) -> str:
 
 
 def cmd_delete_duplicates(args: argparse.Namespace) -> None:
+    from delete_duplicate_strings import deduplicate, delete_duplicates
+
     if args.dry_run:
         with open(args.strings, encoding="utf-8") as f:
             content = f.read()
@@ -57,19 +118,41 @@ def cmd_delete_duplicates(args: argparse.Namespace) -> None:
         print(f"    {key}")
 
 
+def _print_collisions(groups, path: str) -> None:
+    noun = _pluralize(len(groups), "collision", "collisions")
+    print(f"  Found {len(groups)} identifier {noun}:")
+    for group in groups:
+        print(f"    {group.identifier} ({group.kind}):")
+        for location in group.locations:
+            print(f"      {location.path or path}:{location.line_number}: {location.key}")
+
+
 def cmd_delete_unused(args: argparse.Namespace) -> None:
+    from key_collisions import KeyCollisionError
+
+    try:
+        _delete_unused(args)
+    except KeyCollisionError as error:
+        _print_collisions(error.groups, args.strings)
+        print("\n  Rename the colliding keys before deleting unused strings.")
+        sys.exit(1)
+
+
+def _delete_unused(args: argparse.Namespace) -> None:
+    from delete_unused_strings import (
+        delete_unused,
+        delete_unused_content,
+        read_swift_sources,
+        scan_swift_sources,
+    )
+
     if args.dry_run:
         with open(args.strings, encoding="utf-8") as f:
             content = f.read()
-        swift_sources = []
-        for swift_dir in args.swift_sources:
-            for dirpath, _, filenames in os.walk(swift_dir):
-                for filename in filenames:
-                    if filename.endswith(".swift"):
-                        with open(os.path.join(dirpath, filename), encoding="utf-8") as f:
-                            swift_sources.append(f.read())
-        used_keys = find_used_keys(swift_sources)
-        _, removed = delete_unused_content(content, used_keys)
+        used_keys, string_literals = scan_swift_sources(
+            read_swift_sources(args.swift_sources)
+        )
+        _, removed = delete_unused_content(content, used_keys, string_literals)
         if not removed:
             print("  No unused strings found.")
             return
@@ -90,7 +173,89 @@ def cmd_delete_unused(args: argparse.Namespace) -> None:
         print(f"    {key}")
 
 
+def cmd_check_collisions(args: argparse.Namespace) -> None:
+    from key_collisions import check_collisions
+
+    groups = check_collisions(args.strings, args.stringsdict)
+    if not groups:
+        print("  No identifier collisions found.")
+        return
+    _print_collisions(groups, args.strings)
+    sys.exit(1)
+
+
+def cmd_rename_key(args: argparse.Namespace) -> None:
+    from rename_keys import RenameError, rename_keys
+
+    try:
+        changed = rename_keys(
+            args.localizations,
+            {args.old: args.new},
+            swift_dirs=args.swift_sources,
+            table=args.table,
+            source_language=args.source_language,
+            dry_run=args.dry_run,
+            jobs=args.jobs,
+        )
+    except RenameError as error:
+        print(f"  {error}")
+        sys.exit(1)
+
+    if not changed:
+        print(f"  No occurrences of {args.old} found.")
+        return
+    verb = "Would update" if args.dry_run else "Updated"
+    noun = _pluralize(len(changed), "file", "files")
+    print(f"  {verb} {len(changed)} {noun}:")
+    for result in changed:
+        print(f"    {result.path} ({result.count})")
+    if args.dry_run:
+        print("\n  Dry run — no changes written.")
+
+
+def cmd_apply_plan(args: argparse.Namespace) -> None:
+    from key_plan import PlanError, load_plan
+    from rename_keys import RenameError, rename_keys
+
+    try:
+        renames, deletions = load_plan(args.plan)
+        changed = rename_keys(
+            args.localizations,
+            renames,
+            swift_dirs=args.swift_sources,
+            table=args.table,
+            source_language=args.source_language,
+            dry_run=args.dry_run,
+            jobs=args.jobs,
+            deletions=deletions,
+        )
+    except (PlanError, RenameError) as error:
+        print(f"  {error}")
+        sys.exit(1)
+
+    updated = [result for result in changed if result.count]
+    dangling = [result for result in changed if result.dangling]
+    if not updated:
+        print("  No occurrences of the planned keys found.")
+    else:
+        verb = "Would update" if args.dry_run else "Updated"
+        noun = _pluralize(len(updated), "file", "files")
+        print(f"  {verb} {len(updated)} {noun}:")
+        for result in updated:
+            print(f"    {result.path} ({result.count})")
+    if dangling:
+        total = sum(result.dangling for result in dangling)
+        noun = _pluralize(total, "reference", "references")
+        print(f"\n  Warning: {total} Swift {noun} to deleted keys remain:")
+        for result in dangling:
+            print(f"    {result.path} ({result.dangling})")
+    if args.dry_run:
+        print("\n  Dry run — no changes written.")
+
+
 def cmd_fix_ellipsis(args: argparse.Namespace) -> None:
+    from fix_ellipsis import fix_ellipsis, fix_ellipsis_file
+
     if args.dry_run:
         with open(args.strings, encoding="utf-8") as f:
             content = f.read()
@@ -115,6 +280,229 @@ def cmd_fix_ellipsis(args: argparse.Namespace) -> None:
         print(f"    {key}")
 
 
+def cmd_normalize(args: argparse.Namespace) -> None:
+    from normalize_strings import normalize_dir
+
+    results = normalize_dir(
+        args.localizations,
+        table=args.table,
+        rule_names=args.rules or None,
+        dry_run=args.dry_run,
+        jobs=args.jobs,
+    )
+    results = [result for result in results if result.changed]
+    if not results:
+        print("  No values need normalising.")
+        return
+
+    verb = "Found" if args.dry_run else "Normalised"
+    for result in results:
+        keys = {key for keys in result.changed.values() for key in keys}
+        noun = _pluralize(len(keys), "entry", "entries")
+        print(f"  {result.locale}: {verb} {len(keys)} {noun}:")
+        for rule, rule_keys in result.changed.items():
+            print(f"    {rule} ({len(rule_keys)}):")
+            for key in rule_keys:
+                print(f"      {key}")
+    if args.dry_run:
+        print("\n  Dry run — no changes written.")
+
+
+def cmd_prune_identical(args: argparse.Namespace) -> None:
+    from prune_identical_strings import load_allowlist, prune_identical_dir
+
+    allowlist = set(args.allow)
+    for path in args.allowlists:
+        allowlist |= load_allowlist(path)
+
+    results = prune_identical_dir(
+        args.localizations,
+        table=args.table,
+        source_language=args.source_language,
+        allowlist=allowlist,
+        dry_run=args.dry_run,
+        jobs=args.jobs,
+    )
+    results = [result for result in results if result.removed]
+    if not results:
+        print("  No untranslated copies of source values found.")
+        return
+
+    total_keys = sum(len(result.removed) for result in results)
+    total_bytes = sum(result.bytes_saved for result in results)
+    verb = "Found" if args.dry_run else "Removed"
+    noun = _pluralize(total_keys, "entry", "entries")
+    locale_noun = _pluralize(len(results), "locale", "locales")
+    print(
+        f"  {verb} {total_keys} identical {noun} in {len(results)} {locale_noun} "
+        f"({total_bytes} bytes):"
+    )
+    for result in results:
+        noun = _pluralize(len(result.removed), "entry", "entries")
+        print(f"    {result.locale}: {len(result.removed)} {noun}, {result.bytes_saved} bytes")
+    if args.dry_run:
+        print("\n  Dry run — no changes written.")
+
+
+def cmd_stale(args: argparse.Namespace) -> None:
+    from stale_translations import stale_translations
+
+    results = stale_translations(
+        args.localizations,
+        args.manifests,
+        table=args.table,
+        source_language=args.source_language,
+        update=args.update,
+        jobs=args.jobs,
+    )
+
+    untracked = [result for result in results if result.untracked]
+    if untracked:
+        total = sum(len(result.untracked) for result in untracked)
+        noun = _pluralize(total, "key", "keys")
+        locale_noun = _pluralize(len(untracked), "locale", "locales")
+        print(f"  {total} {noun} in {len(untracked)} {locale_noun} not in a manifest.")
+
+    results = [result for result in results if result.stale]
+    if not results:
+        print("  No stale translations found.")
+    else:
+        total = sum(len(result.stale) for result in results)
+        noun = _pluralize(total, "translation", "translations")
+        locale_noun = _pluralize(len(results), "locale", "locales")
+        print(f"  Found {total} stale {noun} in {len(results)} {locale_noun}:")
+        for result in results:
+            print(f"    {result.locale}:")
+            for key in result.stale:
+                print(f"      {key}")
+
+    if args.update:
+        print(f"\n  Updated manifests in {args.manifests}")
+
+
+def _percent(part: int, whole: int) -> str:
+    return f"{100 * part / whole:.1f}%" if whole else "0.0%"
+
+
+def cmd_size_report(args: argparse.Namespace) -> None:
+    from size_report import size_report
+
+    report = size_report(args.localizations, args.table, args.top, args.jobs)
+
+    if args.format == "json":
+        output = json.dumps(report.to_json(), indent=2, ensure_ascii=False) + "\n"
+    else:
+        totals = report.to_json()["totals"]
+        lines = [
+            f"  {len(report.locales)} {_pluralize(len(report.locales), 'locale', 'locales')}, "
+            f"{totals['total_bytes']} bytes of source "
+            f"({totals['comment_bytes']} bytes / "
+            f"{_percent(totals['comment_bytes'], totals['total_bytes'])} comments), "
+            f"~{totals['compiled_bytes']} bytes compiled",
+            "",
+            "  Locale\tStrings\tDict\tComments\tCompiled",
+        ]
+        for size in sorted(report.locales, key=lambda s: s.total_bytes, reverse=True):
+            lines.append(
+                f"  {size.locale}\t{size.strings_bytes}\t{size.stringsdict_bytes}\t"
+                f"{size.comment_bytes}\t{size.compiled_bytes}"
+            )
+        lines.append("")
+        lines.append(f"  Top {len(report.top_keys)} keys by bytes across all locales:")
+        for key, size in report.top_keys:
+            lines.append(f"    {size}\t{key}")
+        output = "\n".join(lines) + "\n"
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"  Wrote size report to {args.output}")
+    else:
+        print(output, end="")
+
+
+def cmd_length_report(args: argparse.Namespace) -> None:
+    from length_report import length_report
+
+    report = length_report(
+        args.localizations,
+        table=args.table,
+        source_language=args.source_language,
+        max_ratio=args.max_ratio,
+        min_source_length=args.min_source_length,
+        jobs=args.jobs,
+    )
+
+    if args.format == "json":
+        print(json.dumps(report.to_json(), indent=2, ensure_ascii=False))
+        return
+
+    if not report.outliers:
+        print(f"  No translations longer than {args.max_ratio}x the source value.")
+        return
+
+    noun = _pluralize(len(report.outliers), "translation", "translations")
+    print(f"  Found {len(report.outliers)} {noun} longer than {args.max_ratio}x the source value.")
+    print("\n  By locale:")
+    for locale, outliers in report.by_locale.items():
+        worst = ", ".join(f"{o.key} ({o.ratio:.1f}x)" for o in outliers[: args.top])
+        print(f"    {locale}: {len(outliers)} — {worst}")
+    print("\n  By key:")
+    for key, outliers in list(report.by_key.items())[: args.top]:
+        worst = outliers[0]
+        print(
+            f"    {key}: {len(outliers)} "
+            f"{_pluralize(len(outliers), 'locale', 'locales')}, "
+            f"up to {worst.ratio:.1f}x in {worst.locale} "
+            f"({worst.length} vs {worst.source_length} characters)"
+        )
+
+
+def cmd_generate(args: argparse.Namespace) -> None:
+    from generate_localizations import generate_localizations
+
+    written = generate_localizations(
+        args.strings,
+        args.output,
+        stringsdict_path=args.stringsdict,
+        enum_name=args.enum_name,
+        public_access=not args.internal,
+        lookup_function=args.lookup_function or None,
+        force=args.force,
+    )
+    if written:
+        print(f"  Wrote {args.output}")
+    else:
+        print(f"  {args.output} is up to date.")
+
+
+def cmd_to_xcstrings(args: argparse.Namespace) -> None:
+    from xcstrings_catalog import build_catalog
+
+    summary = build_catalog(
+        args.localizations, args.output, args.table, args.source_language
+    )
+    key_noun = _pluralize(summary.keys, "key", "keys")
+    locale_noun = _pluralize(summary.locales, "locale", "locales")
+    print(
+        f"  Wrote {summary.keys} {key_noun} across {summary.locales} {locale_noun} "
+        f"({summary.units} localizations) to {args.output}"
+    )
+
+
+def cmd_from_xcstrings(args: argparse.Namespace) -> None:
+    from xcstrings_catalog import export_catalog
+
+    written = export_catalog(args.catalog, args.output_dir, args.table)
+    if not written:
+        print("  No localizations found in the catalog.")
+        return
+    noun = _pluralize(len(written), "file", "files")
+    print(f"  Wrote {len(written)} {noun}:")
+    for path in written:
+        print(f"    {path}")
+
+
 def build_parser():
     parser = argparse.ArgumentParser(
         description="Tools for maintaining Localizable.strings files."
@@ -161,6 +549,111 @@ def build_parser():
         help="Report unused keys without modifying the strings file.",
     )
 
+    collisions_parser = subparsers.add_parser(
+        "check-collisions",
+        help="Report keys that map to the same SwiftGen or case-insensitive identifier.",
+    )
+    collisions_parser.add_argument(
+        "--strings",
+        required=True,
+        metavar="PATH",
+        help="Path to the Localizable.strings file to check.",
+    )
+    collisions_parser.add_argument(
+        "--stringsdict",
+        metavar="PATH",
+        help="Path to the matching .stringsdict file (default: next to --strings, if present).",
+    )
+
+    rename_parser = subparsers.add_parser(
+        "rename-key",
+        help="Rename a key in every locale's tables and in Swift Localizations references.",
+    )
+    rename_parser.add_argument("old", metavar="OLD", help="The key to rename.")
+    rename_parser.add_argument("new", metavar="NEW", help="The new name of the key.")
+    rename_parser.add_argument(
+        "--localizations",
+        required=True,
+        metavar="DIR",
+        help="Directory containing the *.lproj directories to update.",
+    )
+    rename_parser.add_argument(
+        "--swift-source",
+        action="append",
+        default=[],
+        dest="swift_sources",
+        metavar="DIR",
+        help="Directory to search recursively for Swift source files. May be repeated.",
+    )
+    rename_parser.add_argument(
+        "--table",
+        default="Localizable",
+        help="Name of the strings table to update (default: Localizable).",
+    )
+    rename_parser.add_argument(
+        "--source-language",
+        default="en",
+        help="Development language whose table must contain the key (default: en).",
+    )
+    rename_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes (default: one per CPU).",
+    )
+    rename_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the files that would change without modifying them.",
+    )
+
+    plan_parser = subparsers.add_parser(
+        "apply-plan",
+        help="Apply a JSON or CSV plan of key renames and deletions to every locale's tables and Swift sources.",
+    )
+    plan_parser.add_argument(
+        "plan",
+        metavar="PLAN",
+        help="Path to the plan file; a .csv file is read as CSV, anything else as JSON.",
+    )
+    plan_parser.add_argument(
+        "--localizations",
+        required=True,
+        metavar="DIR",
+        help="Directory containing the *.lproj directories to update.",
+    )
+    plan_parser.add_argument(
+        "--swift-source",
+        action="append",
+        default=[],
+        dest="swift_sources",
+        metavar="DIR",
+        help="Directory to search recursively for Swift source files. May be repeated.",
+    )
+    plan_parser.add_argument(
+        "--table",
+        default="Localizable",
+        help="Name of the strings table to update (default: Localizable).",
+    )
+    plan_parser.add_argument(
+        "--source-language",
+        default="en",
+        help="Development language whose table must contain the planned keys (default: en).",
+    )
+    plan_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes (default: one per CPU).",
+    )
+    plan_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the files that would change without modifying them.",
+    )
+
     ellipsis_parser = subparsers.add_parser(
         "fix-ellipsis",
         help="Replace three-dot sequences (...) with the Unicode ellipsis character (…) in string values.",
@@ -177,6 +670,322 @@ def build_parser():
         help="Report affected entries without modifying the strings file.",
     )
 
+    normalize_parser = subparsers.add_parser(
+        "normalize",
+        help="Apply typographic normalisation rules to the string values of every locale.",
+    )
+    normalize_parser.add_argument(
+        "--localizations",
+        required=True,
+        metavar="DIR",
+        help="Directory containing the *.lproj directories to process.",
+    )
+    normalize_parser.add_argument(
+        "--table",
+        default="Localizable",
+        help="Name of the strings table to process (default: Localizable).",
+    )
+    normalize_parser.add_argument(
+        "--rule",
+        action="append",
+        default=[],
+        dest="rules",
+        choices=RULE_NAMES,
+        metavar="NAME",
+        help=f"Rule to apply. May be repeated (default: all of {', '.join(RULE_NAMES)}).",
+    )
+    normalize_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes (default: one per CPU).",
+    )
+    normalize_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report affected entries without modifying any strings file.",
+    )
+
+    prune_parser = subparsers.add_parser(
+        "prune-identical",
+        help="Remove translated entries whose value is identical to the source language value.",
+    )
+    prune_parser.add_argument(
+        "--localizations",
+        required=True,
+        metavar="DIR",
+        help="Directory containing the *.lproj directories to process.",
+    )
+    prune_parser.add_argument(
+        "--table",
+        default="Localizable",
+        help="Name of the strings table to process (default: Localizable).",
+    )
+    prune_parser.add_argument(
+        "--source-language",
+        default="en",
+        help="Development language to compare against (default: en).",
+    )
+    prune_parser.add_argument(
+        "--allow",
+        action="append",
+        default=[],
+        metavar="KEY",
+        help="Key whose identical translations are intentional. May be repeated.",
+    )
+    prune_parser.add_argument(
+        "--allowlist",
+        action="append",
+        default=[],
+        dest="allowlists",
+        metavar="PATH",
+        help="File of allowed keys, one per line ('#' starts a comment). May be repeated.",
+    )
+    prune_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes (default: one per CPU).",
+    )
+    prune_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report identical entries without modifying any strings file.",
+    )
+
+    stale_parser = subparsers.add_parser(
+        "stale",
+        help="List translations whose source language value has changed since they were last synced.",
+    )
+    stale_parser.add_argument(
+        "--localizations",
+        required=True,
+        metavar="DIR",
+        help="Directory containing the *.lproj directories to check.",
+    )
+    stale_parser.add_argument(
+        "--manifests",
+        required=True,
+        metavar="DIR",
+        help="Directory holding the per-locale fingerprint manifests.",
+    )
+    stale_parser.add_argument(
+        "--table",
+        default="Localizable",
+        help="Name of the strings table to check (default: Localizable).",
+    )
+    stale_parser.add_argument(
+        "--source-language",
+        default="en",
+        help="Development language whose values are tracked (default: en).",
+    )
+    stale_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes (default: one per CPU).",
+    )
+    stale_parser.add_argument(
+        "--update",
+        action="store_true",
+        help="After checking, record new and changed translations as up to date.",
+    )
+
+    size_parser = subparsers.add_parser(
+        "size-report",
+        help="Report the bytes used by each locale and the largest keys across all locales.",
+    )
+    size_parser.add_argument(
+        "--localizations",
+        required=True,
+        metavar="DIR",
+        help="Directory containing the *.lproj directories to measure.",
+    )
+    size_parser.add_argument(
+        "--table",
+        default="Localizable",
+        help="Name of the strings table to measure (default: Localizable).",
+    )
+    size_parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Number of keys to list by cumulative bytes (default: 20).",
+    )
+    size_parser.add_argument(
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help="Output format (default: text).",
+    )
+    size_parser.add_argument(
+        "--output",
+        metavar="PATH",
+        help="Write the report to a file instead of standard output.",
+    )
+    size_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes (default: one per CPU).",
+    )
+
+    length_parser = subparsers.add_parser(
+        "length-report",
+        help="Flag translations that are much longer than the source language value.",
+    )
+    length_parser.add_argument(
+        "--localizations",
+        required=True,
+        metavar="DIR",
+        help="Directory containing the *.lproj directories to check.",
+    )
+    length_parser.add_argument(
+        "--table",
+        default="Localizable",
+        help="Name of the strings table to check (default: Localizable).",
+    )
+    length_parser.add_argument(
+        "--source-language",
+        default="en",
+        help="Development language to compare against (default: en).",
+    )
+    length_parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=1.5,
+        metavar="RATIO",
+        help="Flag translations longer than this multiple of the source length (default: 1.5).",
+    )
+    length_parser.add_argument(
+        "--min-source-length",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Skip source values shorter than this many characters (default: 5).",
+    )
+    length_parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of keys to list per locale and overall (default: 10).",
+    )
+    length_parser.add_argument(
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help="Output format (default: text).",
+    )
+    length_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes (default: one per CPU).",
+    )
+
+    generate_parser = subparsers.add_parser(
+        "generate",
+        help="Generate the SwiftGen-style Localizations enum, skipping the write when the inputs are unchanged.",
+    )
+    generate_parser.add_argument(
+        "--strings",
+        required=True,
+        metavar="PATH",
+        help="Path to the source language Localizable.strings file.",
+    )
+    generate_parser.add_argument(
+        "--output",
+        required=True,
+        metavar="PATH",
+        help="Path of the Swift file to write.",
+    )
+    generate_parser.add_argument(
+        "--stringsdict",
+        metavar="PATH",
+        help="Path to the matching .stringsdict file (default: next to --strings, if present).",
+    )
+    generate_parser.add_argument(
+        "--enum-name",
+        default="Localizations",
+        help="Name of the generated enum (default: Localizations).",
+    )
+    generate_parser.add_argument(
+        "--lookup-function",
+        default="Resources.localizationFunction(key:table:fallbackValue:)",
+        metavar="FUNCTION",
+        help=(
+            "Function used to look strings up (default: "
+            "Resources.localizationFunction(key:table:fallbackValue:)). "
+            "Pass an empty string to use the bundle of the generated file."
+        ),
+    )
+    generate_parser.add_argument(
+        "--internal",
+        action="store_true",
+        help="Generate an internal rather than public enum.",
+    )
+    generate_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate even if the inputs are unchanged.",
+    )
+
+    to_xcstrings_parser = subparsers.add_parser(
+        "to-xcstrings",
+        help="Migrate every locale's .strings and .stringsdict tables into one String Catalog.",
+    )
+    to_xcstrings_parser.add_argument(
+        "--localizations",
+        required=True,
+        metavar="DIR",
+        help="Directory containing the *.lproj directories to migrate.",
+    )
+    to_xcstrings_parser.add_argument(
+        "--output",
+        required=True,
+        metavar="PATH",
+        help="Path of the .xcstrings file to write.",
+    )
+    to_xcstrings_parser.add_argument(
+        "--table",
+        default="Localizable",
+        help="Name of the strings table to migrate (default: Localizable).",
+    )
+    to_xcstrings_parser.add_argument(
+        "--source-language",
+        default="en",
+        help="Development language of the table (default: en).",
+    )
+
+    from_xcstrings_parser = subparsers.add_parser(
+        "from-xcstrings",
+        help="Export a String Catalog back into per-locale .strings and .stringsdict tables.",
+    )
+    from_xcstrings_parser.add_argument(
+        "--catalog",
+        required=True,
+        metavar="PATH",
+        help="Path to the .xcstrings file to export.",
+    )
+    from_xcstrings_parser.add_argument(
+        "--output-dir",
+        required=True,
+        metavar="DIR",
+        help="Directory in which to write the *.lproj directories.",
+    )
+    from_xcstrings_parser.add_argument(
+        "--table",
+        default="Localizable",
+        help="Name of the strings table to write (default: Localizable).",
+    )
+
     return parser
 
 
@@ -188,8 +997,30 @@ def main():
         cmd_delete_duplicates(args)
     elif args.command == "delete-unused":
         cmd_delete_unused(args)
+    elif args.command == "check-collisions":
+        cmd_check_collisions(args)
+    elif args.command == "rename-key":
+        cmd_rename_key(args)
+    elif args.command == "apply-plan":
+        cmd_apply_plan(args)
     elif args.command == "fix-ellipsis":
         cmd_fix_ellipsis(args)
+    elif args.command == "normalize":
+        cmd_normalize(args)
+    elif args.command == "prune-identical":
+        cmd_prune_identical(args)
+    elif args.command == "stale":
+        cmd_stale(args)
+    elif args.command == "size-report":
+        cmd_size_report(args)
+    elif args.command == "length-report":
+        cmd_length_report(args)
+    elif args.command == "generate":
+        cmd_generate(args)
+    elif args.command == "to-xcstrings":
+        cmd_to_xcstrings(args)
+    elif args.command == "from-xcstrings":
+        cmd_from_xcstrings(args)
     else:
         parser.print_help()
         sys.exit(1)
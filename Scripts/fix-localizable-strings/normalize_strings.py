@@ -0,0 +1,232 @@
+"""
+normalize_strings
+
+Applies typographic normalisation rules (ellipses, curly quotes and
+apostrophes, doubled spaces, French non-breaking spaces) to the values of
+Localizable.strings entries.
+
+Rules are declared in ``RULES`` together with the locales they apply to. For
+each locale, the applicable rules are compiled once into a single combined
+regular expression, plus a ``str.translate`` table for rules that replace one
+character with another, so every value is rewritten in a single pass no
+matter how many rules there are. Keys, comments, and blank lines are passed
+through unchanged.
+"""
+
+import os
+import re
+from typing import NamedTuple
+
+from strings_file_utils import find_locale_dirs, process_map, replace_values
+
+
+class Rule(NamedTuple):
+    """A single normalisation rule.
+
+    ``find`` is a regular expression, or a literal string when ``regex`` is
+    ``False``. A literal single character is applied with ``str.translate``.
+    ``locales`` lists the locales the rule applies to, or is ``None`` for every
+    locale. A language in ``locales`` also matches its regional variants
+    (``"en"`` matches ``"en-GB"``) unless ``regional`` is ``False``. Rules
+    earlier in ``RULES`` win when two rules could match at the same position.
+    """
+
+    name: str
+    find: str
+    replace: str
+    locales: frozenset[str] | None = None
+    regex: bool = False
+    regional: bool = True
+
+
+_FRENCH = frozenset({"fr", "fr-FR"})
+
+RULES: list[Rule] = [
+    Rule("ellipsis", "...", "…"),
+    # French typography in France puts a non-breaking space before `:` and a
+    # narrow one before `;`, `?` and `!`; Canadian French uses no space before
+    # most of them, so the rules apply to `fr` and `fr-FR` only. They run
+    # before `double-space` so that a run of spaces before the punctuation
+    # collapses into one non-breaking space.
+    Rule("french-colon-space", r" +(?=:)", " ", _FRENCH, regex=True, regional=False),
+    Rule("french-punctuation-space", r" +(?=[;?!])", " ", _FRENCH, regex=True, regional=False),
+    Rule("double-space", r"  +", " ", regex=True),
+    # Values are still escaped, so a straight double quote appears as `\"`. A
+    # quote at the start of the value or after whitespace or an opening
+    # bracket opens a quotation; any other quote closes one.
+    Rule("open-quote", r'(?:^|(?<=[\s(\[{]))\\"', "“", frozenset({"en"}), regex=True),
+    Rule("close-quote", r'\\"', "”", frozenset({"en"}), regex=True),
+    Rule("apostrophe", "'", "’", frozenset({"en"})),
+]
+
+RULE_NAMES = [rule.name for rule in RULES]
+
+
+class NormalizeResult(NamedTuple):
+    """The outcome of normalising one locale's strings table.
+
+    ``changed`` maps each rule name to the keys it changed, in file order.
+    Rules that changed nothing are omitted.
+    """
+
+    locale: str
+    changed: dict[str, list[str]]
+
+
+def _applies_to(rule: Rule, locale: str | None) -> bool:
+    if rule.locales is None:
+        return True
+    if locale is None:
+        return False
+    if locale in rule.locales:
+        return True
+    return rule.regional and locale.split("-", 1)[0] in rule.locales
+
+
+class Normalizer:
+    """The rules for one locale, compiled into a single pass.
+
+    Args:
+        rules: The rules to apply, in priority order.
+    """
+
+    def __init__(self, rules: list[Rule]):
+        self._translate_rules: list[Rule] = []
+        self._regex_rules: list[Rule] = []
+        for rule in rules:
+            if not rule.regex and len(rule.find) == 1:
+                self._translate_rules.append(rule)
+            else:
+                self._regex_rules.append(rule)
+
+        self._table = str.maketrans(
+            {rule.find: rule.replace for rule in self._translate_rules}
+        )
+        self._pattern = None
+        if self._regex_rules:
+            self._pattern = re.compile(
+                "|".join(
+                    f"(?P<r{index}>{rule.find if rule.regex else re.escape(rule.find)})"
+                    for index, rule in enumerate(self._regex_rules)
+                )
+            )
+
+    @classmethod
+    def for_locale(cls, locale: str | None, rule_names: list[str] | None = None) -> "Normalizer":
+        """Build a normaliser from the ``RULES`` that apply to ``locale``.
+
+        Args:
+            locale: The locale of the table, e.g. ``"fr"``. ``None`` selects
+                only the rules that apply to every locale.
+            rule_names: Restrict to these rules. ``None`` uses all of them.
+
+        Returns:
+            The compiled ``Normalizer``.
+        """
+        return cls([
+            rule
+            for rule in RULES
+            if (rule_names is None or rule.name in rule_names) and _applies_to(rule, locale)
+        ])
+
+    def normalize(self, value: str) -> tuple[str, set[str]]:
+        """Normalise a single raw value.
+
+        Args:
+            value: The raw, still-escaped value of an entry.
+
+        Returns:
+            A tuple of ``(new_value, rule_names)`` where ``rule_names`` is the
+            set of rules that changed the value.
+        """
+        applied: set[str] = set()
+
+        if self._pattern is not None:
+            def replace(m: re.Match) -> str:
+                rule = self._regex_rules[int(m.lastgroup[1:])]
+                applied.add(rule.name)
+                return rule.replace
+
+            value = self._pattern.sub(replace, value)
+
+        for rule in self._translate_rules:
+            if rule.find in value:
+                applied.add(rule.name)
+        if applied and self._translate_rules:
+            value = value.translate(self._table)
+
+        return value, applied
+
+
+def normalize(content: str, normalizer: Normalizer) -> tuple[str, dict[str, list[str]]]:
+    """Apply a normaliser to the values of Localizable.strings content.
+
+    Only the value portion of each entry is modified; see ``replace_values``.
+
+    Args:
+        content: The full text of the ``.strings`` file.
+        normalizer: The compiled rules to apply.
+
+    Returns:
+        A tuple of ``(new_content, changed)`` where ``new_content`` is the
+        updated file text and ``changed`` maps each rule name to the keys whose
+        values it modified, in the order they were encountered.
+    """
+    changed: dict[str, list[str]] = {}
+
+    def replace(key: str, value: str) -> str | None:
+        new_value, applied = normalizer.normalize(value)
+        if not applied:
+            return None
+        for name in RULE_NAMES:
+            if name in applied:
+                changed.setdefault(name, []).append(key)
+        return new_value
+
+    return replace_values(content, replace), changed
+
+
+def _normalize_file(task: tuple[str, str, list[str] | None, bool]) -> NormalizeResult:
+    locale, strings_path, rule_names, dry_run = task
+    with open(strings_path, encoding="utf-8") as f:
+        content = f.read()
+
+    new_content, changed = normalize(content, Normalizer.for_locale(locale, rule_names))
+
+    if changed and not dry_run:
+        with open(strings_path, "w", encoding="utf-8") as f:
+            f.write(new_content)
+
+    return NormalizeResult(locale, changed)
+
+
+def normalize_dir(
+    localizations_dir: str,
+    table: str = "Localizable",
+    rule_names: list[str] | None = None,
+    dry_run: bool = False,
+    jobs: int | None = None,
+) -> list[NormalizeResult]:
+    """Normalise the values of every locale's strings table in parallel.
+
+    Files are only written when at least one value changes.
+
+    Args:
+        localizations_dir: A directory of ``*.lproj`` directories, such as
+            ``BitwardenResources/Localizations``.
+        table: The strings table name, without extension.
+        rule_names: Restrict to these rules. ``None`` uses all of them.
+        dry_run: Report what would change without writing any files.
+        jobs: The number of worker processes; see ``process_map``.
+
+    Returns:
+        A ``NormalizeResult`` for each locale that has the table, sorted by
+        locale.
+    """
+    filename = f"{table}.strings"
+    tasks = [
+        (locale, os.path.join(lproj_path, filename), rule_names, dry_run)
+        for locale, lproj_path in find_locale_dirs(localizations_dir)
+        if os.path.isfile(os.path.join(lproj_path, filename))
+    ]
+    return process_map(_normalize_file, tasks, jobs=jobs)
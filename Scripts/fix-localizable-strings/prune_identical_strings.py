@@ -0,0 +1,163 @@
+"""
+prune_identical_strings
+
+Removes entries from translated Localizable.strings files whose value is a
+byte-for-byte copy of the English value. Lookup already falls back to the
+development language when a key is missing from a locale's table, so these
+copies only add bundle size and lookup table memory. Any comment block
+immediately preceding a removed entry (with no blank lines between them) is
+also removed.
+"""
+
+import os
+from typing import NamedTuple
+
+from strings_file_utils import filter_entries, find_locale_dirs, iter_entries, process_map
+
+
+class PruneResult(NamedTuple):
+    """The outcome of pruning one locale's strings table."""
+
+    locale: str
+    removed: list[str]
+    bytes_saved: int
+
+
+# Installed in each worker process by ``_init_worker`` so the English table is
+# sent to a worker once rather than once per locale.
+_source_values: dict[str, str] = {}
+_allowlist: frozenset[str] = frozenset()
+
+
+def read_values(strings_path: str) -> dict[str, str]:
+    """Read the raw values of a ``.strings`` file keyed by raw key.
+
+    When a key occurs more than once, the first occurrence wins, matching
+    ``delete_duplicates``.
+
+    Args:
+        strings_path: Path to the ``.strings`` file to read.
+
+    Returns:
+        A dict mapping each raw key to its raw, still-escaped value.
+    """
+    values: dict[str, str] = {}
+    with open(strings_path, encoding="utf-8") as f:
+        for entry in iter_entries(f):
+            values.setdefault(entry.key, entry.value)
+    return values
+
+
+def load_allowlist(path: str) -> set[str]:
+    """Read an allowlist file of keys whose identical translations are intentional.
+
+    The file contains one raw key per line. Blank lines and lines starting
+    with ``#`` are ignored.
+
+    Args:
+        path: Path to the allowlist file.
+
+    Returns:
+        The set of allowlisted keys.
+    """
+    with open(path, encoding="utf-8") as f:
+        return {
+            line.strip()
+            for line in f
+            if line.strip() and not line.lstrip().startswith("#")
+        }
+
+
+def prune_identical(
+    content: str,
+    source_values: dict[str, str],
+    allowlist: set[str] | frozenset[str] = frozenset(),
+) -> tuple[str, list[str]]:
+    """Remove entries whose value equals the source language value.
+
+    Args:
+        content: The full text of a translated ``.strings`` file.
+        source_values: The raw values of the source language table, as
+            returned by ``read_values``.
+        allowlist: Keys to keep even when their value is identical.
+
+    Returns:
+        A tuple of ``(new_content, removed_keys)`` where ``new_content`` is the
+        filtered file text and ``removed_keys`` is a list of keys that were
+        removed, in file order.
+    """
+    values: dict[str, str] = {}
+    for entry in iter_entries(content.splitlines(keepends=True)):
+        values.setdefault(entry.key, entry.value)
+
+    def should_keep(key: str) -> bool:
+        if key in allowlist or key not in source_values:
+            return True
+        return values.get(key) != source_values[key]
+
+    return filter_entries(content, should_keep)
+
+
+def _init_worker(source_values: dict[str, str], allowlist: frozenset[str]) -> None:
+    global _source_values, _allowlist
+    _source_values = source_values
+    _allowlist = allowlist
+
+
+def _prune_file(task: tuple[str, str, bool]) -> PruneResult:
+    locale, strings_path, dry_run = task
+    with open(strings_path, encoding="utf-8") as f:
+        content = f.read()
+
+    new_content, removed = prune_identical(content, _source_values, _allowlist)
+
+    if removed and not dry_run:
+        with open(strings_path, "w", encoding="utf-8") as f:
+            f.write(new_content)
+
+    bytes_saved = len(content.encode("utf-8")) - len(new_content.encode("utf-8"))
+    return PruneResult(locale, removed, bytes_saved)
+
+
+def prune_identical_dir(
+    localizations_dir: str,
+    table: str = "Localizable",
+    source_language: str = "en",
+    allowlist: set[str] | frozenset[str] = frozenset(),
+    dry_run: bool = False,
+    jobs: int | None = None,
+) -> list[PruneResult]:
+    """Remove untranslated copies of source values from every locale's table.
+
+    The source language table is read once and every other locale is
+    processed in parallel. Files are only written when entries are removed.
+
+    Args:
+        localizations_dir: A directory of ``*.lproj`` directories, such as
+            ``BitwardenResources/Localizations``.
+        table: The strings table name, without extension.
+        source_language: The development language whose values are compared
+            against.
+        allowlist: Keys whose identical translations are intentional.
+        dry_run: Report what would be removed without writing any files.
+        jobs: The number of worker processes; see ``process_map``.
+
+    Returns:
+        A ``PruneResult`` for each locale that has the table, sorted by locale.
+    """
+    filename = f"{table}.strings"
+    source_values = read_values(
+        os.path.join(localizations_dir, f"{source_language}.lproj", filename)
+    )
+    tasks = [
+        (locale, os.path.join(lproj_path, filename), dry_run)
+        for locale, lproj_path in find_locale_dirs(localizations_dir)
+        if locale != source_language and os.path.isfile(os.path.join(lproj_path, filename))
+    ]
+    return process_map(
+        _prune_file,
+        tasks,
+        jobs=jobs,
+        initializer=_init_worker,
+        initargs=(source_values, frozenset(allowlist)),
+    )
@@ -0,0 +1,389 @@
+"""
+rename_keys
+
+Renames localization keys everywhere they are used: the entries of every
+locale's ``.strings`` and ``.stringsdict`` tables and the
+``Localizations.X`` references in Swift source code. Keys can be deleted from
+every table in the same run; Swift references to deleted keys are counted so
+they can be cleaned up by hand.
+
+Every file is read and rewritten in memory in a pool of worker processes,
+each in a single pass no matter how many keys are renamed or deleted.
+Nothing is written until every file has been processed, and then all changed
+files are written together with ``write_files``, so a failure leaves the tree
+as it was.
+"""
+
+import os
+import re
+from collections.abc import Sequence
+from typing import NamedTuple
+from xml.sax.saxutils import escape, unescape
+
+from delete_unused_strings import find_swift_files
+from key_collisions import KeyLocation, find_collisions, swiftgen_identifier, table_key_locations
+from strings_file_utils import filter_entries, find_locale_dirs, process_map, write_files
+from swift_lexer import find_localization_references
+
+# Matches the tokens of a stringsdict file that affect which keys are at the
+# top level: dict openers and closers, keys, and comments (skipped whole).
+_STRINGSDICT_TOKEN_RE = re.compile(
+    r'<!--.*?-->|<dict\s*/>|<(?P<close>/?)dict\s*>|<key>(?P<key>[^<]*)</key>',
+    re.DOTALL,
+)
+
+# A raw key that can be written between quotes in a ``.strings`` file: no
+# newlines, and no double quotes or backslashes unless escaped.
+_RAW_KEY_RE = re.compile(r'(?:[^"\\\n]|\\.)+')
+
+STRINGS = "strings"
+STRINGSDICT = "stringsdict"
+SWIFT = "swift"
+
+
+class RenameError(Exception):
+    """Raised when a set of renames cannot be applied safely."""
+
+
+class FileRename(NamedTuple):
+    """A file affected by a rename or deletion.
+
+    ``count`` is the number of entries or references rewritten or deleted.
+    ``dangling`` is the number of Swift references to deleted keys, which are
+    left in place.
+    """
+
+    path: str
+    kind: str
+    count: int
+    dangling: int = 0
+
+
+# Installed in each worker process by ``_init_worker`` so the renames are sent
+# to a worker once rather than once per file.
+_renames: dict[str, str] = {}
+_deletions: frozenset[str] = frozenset()
+_identifier_renames: dict[str, str] = {}
+_deleted_identifiers: frozenset[str] = frozenset()
+
+
+def identifier_renames(renames: dict[str, str]) -> dict[str, str]:
+    """Map the SwiftGen identifiers of renamed keys to their new identifiers.
+
+    Renames that do not change the identifier (e.g. ``"Name?"`` to
+    ``"Name"``) are omitted.
+
+    Args:
+        renames: A dict mapping each old raw key to its new raw key.
+
+    Returns:
+        A dict mapping each old identifier to its new identifier.
+    """
+    result: dict[str, str] = {}
+    for old, new in renames.items():
+        old_identifier = swiftgen_identifier(old)
+        new_identifier = swiftgen_identifier(new)
+        if old_identifier != new_identifier:
+            result[old_identifier] = new_identifier
+    return result
+
+
+def rename_strings_content(
+    content: str, renames: dict[str, str], deletions: frozenset[str] = frozenset()
+) -> tuple[str, int]:
+    """Rename and delete entries in ``.strings`` content.
+
+    Only the key of each renamed entry line is replaced, via
+    character-position slicing, so values, comments and formatting are
+    preserved exactly. Deleted entries are removed along with their comment,
+    as by ``filter_entries``.
+
+    Args:
+        content: The full text of the ``.strings`` file.
+        renames: A dict mapping each old raw key to its new raw key.
+        deletions: Raw keys whose entries are removed.
+
+    Returns:
+        A tuple of ``(new_content, count)`` where ``count`` is the number of
+        entries renamed or deleted.
+    """
+    count = 0
+
+    def should_keep(key: str) -> bool:
+        nonlocal count
+        if key in deletions:
+            return False
+        if key in renames:
+            count += 1
+        return True
+
+    new_content, removed = filter_entries(content, should_keep, renames)
+    return new_content, count + len(removed)
+
+
+def _line_start(content: str, index: int) -> int:
+    return content.rfind("\n", 0, index) + 1
+
+
+def _line_end(content: str, index: int) -> int:
+    end = content.find("\n", index)
+    return len(content) if end == -1 else end + 1
+
+
+def rename_stringsdict_content(
+    content: str, renames: dict[str, str], deletions: frozenset[str] = frozenset()
+) -> tuple[str, int]:
+    """Rename and delete the top-level entries of ``.stringsdict`` content.
+
+    Keys nested inside an entry, such as variable names, are left alone even
+    if they match a renamed key. A deleted entry is removed from the start of
+    its ``<key>`` line (or of a comment directly above it) to the end of the
+    line that closes its ``<dict>``.
+
+    Args:
+        content: The full text of the ``.stringsdict`` file.
+        renames: A dict mapping each old raw key to its new raw key.
+        deletions: Raw keys whose entries are removed.
+
+    Returns:
+        A tuple of ``(new_content, count)`` where ``count`` is the number of
+        entries renamed or deleted.
+    """
+    output: list[str] = []
+    position = 0
+    depth = 0
+    count = 0
+    # The start of a top-level comment when it is the token just before the
+    # current one, so a deleted entry takes its comment with it.
+    comment_start: int | None = None
+    # Where the entry being deleted starts, while its value is being skipped.
+    deleting_from: int | None = None
+    for m in _STRINGSDICT_TOKEN_RE.finditer(content):
+        attached_comment = comment_start
+        comment_start = None
+        if m.group("key") is not None:
+            key = unescape(m.group("key"))
+            # The root dict is depth 1; its keys are the entry keys.
+            if depth != 1 or deleting_from is not None:
+                continue
+            if key in deletions:
+                start = m.start() if attached_comment is None else attached_comment
+                if content[_line_start(content, start) : start].strip() == "":
+                    start = _line_start(content, start)
+                deleting_from = start
+            elif key in renames:
+                output.append(content[position : m.start("key")])
+                output.append(escape(renames[key]))
+                position = m.end("key")
+                count += 1
+        elif m.group("close") is not None:
+            depth += -1 if m.group("close") else 1
+            if deleting_from is not None and depth == 1:
+                output.append(content[position:deleting_from])
+                position = _line_end(content, m.end())
+                deleting_from = None
+                count += 1
+        elif m.group(0).startswith("<!--") and depth == 1 and deleting_from is None:
+            comment_start = m.start()
+    output.append(content[position:])
+    return "".join(output), count
+
+
+def rename_swift_source(source: str, renames: dict[str, str]) -> tuple[str, int]:
+    """Rewrite ``Localizations.X`` references in Swift source.
+
+    References in comments and string literals are left alone; see
+    ``swift_lexer``.
+
+    Args:
+        source: The full text of a Swift source file.
+        renames: A dict mapping each old identifier to its new identifier, as
+            returned by ``identifier_renames``.
+
+    Returns:
+        A tuple of ``(new_source, count)`` where ``count`` is the number of
+        references rewritten.
+    """
+    output: list[str] = []
+    position = 0
+    count = 0
+    for reference in find_localization_references(source):
+        new_identifier = renames.get(reference.identifier)
+        if new_identifier is None:
+            continue
+        output.append(source[position : reference.start])
+        output.append(new_identifier)
+        position = reference.end
+        count += 1
+    if not count:
+        return source, 0
+    output.append(source[position:])
+    return "".join(output), count
+
+
+def count_swift_references(source: str, identifiers: frozenset[str]) -> int:
+    """Count ``Localizations.X`` references to any of ``identifiers``.
+
+    Args:
+        source: The full text of a Swift source file.
+        identifiers: SwiftGen identifiers to look for.
+
+    Returns:
+        The number of references found.
+    """
+    return sum(1 for reference in find_localization_references(source) if reference.identifier in identifiers)
+
+
+def _init_worker(
+    renames: dict[str, str],
+    swift_renames: dict[str, str],
+    deletions: frozenset[str] = frozenset(),
+    deleted_identifiers: frozenset[str] = frozenset(),
+) -> None:
+    global _renames, _identifier_renames, _deletions, _deleted_identifiers
+    _renames = renames
+    _identifier_renames = swift_renames
+    _deletions = deletions
+    _deleted_identifiers = deleted_identifiers
+
+
+def _rename_file(task: tuple[str, str]) -> tuple[FileRename, str | None]:
+    kind, path = task
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    dangling = 0
+    if kind == STRINGS:
+        new_content, count = rename_strings_content(content, _renames, _deletions)
+    elif kind == STRINGSDICT:
+        new_content, count = rename_stringsdict_content(content, _renames, _deletions)
+    else:
+        new_content, count = rename_swift_source(content, _identifier_renames)
+        if _deleted_identifiers:
+            dangling = count_swift_references(content, _deleted_identifiers)
+    return FileRename(path, kind, count, dangling), new_content if count else None
+
+
+def validate_renames(
+    renames: dict[str, str],
+    strings_path: str,
+    stringsdict_path: str | None = None,
+    deletions: frozenset[str] = frozenset(),
+) -> None:
+    """Check that renames and deletions can be applied to a source language table.
+
+    Args:
+        renames: A dict mapping each old raw key to its new raw key.
+        strings_path: Path to the source language ``.strings`` file.
+        stringsdict_path: Path to the matching ``.stringsdict`` file; see
+            ``table_key_locations``.
+        deletions: Raw keys to delete.
+
+    Raises:
+        RenameError: If an old or deleted key does not exist, a key is both
+            renamed and deleted, a new key is empty, has surrounding
+            whitespace or cannot be written in a ``.strings`` file, a new key
+            already exists or is the target of more than one rename, or a new
+            key's identifier would collide with another key's.
+    """
+    for old, new in renames.items():
+        if new != new.strip() or not _RAW_KEY_RE.fullmatch(new):
+            raise RenameError(f"Invalid new key {new!r} for {old}")
+
+    locations = table_key_locations(strings_path, stringsdict_path)
+    keys = {location.key for location in locations}
+
+    missing = [key for key in [*renames, *sorted(deletions)] if key not in keys]
+    if missing:
+        raise RenameError(f"Keys not found: {', '.join(missing)}")
+
+    conflicting = sorted(deletions.intersection(renames))
+    if conflicting:
+        raise RenameError(f"Keys both renamed and deleted: {', '.join(conflicting)}")
+
+    locations = [location for location in locations if location.key not in deletions]
+    remaining = keys - renames.keys() - deletions
+    targets: set[str] = set()
+    for new in renames.values():
+        if new in remaining or new in targets:
+            raise RenameError(f"Key already exists: {new}")
+        targets.add(new)
+
+    renamed_locations = [
+        KeyLocation(renames.get(location.key, location.key), location.path, location.line_number)
+        for location in locations
+    ]
+    for group in find_collisions(renamed_locations):
+        group_keys = [location.key for location in group.locations]
+        if targets.intersection(group_keys):
+            raise RenameError(
+                f"Renamed keys would collide on identifier {group.identifier}: "
+                f"{', '.join(group_keys)}"
+            )
+
+
+def rename_keys(
+    localizations_dir: str,
+    renames: dict[str, str],
+    swift_dirs: Sequence[str] = (),
+    table: str = "Localizable",
+    source_language: str = "en",
+    dry_run: bool = False,
+    jobs: int | None = None,
+    deletions: frozenset[str] = frozenset(),
+) -> list[FileRename]:
+    """Rename and delete keys in every locale's tables and in Swift references.
+
+    Args:
+        localizations_dir: A directory of ``*.lproj`` directories, such as
+            ``BitwardenResources/Localizations``.
+        renames: A dict mapping each old raw key to its new raw key.
+        swift_dirs: Directories to search recursively for Swift source files.
+        table: The table name shared by the ``.strings`` and ``.stringsdict``
+            files, without extension.
+        source_language: The development language, whose table the renames
+            are validated against.
+        dry_run: Report what would change without writing any files.
+        jobs: The number of worker processes; see ``process_map``.
+        deletions: Raw keys to delete from every table. Swift references to
+            them are counted in ``FileRename.dangling`` but not changed.
+
+    Returns:
+        A ``FileRename`` for each file that changed or has dangling
+        references, tables first in locale order, then Swift files.
+
+    Raises:
+        RenameError: If the renames fail ``validate_renames``. No files are
+            changed.
+    """
+    renames = {old: new for old, new in renames.items() if old != new}
+    deletions = frozenset(deletions)
+    if not renames and not deletions:
+        return []
+    validate_renames(
+        renames,
+        os.path.join(localizations_dir, f"{source_language}.lproj", f"{table}.strings"),
+        deletions=deletions,
+    )
+
+    tasks: list[tuple[str, str]] = []
+    for _, lproj_path in find_locale_dirs(localizations_dir):
+        for kind in (STRINGS, STRINGSDICT):
+            path = os.path.join(lproj_path, f"{table}.{kind}")
+            if os.path.isfile(path):
+                tasks.append((kind, path))
+    swift_renames = identifier_renames(renames)
+    deleted_identifiers = frozenset(swiftgen_identifier(key) for key in deletions)
+    if swift_renames or deleted_identifiers:
+        tasks.extend((SWIFT, path) for path in find_swift_files(swift_dirs))
+
+    results = process_map(
+        _rename_file,
+        tasks,
+        jobs=jobs,
+        initializer=_init_worker,
+        initargs=(renames, swift_renames, deletions, deleted_identifiers),
+    )
+    changed = {result.path: content for result, content in results if content is not None}
+    if changed and not dry_run:
+        write_files(changed)
+    return [result for result, content in results if content is not None or result.dangling]
@@ -0,0 +1,207 @@
+"""
+size_report
+
+Measures how much each locale's Localizable.strings and Localizable.stringsdict
+tables cost, both as source files and as the binary property lists Xcode
+compiles them into, and which keys account for the most bytes across all
+locales.
+"""
+
+import os
+import plistlib
+import re
+from collections import Counter
+from typing import NamedTuple
+
+from strings_file_utils import find_locale_dirs, iter_entries, process_map, unescape_value
+from stringsdict_file_utils import StringsdictEntry, iter_stringsdict_entries, render_stringsdict
+
+# Matches an XML comment in a stringsdict file.
+_XML_COMMENT_RE = re.compile(rb"<!--.*?-->", re.DOTALL)
+
+# The bytes `render_stringsdict` writes around the entries of a file.
+_STRINGSDICT_OVERHEAD = len(render_stringsdict([]).encode("utf-8"))
+
+
+class LocaleSize(NamedTuple):
+    """Byte counts for one locale's strings table."""
+
+    locale: str
+    entries: int
+    strings_bytes: int
+    stringsdict_bytes: int
+    comment_bytes: int
+    compiled_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.strings_bytes + self.stringsdict_bytes
+
+
+class SizeReport(NamedTuple):
+    """Byte counts for every locale and the keys with the largest footprint."""
+
+    locales: list[LocaleSize]
+    top_keys: list[tuple[str, int]]
+
+    def to_json(self) -> dict:
+        """Return the report as a JSON-serializable dict."""
+        totals = {
+            field: sum(getattr(size, field) for size in self.locales)
+            for field in (
+                "entries",
+                "strings_bytes",
+                "stringsdict_bytes",
+                "comment_bytes",
+                "compiled_bytes",
+            )
+        }
+        totals["total_bytes"] = totals["strings_bytes"] + totals["stringsdict_bytes"]
+        return {
+            "totals": totals,
+            "locales": [
+                {**size._asdict(), "total_bytes": size.total_bytes}
+                for size in self.locales
+            ],
+            "top_keys": [{"key": key, "bytes": size} for key, size in self.top_keys],
+        }
+
+
+def _stringsdict_plist(entry: StringsdictEntry) -> dict:
+    plist: dict = {"NSStringLocalizedFormatKey": entry.format}
+    for variable in entry.variables:
+        plist[variable.name] = {
+            "NSStringFormatSpecTypeKey": "NSStringPluralRuleType",
+            "NSStringFormatValueTypeKey": variable.value_type,
+            **variable.forms,
+        }
+    return plist
+
+
+def measure_strings(content: str) -> tuple[dict[str, int], int, int]:
+    """Measure the entries and comments of Localizable.strings content.
+
+    Args:
+        content: The full text of the ``.strings`` file.
+
+    Returns:
+        A tuple of ``(key_bytes, comment_bytes, compiled_bytes)``.
+        ``key_bytes`` maps each raw key to the UTF-8 size of its entry line.
+        ``comment_bytes`` is the size of every line that is neither an entry
+        nor blank. ``compiled_bytes`` is the size of the binary property list
+        that Xcode compiles the table into.
+    """
+    lines = content.splitlines(keepends=True)
+    key_bytes: dict[str, int] = {}
+    compiled: dict[str, str] = {}
+    entry_lines: set[int] = set()
+
+    for entry in iter_entries(lines):
+        entry_lines.add(entry.line_number)
+        key_bytes[entry.key] = key_bytes.get(entry.key, 0) + len(
+            lines[entry.line_number - 1].encode("utf-8")
+        )
+        compiled.setdefault(unescape_value(entry.key), unescape_value(entry.value))
+
+    comment_bytes = sum(
+        len(line.encode("utf-8"))
+        for line_number, line in enumerate(lines, start=1)
+        if line_number not in entry_lines and line.strip()
+    )
+    compiled_bytes = len(plistlib.dumps(compiled, fmt=plistlib.FMT_BINARY))
+    return key_bytes, comment_bytes, compiled_bytes
+
+
+def measure_stringsdict(stringsdict_path: str) -> tuple[dict[str, int], int, int]:
+    """Measure the entries and comments of a ``.stringsdict`` file.
+
+    The per-key size is that of the entry as ``render_stringsdict`` would write
+    it, since the streaming parser does not track byte offsets.
+
+    Args:
+        stringsdict_path: Path to the ``.stringsdict`` file to measure.
+
+    Returns:
+        A tuple of ``(key_bytes, comment_bytes, compiled_bytes)`` with the
+        same meaning as for ``measure_strings``.
+    """
+    key_bytes: dict[str, int] = {}
+    compiled: dict[str, dict] = {}
+    for entry in iter_stringsdict_entries(stringsdict_path):
+        uncommented = entry._replace(comment=None)
+        key_bytes[entry.key] = (
+            len(render_stringsdict([uncommented]).encode("utf-8")) - _STRINGSDICT_OVERHEAD
+        )
+        compiled[entry.key] = _stringsdict_plist(entry)
+
+    with open(stringsdict_path, "rb") as f:
+        comment_bytes = sum(len(m.group(0)) for m in _XML_COMMENT_RE.finditer(f.read()))
+    compiled_bytes = len(plistlib.dumps(compiled, fmt=plistlib.FMT_BINARY))
+    return key_bytes, comment_bytes, compiled_bytes
+
+
+def _measure_locale(task: tuple[str, str, str]) -> tuple[LocaleSize, dict[str, int]]:
+    locale, lproj_path, table = task
+    key_bytes: Counter[str] = Counter()
+    strings_bytes = stringsdict_bytes = comment_bytes = compiled_bytes = 0
+
+    strings_path = os.path.join(lproj_path, f"{table}.strings")
+    if os.path.isfile(strings_path):
+        with open(strings_path, encoding="utf-8") as f:
+            content = f.read()
+        strings_bytes = len(content.encode("utf-8"))
+        sizes, comments, compiled = measure_strings(content)
+        key_bytes.update(sizes)
+        comment_bytes += comments
+        compiled_bytes += compiled
+
+    stringsdict_path = os.path.join(lproj_path, f"{table}.stringsdict")
+    if os.path.isfile(stringsdict_path):
+        stringsdict_bytes = os.path.getsize(stringsdict_path)
+        sizes, comments, compiled = measure_stringsdict(stringsdict_path)
+        key_bytes.update(sizes)
+        comment_bytes += comments
+        compiled_bytes += compiled
+
+    size = LocaleSize(
+        locale,
+        len(key_bytes),
+        strings_bytes,
+        stringsdict_bytes,
+        comment_bytes,
+        compiled_bytes,
+    )
+    return size, dict(key_bytes)
+
+
+def size_report(
+    localizations_dir: str,
+    table: str = "Localizable",
+    top: int = 20,
+    jobs: int | None = None,
+) -> SizeReport:
+    """Measure every locale of a strings table in parallel.
+
+    Args:
+        localizations_dir: A directory of ``*.lproj`` directories, such as
+            ``BitwardenResources/Localizations``.
+        table: The table name shared by the ``.strings`` and ``.stringsdict``
+            files, without extension.
+        top: How many keys to include in ``top_keys``.
+        jobs: The number of worker processes; see ``process_map``.
+
+    Returns:
+        A ``SizeReport`` with one ``LocaleSize`` per locale, sorted by locale,
+        and the ``top`` keys by cumulative entry bytes across all locales.
+    """
+    tasks = [
+        (locale, lproj_path, table)
+        for locale, lproj_path in find_locale_dirs(localizations_dir)
+    ]
+    locales: list[LocaleSize] = []
+    key_totals: Counter[str] = Counter()
+    for size, key_bytes in process_map(_measure_locale, tasks, jobs=jobs):
+        if size.total_bytes:
+            locales.append(size)
+        key_totals.update(key_bytes)
+    return SizeReport(locales, key_totals.most_common(top))
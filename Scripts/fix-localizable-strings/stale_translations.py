@@ -0,0 +1,253 @@
+"""
+stale_translations
+
+Detects translations that predate the current source language wording.
+
+For each locale, a manifest records a short fingerprint of the source value
+and of the translation for every key at the time the translation was last
+known to be current. A translation is stale when the source value's
+fingerprint has changed since then but the translation's has not, i.e. the
+English text was reworded and the locale still carries a translation of the
+old text. Checking only compares fingerprints, so it needs one pass over the
+source table and one lookup per locale entry, with no version history.
+
+Updating a manifest records the current source fingerprint only for keys
+whose translation changed or that are new to the manifest. A translation that
+is unchanged keeps its old source fingerprint, so one that was stale stays
+stale until it is actually retranslated.
+
+Manifests are stored outside the ``.lproj`` directories, one JSON file per
+locale, so they are never copied into the app bundle.
+"""
+
+import hashlib
+import json
+import os
+from typing import NamedTuple
+
+from prune_identical_strings import read_values
+from strings_file_utils import find_locale_dirs, process_map
+
+# Fingerprints are truncated BLAKE2b digests. A collision only hides one
+# change to one key, so four bytes is plenty and keeps manifests compact.
+_FINGERPRINT_BYTES = 4
+
+_MANIFEST_VERSION = 1
+
+
+class StaleResult(NamedTuple):
+    """The stale and untracked keys of one locale's strings table.
+
+    ``untracked`` lists keys the manifest has no fingerprint for, such as keys
+    added since it was last updated or every key when there is no manifest.
+    """
+
+    locale: str
+    stale: list[str]
+    untracked: list[str]
+
+
+# Installed in each worker process by ``_init_worker`` so the source
+# fingerprints are sent to a worker once rather than once per locale.
+_source_fingerprints: dict[str, str] = {}
+
+
+def fingerprint(value: str) -> str:
+    """Return the fingerprint of a raw, still-escaped value.
+
+    Args:
+        value: The raw value to fingerprint.
+
+    Returns:
+        A short hexadecimal digest of the value.
+    """
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=_FINGERPRINT_BYTES).hexdigest()
+
+
+def manifest_path(manifests_dir: str, locale: str, table: str = "Localizable") -> str:
+    """Return the path of a locale's manifest for a strings table."""
+    return os.path.join(manifests_dir, f"{table}.{locale}.json")
+
+
+def load_manifest(path: str) -> dict[str, tuple[str, str]]:
+    """Read a manifest written by ``write_manifest``.
+
+    Args:
+        path: Path to the manifest file.
+
+    Returns:
+        A dict mapping each raw key to its ``(source_fingerprint,
+        translation_fingerprint)``, or an empty dict if the file does not
+        exist.
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    return {
+        key: (fingerprints[: _FINGERPRINT_BYTES * 2], fingerprints[_FINGERPRINT_BYTES * 2 :])
+        for key, fingerprints in manifest.get("fingerprints", {}).items()
+    }
+
+
+def write_manifest(path: str, fingerprints: dict[str, tuple[str, str]]) -> None:
+    """Write a manifest of source and translation fingerprints.
+
+    Each key's two fingerprints are stored concatenated in a single string.
+
+    Args:
+        path: Path of the manifest file to write.
+        fingerprints: A dict mapping each raw key to its
+            ``(source_fingerprint, translation_fingerprint)``.
+    """
+    manifest = {
+        "version": _MANIFEST_VERSION,
+        "fingerprints": {
+            key: source + translation
+            for key, (source, translation) in sorted(fingerprints.items())
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=0, ensure_ascii=False)
+        f.write("\n")
+
+
+def find_stale(
+    values: dict[str, str],
+    source_fingerprints: dict[str, str],
+    manifest: dict[str, tuple[str, str]],
+) -> tuple[list[str], list[str]]:
+    """Find the stale and untracked keys of one locale.
+
+    Keys that are not in the source table are ignored.
+
+    Args:
+        values: The locale's raw values keyed by raw key, as returned by
+            ``read_values``.
+        source_fingerprints: The current fingerprint of each source value.
+        manifest: The locale's manifest, as returned by ``load_manifest``.
+
+    Returns:
+        A tuple of ``(stale_keys, untracked_keys)``, each in the order of
+        ``values``.
+    """
+    stale: list[str] = []
+    untracked: list[str] = []
+    for key, value in values.items():
+        current_source = source_fingerprints.get(key)
+        if current_source is None:
+            continue
+        recorded = manifest.get(key)
+        if recorded is None:
+            untracked.append(key)
+        elif recorded[0] != current_source and recorded[1] == fingerprint(value):
+            stale.append(key)
+    return stale, untracked
+
+
+def updated_manifest(
+    values: dict[str, str],
+    source_fingerprints: dict[str, str],
+    manifest: dict[str, tuple[str, str]],
+) -> dict[str, tuple[str, str]]:
+    """Return a locale's manifest brought up to date with its translations.
+
+    A key whose translation is unchanged since the manifest recorded it keeps
+    its recorded source fingerprint; only new keys and retranslated keys are
+    recorded as translating the current source value. Keys that are not in
+    the source table are dropped.
+
+    Args:
+        values: The locale's raw values keyed by raw key, as returned by
+            ``read_values``.
+        source_fingerprints: The current fingerprint of each source value.
+        manifest: The locale's manifest, as returned by ``load_manifest``.
+
+    Returns:
+        The new manifest, mapping each raw key to its ``(source_fingerprint,
+        translation_fingerprint)``.
+    """
+    updated: dict[str, tuple[str, str]] = {}
+    for key, value in values.items():
+        current_source = source_fingerprints.get(key)
+        if current_source is None:
+            continue
+        translation = fingerprint(value)
+        recorded = manifest.get(key)
+        if recorded is not None and recorded[1] == translation:
+            updated[key] = recorded
+        else:
+            updated[key] = (current_source, translation)
+    return updated
+
+
+def _init_worker(source_fingerprints: dict[str, str]) -> None:
+    global _source_fingerprints
+    _source_fingerprints = source_fingerprints
+
+
+def _check_locale(task: tuple[str, str, str, bool]) -> StaleResult:
+    locale, strings_path, locale_manifest_path, update = task
+    values = read_values(strings_path)
+    manifest = load_manifest(locale_manifest_path)
+    stale, untracked = find_stale(values, _source_fingerprints, manifest)
+
+    if update:
+        write_manifest(locale_manifest_path, updated_manifest(values, _source_fingerprints, manifest))
+
+    return StaleResult(locale, stale, untracked)
+
+
+def stale_translations(
+    localizations_dir: str,
+    manifests_dir: str,
+    table: str = "Localizable",
+    source_language: str = "en",
+    update: bool = False,
+    jobs: int | None = None,
+) -> list[StaleResult]:
+    """Find stale translations in every locale, optionally updating manifests.
+
+    Args:
+        localizations_dir: A directory of ``*.lproj`` directories, such as
+            ``BitwardenResources/Localizations``.
+        manifests_dir: The directory holding each locale's manifest.
+        table: The strings table name, without extension.
+        source_language: The development language whose values are tracked.
+        update: After checking, record new and changed translations as up to
+            date with the current source values; see ``updated_manifest``.
+            Run this once the translations have been synced.
+        jobs: The number of worker processes; see ``process_map``.
+
+    Returns:
+        A ``StaleResult`` for each locale that has the table, sorted by
+        locale. With ``update``, these describe the manifests as they were
+        before updating.
+    """
+    filename = f"{table}.strings"
+    source_fingerprints = {
+        key: fingerprint(value)
+        for key, value in read_values(
+            os.path.join(localizations_dir, f"{source_language}.lproj", filename)
+        ).items()
+    }
+    if update:
+        os.makedirs(manifests_dir, exist_ok=True)
+
+    tasks = [
+        (
+            locale,
+            os.path.join(lproj_path, filename),
+            manifest_path(manifests_dir, locale, table),
+            update,
+        )
+        for locale, lproj_path in find_locale_dirs(localizations_dir)
+        if locale != source_language and os.path.isfile(os.path.join(lproj_path, filename))
+    ]
+    return process_map(
+        _check_locale,
+        tasks,
+        jobs=jobs,
+        initializer=_init_worker,
+        initargs=(source_fingerprints,),
+    )
@@ -4,17 +4,215 @@ strings_file_utils
 Shared utilities for parsing and filtering Localizable.strings file content.
 """
 
+import os
 import re
-from collections.abc import Callable
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import NamedTuple, TypeVar
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 # Matches a complete key/value entry line.
 _ENTRY_RE = re.compile(
     r'^\s*"(?P<key>(?:[^"\\]|\\.)*)"\s*=\s*"(?:[^"\\]|\\.)*"\s*;\s*$'
 )
 
+# Matches a complete key/value entry line, capturing key and value separately.
+_ENTRY_VALUE_RE = re.compile(
+    r'^\s*"(?P<key>(?:[^"\\]|\\.)*)"'
+    r'\s*=\s*"'
+    r'(?P<value>(?:[^"\\]|\\.)*)'
+    r'"\s*;\s*$'
+)
+
+# Matches a single backslash escape sequence in a ``.strings`` key or value.
+_ESCAPE_RE = re.compile(r'\\(U[0-9a-fA-F]{4}|.)', re.DOTALL)
+
+_UNESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\"}
+
+_ESCAPES = {"\n": "\\n", "\t": "\\t", "\r": "\\r", '"': '\\"', "\\": "\\\\"}
+
+# Matches any character that must be escaped when written to a ``.strings`` file.
+_NEEDS_ESCAPE_RE = re.compile(r'[\n\t\r"\\]')
+
+
+class StringsEntry(NamedTuple):
+    """A single key/value entry parsed from a ``.strings`` file.
+
+    ``key`` and ``value`` are the raw, still-escaped text between the quotes.
+    ``comment`` is the text of the comment block immediately preceding the
+    entry (delimiters stripped), or ``None``. ``line_number`` is 1-based.
+    """
+
+    key: str
+    value: str
+    comment: str | None
+    line_number: int
+
+
+def unescape_value(value: str) -> str:
+    """Decode the backslash escapes in a raw ``.strings`` key or value.
+
+    Args:
+        value: The raw text between the quotes of a key or value.
+
+    Returns:
+        The decoded string, e.g. ``'Say \\"hi\\"'`` becomes ``'Say "hi"'``.
+    """
+    if "\\" not in value:
+        return value
+
+    def replace(m: re.Match) -> str:
+        escape = m.group(1)
+        if len(escape) == 5:
+            return chr(int(escape[1:], 16))
+        return _UNESCAPES.get(escape, escape)
+
+    return _ESCAPE_RE.sub(replace, value)
+
+
+def escape_value(value: str) -> str:
+    """Encode a string for writing between the quotes of a ``.strings`` entry.
+
+    This is the inverse of ``unescape_value``.
+
+    Args:
+        value: The decoded string.
+
+    Returns:
+        The escaped text, suitable for ``"key" = "<value>";``.
+    """
+    return _NEEDS_ESCAPE_RE.sub(lambda m: _ESCAPES[m.group(0)], value)
+
+
+def _comment_text(lines: list[str]) -> str | None:
+    """Strip comment delimiters from a buffered comment block."""
+    parts: list[str] = []
+    for line in lines:
+        text = line.strip()
+        if text.startswith("//"):
+            text = text[2:]
+        else:
+            if text.startswith("/*"):
+                text = text[2:]
+            if text.endswith("*/"):
+                text = text[:-2]
+        text = text.strip()
+        if text:
+            parts.append(text)
+    return "\n".join(parts) if parts else None
+
+
+def iter_entries(lines: Iterable[str]) -> Iterator[StringsEntry]:
+    """Stream the key/value entries of Localizable.strings content.
+
+    Uses the same comment state machine as ``filter_entries``: a comment block
+    is attached to the entry that immediately follows it, and a blank line or
+    any other non-entry line breaks that association. Because ``lines`` is
+    consumed lazily, an open file object can be passed directly and only one
+    entry is held in memory at a time.
+
+    Args:
+        lines: An iterable of lines, e.g. an open file or the result of
+            ``content.splitlines(keepends=True)``.
+
+    Yields:
+        A ``StringsEntry`` for every entry, in file order.
+    """
+    pending: list[str] = []
+    in_block_comment = False
+
+    for line_number, line in enumerate(lines, start=1):
+        stripped = line.strip()
+
+        if in_block_comment:
+            pending.append(line)
+            if "*/" in line:
+                in_block_comment = False
+            continue
+
+        if not stripped:
+            pending = []
+            continue
+
+        if stripped.startswith("/*") and "*/" not in stripped:
+            in_block_comment = True
+            pending.append(line)
+            continue
+
+        if stripped.startswith("//") or (
+            stripped.startswith("/*") and stripped.endswith("*/")
+        ):
+            pending.append(line)
+            continue
+
+        m = _ENTRY_VALUE_RE.match(line)
+        if m:
+            yield StringsEntry(
+                m.group("key"), m.group("value"), _comment_text(pending), line_number
+            )
+        pending = []
+
+
+def find_locale_dirs(localizations_dir: str) -> list[tuple[str, str]]:
+    """List the ``*.lproj`` directories inside a localizations directory.
+
+    ``Base.lproj`` is skipped because it only exists so that Xcodegen detects
+    the localized resources; it never contains translations.
+
+    Args:
+        localizations_dir: A directory such as
+            ``BitwardenResources/Localizations``.
+
+    Returns:
+        A list of ``(locale, lproj_path)`` tuples sorted by locale, e.g.
+        ``[("af", ".../af.lproj"), ("ar", ".../ar.lproj"), ...]``.
+    """
+    result: list[tuple[str, str]] = []
+    for name in os.listdir(localizations_dir):
+        path = os.path.join(localizations_dir, name)
+        if not name.endswith(".lproj") or not os.path.isdir(path):
+            continue
+        locale = name[: -len(".lproj")]
+        if locale == "Base":
+            continue
+        result.append((locale, path))
+    result.sort()
+    return result
+
+
+def replace_values(content: str, replace: Callable[[str, str], str | None]) -> str:
+    """Rewrite the values of key/value entries in Localizable.strings content.
+
+    Only the value of each entry line is replaced, by character-position
+    slicing, so the rest of the line (indentation, spacing, newline) and every
+    other line are preserved exactly.
+
+    Args:
+        content: The full text of the ``.strings`` file.
+        replace: A callable that receives an entry's raw key and raw value and
+            returns its new raw value, or ``None`` to leave it unchanged.
+
+    Returns:
+        The updated file text.
+    """
+    lines = content.splitlines(keepends=True)
+    output: list[str] = []
+    for line in lines:
+        m = _ENTRY_VALUE_RE.match(line)
+        if m:
+            new_value = replace(m.group("key"), m.group("value"))
+            if new_value is not None:
+                line = line[: m.start("value")] + new_value + line[m.end("value") :]
+        output.append(line)
+    return "".join(output)
+
 
 def filter_entries(
-    content: str, should_keep: Callable[[str], bool]
+    content: str,
+    should_keep: Callable[[str], bool],
+    renames: Mapping[str, str] | None = None,
 ) -> tuple[str, list[str]]:
     """Filter key/value entries in Localizable.strings content by a predicate.
 
@@ -33,6 +231,8 @@ def filter_entries(
         should_keep: A callable that receives a raw key string and returns
             ``True`` if the entry should be kept, ``False`` if it should be
             removed.
+        renames: Optionally, a mapping of raw keys to new raw keys. The key
+            of each kept entry found in it is replaced in the same pass.
 
     Returns:
         A tuple of ``(new_content, removed_keys)`` where ``new_content`` is
@@ -83,6 +283,8 @@ def filter_entries(
             key = m.group("key")
             if should_keep(key):
                 output.extend(pending)
+                if renames and key in renames:
+                    line = line[: m.start("key")] + renames[key] + line[m.end("key") :]
                 output.append(line)
             else:
                 removed.append(key)
@@ -99,3 +301,105 @@ def filter_entries(
     output.extend(pending)
 
     return "".join(output), removed
+
+
+def process_map(
+    func: Callable[[_T], _R],
+    items: Iterable[_T],
+    jobs: int | None = None,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple = (),
+) -> list[_R]:
+    """Apply ``func`` to each item in a pool of worker processes.
+
+    Parsing a strings table is CPU-bound, so tools that touch every locale use
+    processes rather than threads. ``func`` and ``initializer`` must be
+    module-level functions so they can be sent to the workers.
+
+    Args:
+        func: The function to apply to each item.
+        items: The items to process.
+        jobs: The number of worker processes. ``None`` uses one per CPU, and
+            ``1`` runs everything in the current process, which is useful for
+            debugging and for small inputs.
+        initializer: Called once in each worker before any items are
+            processed, e.g. to install data shared by every item.
+        initargs: Arguments passed to ``initializer``.
+
+    Returns:
+        The results, in the same order as ``items``.
+    """
+    items = list(items)
+    if jobs == 1 or len(items) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(item) for item in items]
+
+    # Imported here since loading multiprocessing is a noticeable part of
+    # the start-up of commands that never need a pool.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=initializer, initargs=initargs
+    ) as executor:
+        return list(executor.map(func, items))
+
+
+def write_files(contents: dict[str, str]) -> None:
+    """Write several files so that either every file changes or none does.
+
+    Each file's new content is first staged in a temporary file in the same
+    directory. Only once every file has been staged are they moved into place
+    with ``os.replace``, which is atomic per file. If staging fails, the
+    temporary files are removed and nothing is changed. If a move fails, the
+    files already moved are restored to their original contents.
+
+    Args:
+        contents: A dict mapping each path to its new text.
+
+    Raises:
+        OSError: If a file could not be staged or moved. The files are left
+            as they were.
+    """
+    staged: list[tuple[str, str]] = []
+    try:
+        for path, content in contents.items():
+            fd, staged_path = tempfile.mkstemp(
+                dir=os.path.dirname(path) or ".",
+                prefix=f".{os.path.basename(path)}.",
+                suffix=".tmp",
+            )
+            staged.append((path, staged_path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            if os.path.exists(path):
+                os.chmod(staged_path, os.stat(path).st_mode)
+    except BaseException:
+        for _, staged_path in staged:
+            os.unlink(staged_path)
+        raise
+
+    originals: dict[str, bytes | None] = {}
+    for path, _ in staged:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                originals[path] = f.read()
+        else:
+            originals[path] = None
+
+    replaced: list[str] = []
+    try:
+        for path, staged_path in staged:
+            os.replace(staged_path, path)
+            replaced.append(path)
+    except BaseException:
+        for path in replaced:
+            original = originals[path]
+            if original is None:
+                os.unlink(path)
+            else:
+                with open(path, "wb") as f:
+                    f.write(original)
+        for path, staged_path in staged[len(replaced):]:
+            os.unlink(staged_path)
+        raise
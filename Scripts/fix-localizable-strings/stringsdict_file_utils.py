@@ -0,0 +1,177 @@
+"""
+stringsdict_file_utils
+
+Shared utilities for reading and writing Localizable.stringsdict files.
+"""
+
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
+from typing import IO, NamedTuple
+
+_FORMAT_KEY = "NSStringLocalizedFormatKey"
+_SPEC_TYPE_KEY = "NSStringFormatSpecTypeKey"
+_VALUE_TYPE_KEY = "NSStringFormatValueTypeKey"
+_PLURAL_RULE_TYPE = "NSStringPluralRuleType"
+
+# CLDR plural categories in the order Xcode writes them.
+PLURAL_CATEGORIES = ("zero", "one", "two", "few", "many", "other")
+
+_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" '
+    '"http://www.apple.com/DTDs/PropertyList-1.0.dtd">\n'
+    '<plist version="1.0">\n'
+    "<dict>\n"
+)
+
+_FOOTER = "</dict>\n</plist>\n"
+
+
+def escape(text: str) -> str:
+    """Escape text for an XML element, as ``xml.sax.saxutils.escape`` does.
+
+    ``xml.sax.saxutils`` imports ``urllib.request``, which costs more than
+    everything else ``generate`` loads to find that it has nothing to do.
+    """
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _comment_text(text: str) -> str:
+    """Make text safe for an XML comment, which is not entity-decoded.
+
+    A comment may contain any character except the sequence ``--``, so only
+    that is broken up; ``&`` and ``<`` are written as they are.
+    """
+    while "--" in text:
+        text = text.replace("--", "- -")
+    return text
+
+
+class PluralVariable(NamedTuple):
+    """A ``%#@name@`` variable of a stringsdict entry.
+
+    ``forms`` maps each CLDR plural category present in the file (e.g.
+    ``"one"``, ``"other"``) to its string.
+    """
+
+    name: str
+    value_type: str
+    forms: dict[str, str]
+
+
+class StringsdictEntry(NamedTuple):
+    """A single top-level entry parsed from a ``.stringsdict`` file.
+
+    ``comment`` is the text of the ``<!-- -->`` comment immediately preceding
+    the entry's ``<key>``, or ``None``.
+    """
+
+    key: str
+    format: str
+    variables: list[PluralVariable]
+    comment: str | None
+
+
+def _plist_dict(element: ET.Element) -> dict:
+    """Convert a plist ``<dict>`` element of keys, strings and dicts to a dict."""
+    result: dict = {}
+    key = None
+    for child in element:
+        if child.tag == "key":
+            key = child.text or ""
+        elif key is not None:
+            result[key] = _plist_dict(child) if child.tag == "dict" else child.text or ""
+            key = None
+    return result
+
+
+def _entry_from_dict(key: str, values: dict, comment: str | None) -> StringsdictEntry:
+    variables: list[PluralVariable] = []
+    for name, spec in values.items():
+        if not isinstance(spec, dict) or spec.get(_SPEC_TYPE_KEY) != _PLURAL_RULE_TYPE:
+            continue
+        forms = {
+            category: spec[category]
+            for category in PLURAL_CATEGORIES
+            if isinstance(spec.get(category), str)
+        }
+        variables.append(PluralVariable(name, spec.get(_VALUE_TYPE_KEY, ""), forms))
+    return StringsdictEntry(key, values.get(_FORMAT_KEY, ""), variables, comment)
+
+
+def iter_stringsdict_entries(source: str | IO[bytes]) -> Iterator[StringsdictEntry]:
+    """Stream the top-level entries of a ``.stringsdict`` file.
+
+    The file is parsed incrementally and each entry's elements are discarded
+    once it has been yielded, so memory use is bounded by the largest single
+    entry rather than by the size of the file.
+
+    Args:
+        source: A path to, or a binary file object of, a ``.stringsdict`` file.
+
+    Yields:
+        A ``StringsdictEntry`` for every top-level entry, in file order.
+    """
+    stack: list[ET.Element] = []
+    key = None
+    comment = None
+
+    for event, element in ET.iterparse(source, events=("start", "end", "comment")):
+        if event == "start":
+            stack.append(element)
+            continue
+
+        if event == "comment":
+            # Only comments that sit directly inside the root <dict> describe an entry.
+            if len(stack) == 2:
+                comment = (element.text or "").strip() or None
+            continue
+
+        stack.pop()
+        if len(stack) != 2:
+            continue
+
+        root = stack[1]
+        if element.tag == "key":
+            key = element.text or ""
+        elif element.tag == "dict" and key is not None:
+            yield _entry_from_dict(key, _plist_dict(element), comment)
+            key = None
+            comment = None
+        root.clear()
+
+
+def render_stringsdict(entries: Iterable[StringsdictEntry]) -> str:
+    """Render entries as the text of a ``.stringsdict`` file.
+
+    The output uses the same tab-indented layout as the English source file
+    and writes each entry's comment as an XML comment above its key.
+
+    Args:
+        entries: The entries to write, in order.
+
+    Returns:
+        The full text of the ``.stringsdict`` file.
+    """
+    lines = [_HEADER]
+    for entry in entries:
+        if entry.comment:
+            lines.append(f"\t<!-- {_comment_text(entry.comment)} -->\n")
+        lines.append(f"\t<key>{escape(entry.key)}</key>\n")
+        lines.append("\t<dict>\n")
+        lines.append(f"\t\t<key>{_FORMAT_KEY}</key>\n")
+        lines.append(f"\t\t<string>{escape(entry.format)}</string>\n")
+        for variable in entry.variables:
+            lines.append(f"\t\t<key>{escape(variable.name)}</key>\n")
+            lines.append("\t\t<dict>\n")
+            lines.append(f"\t\t\t<key>{_SPEC_TYPE_KEY}</key>\n")
+            lines.append(f"\t\t\t<string>{_PLURAL_RULE_TYPE}</string>\n")
+            lines.append(f"\t\t\t<key>{_VALUE_TYPE_KEY}</key>\n")
+            lines.append(f"\t\t\t<string>{escape(variable.value_type)}</string>\n")
+            for category, value in variable.forms.items():
+                lines.append(f"\t\t\t<key>{category}</key>\n")
+                lines.append(f"\t\t\t<string>{escape(value)}</string>\n")
+            lines.append("\t\t</dict>\n")
+        lines.append("\t</dict>\n")
+    lines.append(_FOOTER)
+    return "".join(lines)
@@ -0,0 +1,214 @@
+"""
+swift_lexer
+
+A lightweight, single-pass lexer that finds ``Localizations.X`` references in
+Swift source while skipping comments and string literals, so commented-out
+code and text that merely mentions a key do not count as uses. In the same
+pass it can collect the contents of every constant string literal, so keys
+looked up by string (``NSLocalizedString("Key", ...)``,
+``String(localized: "Key")``) can be detected by set intersection.
+
+The lexer only understands as much Swift as it needs to: line comments,
+nested block comments, single-line, multi-line (``\"\"\"``) and raw (``#"..."#``)
+string literals, and ``\\(...)`` interpolations, whose contents are scanned as
+code. It jumps between these tokens with compiled regular expressions, so it
+never backtracks and runs in time linear in the size of the source.
+"""
+
+import re
+from typing import NamedTuple
+
+# Matches the next token of interest in code: a comment, a string literal
+# opener, or a `Localizations.identifier` reference (the identifier may be on the
+# next line, e.g. `Localizations\n    .foo`). `Localizations` must not be the end
+# of a longer name such as `preferredLocalizations`. Every alternative starts with one
+# of a handful of characters so the regex engine can skip ahead with a fast
+# character-set scan. Line comments and simple single-line string literals
+# (no interpolation) are matched whole, which is the common case, so most
+# tokens never reach the slower per-string loop.
+_CODE_TOKENS = (
+    r'[/#"L{extra}]'
+    r'(?:(?<=/)(?P<line_comment>/[^\n]*)'
+    r'|(?<=/)(?P<block_comment>\*)'
+    r'|(?<=L)(?<!\wL)ocalizations\s*\.(?P<identifier>[^\W\d]\w*)'
+    r'|(?<=")(?P<multiline_string>"")'
+    r'|(?<=")(?P<simple_string>(?:[^"\\\n]|\\[^(\n])*")'
+    r'|(?<=")(?P<string>)'
+    r'|(?<=#)(?P<raw_string>#*"(?:"")?)'
+    r'{extra_alternatives})'
+)
+_CODE_RE = re.compile(_CODE_TOKENS.format(extra="", extra_alternatives=""))
+
+# Inside a string interpolation, parentheses are also tracked so the end of the
+# interpolation can be found.
+_INTERPOLATION_RE = re.compile(
+    _CODE_TOKENS.format(
+        extra="()", extra_alternatives=r"|(?<=\()(?P<open>)|(?<=\))(?P<close>)"
+    )
+)
+
+# Matches the next opener or closer of a (possibly nested) block comment.
+_BLOCK_COMMENT_RE = re.compile(r'/\*|\*/')
+
+# Compiled string-body patterns keyed by `(hash_count, is_multiline)`.
+_STRING_BODY_RES: dict[tuple[int, bool], re.Pattern] = {}
+
+
+class LocalizationReference(NamedTuple):
+    """A ``Localizations.X`` reference found in Swift source.
+
+    ``start`` and ``end`` are the offsets of the identifier ``X`` itself, so
+    ``source[start:end] == identifier``.
+    """
+
+    identifier: str
+    start: int
+    end: int
+
+
+def _string_body_re(hash_count: int, multiline: bool) -> re.Pattern:
+    key = (hash_count, multiline)
+    pattern = _STRING_BODY_RES.get(key)
+    if pattern is None:
+        hashes = "#" * hash_count
+        closer = '"""' if multiline else '"'
+        alternatives = [
+            f"(?P<end>{re.escape(closer + hashes)})",
+            f"(?P<interpolation>\\\\{hashes}\\()",
+            f"(?P<escape>\\\\{hashes}.)",
+        ]
+        if not multiline:
+            # An unterminated single-line literal ends at the newline.
+            alternatives.append(r"(?P<newline>\n)")
+        pattern = re.compile("|".join(alternatives), re.DOTALL)
+        _STRING_BODY_RES[key] = pattern
+    return pattern
+
+
+class SwiftSourceScan(NamedTuple):
+    """Everything ``scan_swift_source`` found in a Swift source file.
+
+    ``string_literals`` holds the raw text between the quotes of every
+    single-line string literal that has no interpolation, escapes left as
+    written (e.g. ``Say \\"hi\\"``).
+    """
+
+    references: list[LocalizationReference]
+    string_literals: set[str]
+
+
+class _Scanner:
+    def __init__(self, source: str, collect_literals: bool = False):
+        self.source = source
+        self.collect_literals = collect_literals
+        self.references: list[LocalizationReference] = []
+        self.string_literals: set[str] = set()
+
+    def scan_code(self, pos: int, in_interpolation: bool = False) -> int:
+        """Scan code from ``pos``; return the offset just past the end.
+
+        In an interpolation, scanning stops after the ``)`` that closes it.
+        """
+        pattern = _INTERPOLATION_RE if in_interpolation else _CODE_RE
+        source = self.source
+        depth = 0
+        while True:
+            m = pattern.search(source, pos)
+            if m is None:
+                return len(source)
+            kind = m.lastgroup
+            pos = m.end()
+            if kind == "identifier":
+                self.references.append(
+                    LocalizationReference(m.group(kind), m.start(kind), pos)
+                )
+            elif kind == "simple_string":
+                if self.collect_literals:
+                    self.string_literals.add(source[m.start(kind) : pos - 1])
+            elif kind == "block_comment":
+                pos = self._skip_block_comment(pos)
+            elif kind == "string":
+                pos = self._scan_string(pos, 0, False)
+            elif kind == "multiline_string":
+                pos = self._scan_string(pos, 0, True)
+            elif kind == "raw_string":
+                raw = m.group(kind)
+                pos = self._scan_string(pos, raw.index('"') + 1, raw.endswith('"""'))
+            elif kind == "open":
+                depth += 1
+            elif kind == "close":
+                if depth == 0:
+                    return pos
+                depth -= 1
+
+    def _skip_block_comment(self, pos: int) -> int:
+        # Swift block comments nest, so count openers and closers.
+        depth = 1
+        while depth:
+            m = _BLOCK_COMMENT_RE.search(self.source, pos)
+            if m is None:
+                return len(self.source)
+            depth += 1 if m.group(0) == "/*" else -1
+            pos = m.end()
+        return pos
+
+    def _scan_string(self, pos: int, hash_count: int, multiline: bool) -> int:
+        pattern = _string_body_re(hash_count, multiline)
+        start = pos
+        constant = not multiline
+        while True:
+            m = pattern.search(self.source, pos)
+            if m is None:
+                return len(self.source)
+            kind = m.lastgroup
+            if kind == "end":
+                if constant and self.collect_literals:
+                    self.string_literals.add(self.source[start : m.start()])
+                return m.end()
+            if kind == "newline":
+                return m.end()
+            if kind == "interpolation":
+                constant = False
+                pos = self.scan_code(m.end(), in_interpolation=True)
+            else:
+                pos = m.end()
+
+
+def find_localization_references(source: str) -> list[LocalizationReference]:
+    """Find every ``Localizations.X`` reference in Swift source code.
+
+    References inside comments and string literals are ignored, but
+    references inside string interpolations (``"\\(Localizations.x)"``) are
+    found, since that is code.
+
+    Args:
+        source: The full text of a Swift source file.
+
+    Returns:
+        The references, in source order.
+    """
+    # Most files never mention the enum, and a substring test is far cheaper
+    # than lexing them.
+    if "Localizations" not in source:
+        return []
+    scanner = _Scanner(source)
+    scanner.scan_code(0)
+    return scanner.references
+
+
+def scan_swift_source(source: str) -> SwiftSourceScan:
+    """Find ``Localizations.X`` references and constant string literals.
+
+    Both are collected in a single pass over ``source``. String literals
+    inside interpolations are included; literals inside comments are not.
+
+    Args:
+        source: The full text of a Swift source file.
+
+    Returns:
+        A ``SwiftSourceScan`` of the references, in source order, and the set
+        of constant string literal contents.
+    """
+    scanner = _Scanner(source, collect_literals=True)
+    scanner.scan_code(0)
+    return SwiftSourceScan(scanner.references, scanner.string_literals)
@@ -8,7 +8,13 @@ import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from delete_unused_strings import delete_unused, delete_unused_content, find_used_keys
+from delete_unused_strings import (
+    KeyCollisionError,
+    delete_unused,
+    delete_unused_content,
+    find_used_keys,
+    scan_swift_sources,
+)
 
 
 class TestFindUsedKeysBasic(unittest.TestCase):
@@ -89,6 +95,38 @@ class TestFindUsedKeysMultipleFiles(unittest.TestCase):
         self.assertEqual(result, {"about"})
 
 
+class TestScanSwiftSources(unittest.TestCase):
+    """References and string literals are collected in one pass."""
+
+    def test_returns_used_keys_and_literals(self):
+        source = 'let a = Localizations.about\nlet b = NSLocalizedString("Legacy", comment: "")'
+        used_keys, literals = scan_swift_sources([source])
+        self.assertEqual(used_keys, {"about"})
+        self.assertEqual(literals, {"Legacy", ""})
+
+    def test_tr_identifier_is_excluded(self):
+        used_keys, _ = scan_swift_sources(['Localizations.tr("About")'])
+        self.assertEqual(used_keys, set())
+
+    def test_swiftgen_output_literals_are_ignored(self):
+        source = (
+            "// swiftlint:disable all\n"
+            "// Generated using SwiftGen — https://github.com/SwiftGen/SwiftGen\n"
+            'public static let about = Localizations.tr("Localizable", "About")\n'
+        )
+        _, literals = scan_swift_sources([source])
+        self.assertEqual(literals, set())
+
+    def test_generate_output_literals_are_ignored(self):
+        source = (
+            "// swiftlint:disable all\n"
+            "// Generated using fix-localizable-strings generate.\n"
+            'public static let about = Localizations.tr("Localizable", "About")\n'
+        )
+        _, literals = scan_swift_sources([source])
+        self.assertEqual(literals, set())
+
+
 class TestDeleteUnusedContent(unittest.TestCase):
     """Unit tests for the pure delete_unused_content function."""
 
@@ -155,6 +193,41 @@ class TestDeleteUnusedContent(unittest.TestCase):
         _, removed = delete_unused_content(content, {"about", "cancel", "done"})
         self.assertEqual(removed, ["UnusedAlpha", "UnusedBeta"])
 
+    def test_key_matching_string_literal_is_kept(self):
+        content = (
+            '"LegacyKey?" = "Legacy";\n'
+            '"UnusedKey" = "Unused";\n'
+        )
+        expected = '"LegacyKey?" = "Legacy";\n'
+        result, removed = delete_unused_content(content, set(), {"LegacyKey?", "other"})
+        self.assertEqual(result, expected)
+        self.assertEqual(removed, ["UnusedKey"])
+
+    def test_literal_match_is_exact(self):
+        content = '"LegacyKey" = "Legacy";\n'
+        _, removed = delete_unused_content(content, set(), {"legacykey"})
+        self.assertEqual(removed, ["LegacyKey"])
+
+    def test_colliding_keys_raise(self):
+        content = (
+            '"Ok" = "Ok";\n'
+            '"OK" = "OK";\n'
+        )
+        with self.assertRaises(KeyCollisionError) as context:
+            delete_unused_content(content, {"ok"})
+        self.assertEqual(
+            [location.key for location in context.exception.groups[0].locations],
+            ["Ok", "OK"],
+        )
+
+    def test_duplicate_key_is_not_a_collision(self):
+        content = (
+            '"About" = "About";\n'
+            '"About" = "About";\n'
+        )
+        _, removed = delete_unused_content(content, {"about"})
+        self.assertEqual(removed, [])
+
 
 class TestDeleteUnusedFileIO(unittest.TestCase):
     """Integration tests for the file I/O wrapper."""
@@ -244,6 +317,22 @@ class TestDeleteUnusedFileIO(unittest.TestCase):
         removed = delete_unused(strings_path, [swift_dir])
         self.assertEqual(removed, [])
 
+    def test_key_used_by_string_literal_is_kept(self):
+        strings_path = self._write_strings(
+            '"About" = "About";\n'
+            '"Legacy" = "Legacy";\n'
+            '"Modern" = "Modern";\n'
+        )
+        swift_dir = self._make_swift_dir({
+            "View.swift": (
+                'Text(NSLocalizedString("About", comment: ""))\n'
+                'Text(String(localized: "Modern"))\n'
+                '// NSLocalizedString("Legacy", comment: "")\n'
+            ),
+        })
+        removed = delete_unused(strings_path, [swift_dir])
+        self.assertEqual(removed, ["Legacy"])
+
     def test_ignores_non_swift_files(self):
         strings_path = self._write_strings('"About" = "About";\n')
         swift_dir = self._make_swift_dir({
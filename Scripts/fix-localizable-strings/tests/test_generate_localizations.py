@@ -0,0 +1,173 @@
+"""Tests for the generate_localizations module."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generate_localizations import (
+    LocalizedString,
+    generate_localizations,
+    placeholder_types,
+    read_localized_strings,
+    render_localizations,
+)
+
+_STRINGSDICT = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+\t<key>XDays</key>
+\t<dict>
+\t\t<key>NSStringLocalizedFormatKey</key>
+\t\t<string>%#@Days@</string>
+\t\t<key>Days</key>
+\t\t<dict>
+\t\t\t<key>NSStringFormatSpecTypeKey</key>
+\t\t\t<string>NSStringPluralRuleType</string>
+\t\t\t<key>NSStringFormatValueTypeKey</key>
+\t\t\t<string>d</string>
+\t\t\t<key>other</key>
+\t\t\t<string>%d days</string>
+\t\t</dict>
+\t</dict>
+</dict>
+</plist>
+"""
+
+
+class TestPlaceholderTypes(unittest.TestCase):
+    """Format placeholders are mapped to Swift argument types."""
+
+    def test_no_placeholders(self):
+        self.assertEqual(placeholder_types("100%% done"), [])
+
+    def test_sequential_placeholders(self):
+        self.assertEqual(placeholder_types("%@ has %d items, %.1f%%"), ["String", "Int", "Float"])
+
+    def test_positional_placeholders(self):
+        self.assertEqual(placeholder_types("%2$d of %1$@"), ["String", "Int"])
+
+    def test_length_modifiers(self):
+        self.assertEqual(placeholder_types("%lld and %lu"), ["Int", "Int"])
+
+
+class TestRenderLocalizations(unittest.TestCase):
+    """The enum follows SwiftGen's structured-swift5 layout."""
+
+    def test_property_with_lookup_function(self):
+        source = render_localizations(
+            [LocalizedString("About", None, "About", [])],
+            lookup_function="Resources.localizationFunction(key:table:fallbackValue:)",
+        )
+        self.assertIn(
+            "  /// About\n"
+            '  public static var about: String { return Localizations.tr("Localizable", "About", '
+            'fallback: "About") }\n',
+            source,
+        )
+        self.assertIn(
+            "    let format = Resources.localizationFunction(key:table:fallbackValue:)(key, table, value)\n",
+            source,
+        )
+        self.assertNotIn("BundleToken", source)
+
+    def test_function_for_format_arguments(self):
+        source = render_localizations(
+            [LocalizedString("XOfY", "Progress", '%1$@ of "%2$d"', ["String", "Int"])],
+        )
+        self.assertIn(
+            "  /// Progress\n"
+            "  public static func xOfY(_ p1: Any, _ p2: Int) -> String {\n"
+            '    return Localizations.tr("Localizable", "XOfY", String(describing: p1), p2, '
+            'fallback: "%1$@ of \\"%2$d\\"")\n'
+            "  }\n",
+            source,
+        )
+
+    def test_constant_without_lookup_function(self):
+        source = render_localizations([LocalizedString("About", None, "About", [])], public_access=False)
+        self.assertIn("internal enum Localizations {\n", source)
+        self.assertIn('  internal static let about = Localizations.tr("Localizable", "About", fallback: "About")\n', source)
+        self.assertIn("BundleToken.bundle.localizedString", source)
+
+    def test_keywords_are_escaped(self):
+        source = render_localizations([LocalizedString("Default", None, "Default", [])])
+        self.assertIn("static let `default` =", source)
+
+    def test_names_are_valid_swift_identifiers(self):
+        source = render_localizations([
+            LocalizedString("1Password", None, "1Password", []),
+            LocalizedString("ÉtéKey", None, "Été", []),
+        ])
+        self.assertIn("static let _1Password =", source)
+        self.assertIn("static let étéKey =", source)
+
+    def test_multiline_translation_is_escaped(self):
+        source = render_localizations([LocalizedString("Two", None, "One\nTwo", [])])
+        self.assertIn("  /// One\n  /// Two\n", source)
+        self.assertIn('fallback: "One\\nTwo"', source)
+
+    def test_header_marks_file_as_generated(self):
+        source = render_localizations([], inputs_hash="abc")
+        self.assertIn("// Generated using fix-localizable-strings", source)
+        self.assertIn("// Inputs: abc\n", source)
+
+
+class TestGenerateLocalizations(unittest.TestCase):
+    """Integration tests for reading a table and writing the enum."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.strings_path = os.path.join(self.root, "Localizable.strings")
+        self.output_path = os.path.join(self.root, "Generated", "Localizations.swift")
+        self._write(self.strings_path, '/* Shown in settings. */\n"about" = "About";\n"Cancel" = "Cancel";\n')
+        self._write(os.path.join(self.root, "Localizable.stringsdict"), _STRINGSDICT)
+
+    def _write(self, path: str, content: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_reads_strings_and_stringsdict_sorted_by_key(self):
+        strings = read_localized_strings(
+            self.strings_path, os.path.join(self.root, "Localizable.stringsdict")
+        )
+        self.assertEqual(
+            strings,
+            [
+                LocalizedString("about", "Shown in settings.", "About", []),
+                LocalizedString("Cancel", None, "Cancel", []),
+                LocalizedString("XDays", None, 'Plural format key: "%#@Days@"', ["Int"]),
+            ],
+        )
+
+    def test_writes_then_skips_unchanged_inputs(self):
+        self.assertTrue(generate_localizations(self.strings_path, self.output_path))
+        with open(self.output_path, encoding="utf-8") as f:
+            self.assertIn("public static func xDays(_ p1: Int) -> String {", f.read())
+        mtime = os.path.getmtime(self.output_path)
+        self.assertFalse(generate_localizations(self.strings_path, self.output_path))
+        self.assertEqual(os.path.getmtime(self.output_path), mtime)
+
+    def test_regenerates_when_inputs_change(self):
+        generate_localizations(self.strings_path, self.output_path)
+        self._write(self.strings_path, '"About" = "About us";\n')
+        self.assertTrue(generate_localizations(self.strings_path, self.output_path))
+        with open(self.output_path, encoding="utf-8") as f:
+            self.assertIn('fallback: "About us"', f.read())
+
+    def test_regenerates_when_options_change(self):
+        generate_localizations(self.strings_path, self.output_path)
+        self.assertTrue(generate_localizations(self.strings_path, self.output_path, enum_name="L10n"))
+
+    def test_force_regenerates(self):
+        generate_localizations(self.strings_path, self.output_path)
+        self.assertTrue(generate_localizations(self.strings_path, self.output_path, force=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
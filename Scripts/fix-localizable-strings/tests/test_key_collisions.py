@@ -0,0 +1,156 @@
+"""Tests for the key_collisions module."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from key_collisions import (
+    IDENTIFIER,
+    NORMALIZED,
+    KeyLocation,
+    check_collisions,
+    find_collisions,
+    normalized_identifier,
+    stringsdict_key_locations,
+    swiftgen_identifier,
+)
+
+_STRINGSDICT = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+\t<key>XDays</key>
+\t<dict>
+\t\t<key>NSStringLocalizedFormatKey</key>
+\t\t<string>%#@Days@</string>
+\t\t<key>Days</key>
+\t\t<dict>
+\t\t\t<key>NSStringFormatSpecTypeKey</key>
+\t\t\t<string>NSStringPluralRuleType</string>
+\t\t\t<key>NSStringFormatValueTypeKey</key>
+\t\t\t<string>d</string>
+\t\t\t<key>other</key>
+\t\t\t<string>%d days</string>
+\t\t</dict>
+\t</dict>
+</dict>
+</plist>
+"""
+
+
+def _locations(*keys: str) -> list[KeyLocation]:
+    return [KeyLocation(key, None, line) for line, key in enumerate(keys, start=1)]
+
+
+class TestSwiftgenIdentifier(unittest.TestCase):
+    """Keys are converted to the property names SwiftGen generates."""
+
+    def test_first_letter_is_lowercased(self):
+        self.assertEqual(swiftgen_identifier("About"), "about")
+
+    def test_invalid_characters_are_dropped(self):
+        self.assertEqual(swiftgen_identifier("NeedSomeInspiration?"), "needSomeInspiration")
+
+    def test_words_after_invalid_characters_are_capitalized(self):
+        self.assertEqual(swiftgen_identifier("Log in-now"), "logInNow")
+
+    def test_leading_acronym_is_lowercased(self):
+        self.assertEqual(swiftgen_identifier("URLSession"), "urlSession")
+        self.assertEqual(swiftgen_identifier("OK"), "ok")
+
+    def test_trailing_acronym_is_kept(self):
+        self.assertEqual(swiftgen_identifier("FaceID"), "faceID")
+
+    def test_underscores_are_camel_cased(self):
+        self.assertEqual(swiftgen_identifier("foo_bar"), "fooBar")
+        self.assertEqual(swiftgen_identifier("FOO_BAR"), "fooBar")
+
+    def test_leading_digit_is_prefixed_with_underscore(self):
+        self.assertEqual(swiftgen_identifier("1Password"), "_1Password")
+        self.assertEqual(swiftgen_identifier("2 step login"), "_2StepLogin")
+
+    def test_unicode_letters_are_kept(self):
+        self.assertEqual(swiftgen_identifier("ÉtéKey"), "étéKey")
+        self.assertEqual(swiftgen_identifier("Größe?"), "größe")
+
+
+class TestNormalizedIdentifier(unittest.TestCase):
+    """Keys are stripped and lowercased as delete_unused compares them."""
+
+    def test_strips_and_lowercases(self):
+        self.assertEqual(normalized_identifier("NeedSomeInspiration?"), "needsomeinspiration")
+
+    def test_matches_the_swiftgen_identifier_lowercased(self):
+        for key in ["1Password", "ÉtéKey"]:
+            self.assertEqual(normalized_identifier(key), swiftgen_identifier(key).lower())
+
+
+class TestFindCollisions(unittest.TestCase):
+    """Distinct keys are grouped by identifier."""
+
+    def test_no_collisions(self):
+        self.assertEqual(find_collisions(_locations("About", "Cancel")), [])
+
+    def test_keys_with_same_swiftgen_identifier(self):
+        groups = find_collisions(_locations("Name", "Cancel", "Name?"))
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0].kind, IDENTIFIER)
+        self.assertEqual(groups[0].identifier, "name")
+        self.assertEqual(groups[0].locations, [KeyLocation("Name", None, 1), KeyLocation("Name?", None, 3)])
+
+    def test_keys_differing_only_in_case(self):
+        groups = find_collisions(_locations("FaceId", "FaceID"))
+        self.assertEqual([(g.kind, g.identifier) for g in groups], [(NORMALIZED, "faceid")])
+
+    def test_normalized_group_not_repeated_for_identifier_collision(self):
+        groups = find_collisions(_locations("Ok", "OK"))
+        self.assertEqual([g.kind for g in groups], [IDENTIFIER])
+
+    def test_duplicate_key_is_not_a_collision(self):
+        self.assertEqual(find_collisions(_locations("About", "About")), [])
+
+
+class TestCheckCollisions(unittest.TestCase):
+    """Integration tests over a strings table on disk."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.strings_path = os.path.join(self.root, "Localizable.strings")
+        self.stringsdict_path = os.path.join(self.root, "Localizable.stringsdict")
+        with open(self.stringsdict_path, "w", encoding="utf-8") as f:
+            f.write(_STRINGSDICT)
+
+    def _write_strings(self, content: str) -> None:
+        with open(self.strings_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_stringsdict_key_locations(self):
+        self.assertEqual(
+            stringsdict_key_locations(self.stringsdict_path),
+            [KeyLocation("XDays", self.stringsdict_path, 5)],
+        )
+
+    def test_collision_with_stringsdict_key(self):
+        self._write_strings('/* Days */\n"About" = "About";\n"XDays?" = "%d days";\n')
+        groups = check_collisions(self.strings_path)
+        self.assertEqual(
+            groups[0].locations,
+            [
+                KeyLocation("XDays?", self.strings_path, 3),
+                KeyLocation("XDays", self.stringsdict_path, 5),
+            ],
+        )
+
+    def test_without_stringsdict(self):
+        os.unlink(self.stringsdict_path)
+        self._write_strings('"XDays?" = "%d days";\n')
+        self.assertEqual(check_collisions(self.strings_path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Tests for the key_plan module."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from key_plan import PlanError, load_plan, parse_csv_plan, parse_json_plan
+
+
+class TestParseJsonPlan(unittest.TestCase):
+    """JSON plans map keys to actions."""
+
+    def test_renames_and_deletions(self):
+        renames, deletions = parse_json_plan(
+            '{"About": {"action": "rename", "to": "AboutApp"}, "Old": "delete", '
+            '"Older": {"action": "delete"}}'
+        )
+        self.assertEqual(renames, {"About": "AboutApp"})
+        self.assertEqual(deletions, frozenset({"Old", "Older"}))
+
+    def test_rename_without_target_is_rejected(self):
+        with self.assertRaisesRegex(PlanError, "About has no target"):
+            parse_json_plan('{"About": "rename"}')
+
+    def test_escaped_target_is_accepted(self):
+        renames, _ = parse_json_plan(json.dumps({"About": {"action": "rename", "to": r'Say \"hi\"'}}))
+        self.assertEqual(renames, {"About": r'Say \"hi\"'})
+
+    def test_unknown_action_is_rejected(self):
+        with self.assertRaisesRegex(PlanError, "unknown action 'move'"):
+            parse_json_plan('{"About": {"action": "move", "to": "X"}}')
+
+    def test_non_object_is_rejected(self):
+        with self.assertRaisesRegex(PlanError, "JSON object"):
+            parse_json_plan('["About"]')
+
+    def test_invalid_json_is_rejected(self):
+        with self.assertRaisesRegex(PlanError, "Invalid JSON"):
+            parse_json_plan("{")
+
+
+class TestParseCsvPlan(unittest.TestCase):
+    """CSV plans have one row per key."""
+
+    def test_renames_and_deletions(self):
+        renames, deletions = parse_csv_plan(
+            'key,action,to\nAbout,rename,AboutApp\nOld,delete,\n"Say ""hi"", now",delete,\n'
+        )
+        self.assertEqual(renames, {"About": "AboutApp"})
+        self.assertEqual(deletions, frozenset({"Old", 'Say "hi", now'}))
+
+    def test_duplicate_key_is_rejected(self):
+        with self.assertRaisesRegex(PlanError, "line 3: duplicate key About"):
+            parse_csv_plan("key,action,to\nAbout,delete,\nAbout,rename,X\n")
+
+    def test_missing_column_is_rejected(self):
+        with self.assertRaisesRegex(PlanError, "missing: action"):
+            parse_csv_plan("key,to\nAbout,X\n")
+
+    def test_whitespace_around_fields_is_ignored(self):
+        renames, deletions = parse_csv_plan("key,action,to\n About , rename , AboutApp \nOld, delete ,\n")
+        self.assertEqual(renames, {"About": "AboutApp"})
+        self.assertEqual(deletions, frozenset({"Old"}))
+
+    def test_blank_target_is_rejected(self):
+        with self.assertRaisesRegex(PlanError, "line 2: rename of About has no target"):
+            parse_csv_plan("key,action,to\nAbout,rename,   \n")
+
+
+class TestLoadPlan(unittest.TestCase):
+    """The format is chosen by file extension."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def _write(self, name: str, content: str) -> str:
+        path = os.path.join(self.root, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_csv_extension(self):
+        path = self._write("plan.CSV", "key,action,to\nOld,delete,\n")
+        self.assertEqual(load_plan(path), ({}, frozenset({"Old"})))
+
+    def test_json_otherwise(self):
+        path = self._write("plan.json", '{"Old": "delete"}')
+        self.assertEqual(load_plan(path), ({}, frozenset({"Old"})))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for the length_report module."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import length_report
+from length_report import LengthTable, find_outliers, load_lengths
+
+_TABLE = LengthTable(
+    keys=["Save", "Cancel", "OK", "Missing"],
+    source_lengths=[10, 10, 2, 10],
+    locales=["de", "fr"],
+    lengths=[
+        [16, 12, 8, -1],
+        [14, 21, 2, 30],
+    ],
+)
+
+
+class TestFindOutliers(unittest.TestCase):
+    """Outliers are translations longer than the ratio threshold."""
+
+    def _check(self, use_numpy: bool) -> None:
+        outliers = find_outliers(_TABLE, max_ratio=1.5, min_source_length=5, use_numpy=use_numpy)
+        self.assertEqual(
+            [(o.locale, o.key, o.length) for o in outliers],
+            [("de", "Save", 16), ("fr", "Cancel", 21), ("fr", "Missing", 30)],
+        )
+        self.assertAlmostEqual(outliers[0].ratio, 1.6)
+
+    def test_pure_python(self):
+        self._check(use_numpy=False)
+
+    @unittest.skipIf(length_report.numpy is None, "NumPy is not installed")
+    def test_numpy(self):
+        self._check(use_numpy=True)
+
+    def test_short_source_values_are_skipped(self):
+        outliers = find_outliers(_TABLE, max_ratio=1.5, min_source_length=1, use_numpy=False)
+        self.assertIn(("de", "OK"), [(o.locale, o.key) for o in outliers])
+
+    def test_missing_translations_are_skipped(self):
+        outliers = find_outliers(_TABLE, max_ratio=0.5, use_numpy=False)
+        self.assertNotIn(("de", "Missing"), [(o.locale, o.key) for o in outliers])
+
+    def test_empty_table(self):
+        self.assertEqual(find_outliers(LengthTable([], [], [], [])), [])
+
+
+class TestLengthReport(unittest.TestCase):
+    """Integration tests across a localizations directory."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self._write("en", '"Save" = "Save item";\n"Quote" = "Say \\"hi\\"";\n')
+        self._write("de", '"Save" = "Eintrag speichern";\n"Extra" = "Extra";\n')
+        self._write("fr", '"Quote" = "Dis \\"salut\\"";\n"Save" = "Enregistrer";\n')
+
+    def _write(self, locale: str, content: str) -> None:
+        lproj_path = os.path.join(self.root, f"{locale}.lproj")
+        os.makedirs(lproj_path)
+        with open(os.path.join(lproj_path, "Localizable.strings"), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_lengths_are_aligned_by_source_key(self):
+        table = load_lengths(self.root, jobs=1)
+        self.assertEqual(table.keys, ["Save", "Quote"])
+        self.assertEqual(table.source_lengths, [9, 8])
+        self.assertEqual(table.locales, ["de", "fr"])
+        self.assertEqual(table.lengths, [[17, -1], [11, 11]])
+
+    def test_report_groups_by_locale_and_key(self):
+        report = length_report.length_report(self.root, max_ratio=1.2, jobs=1)
+        self.assertEqual(list(report.by_locale), ["fr", "de"])
+        self.assertEqual([o.key for o in report.by_locale["fr"]], ["Quote", "Save"])
+        self.assertEqual(list(report.by_key), ["Save", "Quote"])
+        self.assertEqual([o.locale for o in report.by_key["Save"]], ["de", "fr"])
+
+    def test_parallel_matches_serial(self):
+        self.assertEqual(load_lengths(self.root, jobs=1), load_lengths(self.root, jobs=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""Tests for the normalize_strings module."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from normalize_strings import Normalizer, Rule, normalize, normalize_dir
+
+
+class TestNormalizer(unittest.TestCase):
+    """Rules are selected per locale and applied to single values."""
+
+    def test_shared_rules_apply_to_every_locale(self):
+        value, applied = Normalizer.for_locale("de").normalize("Laden...  bitte")
+        self.assertEqual(value, "Laden… bitte")
+        self.assertEqual(applied, {"ellipsis", "double-space"})
+
+    def test_english_quotes_and_apostrophes(self):
+        value, applied = Normalizer.for_locale("en").normalize(
+            'Don\'t use \\"%1$@\\" here'
+        )
+        self.assertEqual(value, "Don’t use “%1$@” here")
+        self.assertEqual(applied, {"apostrophe", "open-quote", "close-quote"})
+
+    def test_quote_at_start_of_value_opens(self):
+        value, _ = Normalizer.for_locale("en").normalize('\\"Hi\\"')
+        self.assertEqual(value, "“Hi”")
+
+    def test_english_rules_apply_to_regional_variants(self):
+        value, _ = Normalizer.for_locale("en-GB").normalize("It's")
+        self.assertEqual(value, "It’s")
+
+    def test_english_rules_do_not_apply_to_other_locales(self):
+        value, applied = Normalizer.for_locale("de").normalize("Rock 'n' Roll")
+        self.assertEqual(value, "Rock 'n' Roll")
+        self.assertEqual(applied, set())
+
+    def test_french_spaces_before_punctuation(self):
+        value, applied = Normalizer.for_locale("fr").normalize("Nom : Oui ? Non  !")
+        self.assertEqual(value, "Nom : Oui ? Non !")
+        self.assertEqual(applied, {"french-colon-space", "french-punctuation-space"})
+
+    def test_french_rules_apply_to_france(self):
+        value, _ = Normalizer.for_locale("fr-FR").normalize("Oui ?")
+        self.assertEqual(value, "Oui\u202f?")
+
+    def test_french_rules_do_not_apply_to_canadian_french(self):
+        value, applied = Normalizer.for_locale("fr-CA").normalize("Oui ? Nom : X")
+        self.assertEqual(value, "Oui ? Nom : X")
+        self.assertEqual(applied, set())
+
+    def test_french_rules_do_not_apply_to_english(self):
+        value, _ = Normalizer.for_locale("en").normalize("Name : Yes ?")
+        self.assertEqual(value, "Name : Yes ?")
+
+    def test_rule_names_restrict_rules(self):
+        value, applied = Normalizer.for_locale("en", ["ellipsis"]).normalize("It's...")
+        self.assertEqual(value, "It's…")
+        self.assertEqual(applied, {"ellipsis"})
+
+    def test_custom_rules(self):
+        normalizer = Normalizer([Rule("dash", "--", "—"), Rule("x", "x", "×")])
+        value, applied = normalizer.normalize("2x3 -- 6")
+        self.assertEqual(value, "2×3 — 6")
+        self.assertEqual(applied, {"dash", "x"})
+
+
+class TestNormalize(unittest.TestCase):
+    """Only values are rewritten, and changed keys are reported per rule."""
+
+    def test_reports_changed_keys_per_rule(self):
+        content = (
+            '"A" = "Wait...";\n'
+            '"B" = "Fine";\n'
+            '"C" = "It\'s  done...";\n'
+        )
+        expected = (
+            '"A" = "Wait…";\n'
+            '"B" = "Fine";\n'
+            '"C" = "It’s done…";\n'
+        )
+        result, changed = normalize(content, Normalizer.for_locale("en"))
+        self.assertEqual(result, expected)
+        self.assertEqual(
+            changed,
+            {"ellipsis": ["A", "C"], "double-space": ["C"], "apostrophe": ["C"]},
+        )
+
+    def test_keys_and_comments_are_unchanged(self):
+        content = "/* Don't... */\n\"It's...\" = \"Ok\";\n"
+        result, changed = normalize(content, Normalizer.for_locale("en"))
+        self.assertEqual(result, content)
+        self.assertEqual(changed, {})
+
+    def test_indentation_is_preserved(self):
+        content = '  "A"  =  "a...";  \n'
+        result, _ = normalize(content, Normalizer.for_locale("fr"))
+        self.assertEqual(result, '  "A"  =  "a…";  \n')
+
+
+class TestNormalizeDir(unittest.TestCase):
+    """Integration tests across a localizations directory."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self._write("en", '"A" = "It\'s...";\n')
+        self._write("fr", '"A" = "Quoi ?";\n')
+        self._write("de", '"A" = "Fertig";\n')
+
+    def _write(self, locale: str, content: str) -> None:
+        lproj_path = os.path.join(self.root, f"{locale}.lproj")
+        os.makedirs(lproj_path)
+        with open(os.path.join(lproj_path, "Localizable.strings"), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def _read(self, locale: str) -> str:
+        with open(os.path.join(self.root, f"{locale}.lproj", "Localizable.strings"), encoding="utf-8") as f:
+            return f.read()
+
+    def test_reports_each_locale(self):
+        results = normalize_dir(self.root, jobs=1)
+        self.assertEqual([r.locale for r in results], ["de", "en", "fr"])
+        self.assertEqual(
+            [r.changed for r in results],
+            [{}, {"ellipsis": ["A"], "apostrophe": ["A"]}, {"french-punctuation-space": ["A"]}],
+        )
+
+    def test_modifies_files_in_place(self):
+        normalize_dir(self.root, jobs=1)
+        self.assertEqual(self._read("en"), '"A" = "It’s…";\n')
+        self.assertEqual(self._read("fr"), '"A" = "Quoi ?";\n')
+
+    def test_dry_run_does_not_write(self):
+        results = normalize_dir(self.root, dry_run=True, jobs=1)
+        self.assertTrue(results[1].changed)
+        self.assertEqual(self._read("en"), '"A" = "It\'s...";\n')
+
+    def test_rule_names_restrict_rules(self):
+        normalize_dir(self.root, rule_names=["ellipsis"], jobs=1)
+        self.assertEqual(self._read("en"), '"A" = "It\'s…";\n')
+        self.assertEqual(self._read("fr"), '"A" = "Quoi ?";\n')
+
+    def test_parallel_matches_serial(self):
+        serial = normalize_dir(self.root, dry_run=True, jobs=1)
+        parallel = normalize_dir(self.root, dry_run=True, jobs=2)
+        self.assertEqual(serial, parallel)
+
+
+if __name__ == "__main__":
+    unittest.main()
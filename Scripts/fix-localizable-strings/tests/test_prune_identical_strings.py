@@ -0,0 +1,128 @@
+"""Tests for the prune_identical_strings module."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from prune_identical_strings import load_allowlist, prune_identical, prune_identical_dir
+
+_SOURCE = {"About": "About", "OK": "OK", "Save": "Save", "Quote": 'Say \\"hi\\"'}
+
+
+class TestPruneIdentical(unittest.TestCase):
+    """Entries identical to the source value are removed."""
+
+    def test_identical_entry_removed(self):
+        content = (
+            '"About" = "À propos";\n'
+            '"OK" = "OK";\n'
+            '"Save" = "Enregistrer";\n'
+        )
+        expected = (
+            '"About" = "À propos";\n'
+            '"Save" = "Enregistrer";\n'
+        )
+        result, removed = prune_identical(content, _SOURCE)
+        self.assertEqual(result, expected)
+        self.assertEqual(removed, ["OK"])
+
+    def test_comparison_is_on_raw_escaped_value(self):
+        content = '"Quote" = "Say \\"hi\\"";\n'
+        result, removed = prune_identical(content, _SOURCE)
+        self.assertEqual(result, "")
+        self.assertEqual(removed, ["Quote"])
+
+    def test_comparison_is_case_sensitive(self):
+        content = '"OK" = "Ok";\n'
+        result, removed = prune_identical(content, _SOURCE)
+        self.assertEqual(result, content)
+        self.assertEqual(removed, [])
+
+    def test_preceding_comment_removed_with_entry(self):
+        content = (
+            '"About" = "À propos";\n'
+            '/* Confirms an alert. */\n'
+            '"OK" = "OK";\n'
+        )
+        result, _ = prune_identical(content, _SOURCE)
+        self.assertEqual(result, '"About" = "À propos";\n')
+
+    def test_allowlisted_key_is_kept(self):
+        content = '"OK" = "OK";\n'
+        result, removed = prune_identical(content, _SOURCE, {"OK"})
+        self.assertEqual(result, content)
+        self.assertEqual(removed, [])
+
+    def test_key_missing_from_source_is_kept(self):
+        content = '"Extra" = "Extra";\n'
+        result, removed = prune_identical(content, _SOURCE)
+        self.assertEqual(result, content)
+        self.assertEqual(removed, [])
+
+
+class TestLoadAllowlist(unittest.TestCase):
+    """Allowlist files ignore blank lines and comments."""
+
+    def test_reads_keys(self):
+        f = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False, encoding="utf-8")
+        f.write("# Brand names\nBitwarden\n\n  OK  \n")
+        f.close()
+        self.addCleanup(os.unlink, f.name)
+        self.assertEqual(load_allowlist(f.name), {"Bitwarden", "OK"})
+
+
+class TestPruneIdenticalDir(unittest.TestCase):
+    """Integration tests across a localizations directory."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self._write("en", '"About" = "About";\n"OK" = "OK";\n')
+        self._write("fr", '"About" = "À propos";\n"OK" = "OK";\n')
+        self._write("de", '"About" = "Über";\n"OK" = "OK";\n')
+        self._write("es", '"About" = "Acerca de";\n')
+
+    def _write(self, locale: str, content: str) -> None:
+        lproj_path = os.path.join(self.root, f"{locale}.lproj")
+        os.makedirs(lproj_path)
+        with open(os.path.join(lproj_path, "Localizable.strings"), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def _read(self, locale: str) -> str:
+        with open(os.path.join(self.root, f"{locale}.lproj", "Localizable.strings")) as f:
+            return f.read()
+
+    def test_reports_each_locale_except_source(self):
+        results = prune_identical_dir(self.root, jobs=1)
+        self.assertEqual([r.locale for r in results], ["de", "es", "fr"])
+        self.assertEqual([r.removed for r in results], [["OK"], [], ["OK"]])
+        self.assertEqual([r.bytes_saved for r in results], [13, 0, 13])
+
+    def test_modifies_files_in_place(self):
+        prune_identical_dir(self.root, jobs=1)
+        self.assertEqual(self._read("fr"), '"About" = "À propos";\n')
+        self.assertEqual(self._read("en"), '"About" = "About";\n"OK" = "OK";\n')
+
+    def test_dry_run_does_not_write(self):
+        mtime_before = os.path.getmtime(os.path.join(self.root, "fr.lproj", "Localizable.strings"))
+        results = prune_identical_dir(self.root, dry_run=True, jobs=1)
+        mtime_after = os.path.getmtime(os.path.join(self.root, "fr.lproj", "Localizable.strings"))
+        self.assertEqual(results[2].removed, ["OK"])
+        self.assertEqual(mtime_before, mtime_after)
+
+    def test_allowlist_applies_to_every_locale(self):
+        results = prune_identical_dir(self.root, allowlist={"OK"}, jobs=1)
+        self.assertTrue(all(not r.removed for r in results))
+
+    def test_parallel_matches_serial(self):
+        serial = prune_identical_dir(self.root, dry_run=True, jobs=1)
+        parallel = prune_identical_dir(self.root, dry_run=True, jobs=2)
+        self.assertEqual(serial, parallel)
+
+
+if __name__ == "__main__":
+    unittest.main()
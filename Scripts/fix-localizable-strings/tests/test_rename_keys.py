@@ -0,0 +1,250 @@
+"""Tests for the rename_keys module."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from rename_keys import (
+    RenameError,
+    count_swift_references,
+    identifier_renames,
+    rename_keys,
+    rename_strings_content,
+    rename_stringsdict_content,
+    rename_swift_source,
+)
+
+_STRINGSDICT = """<?xml version="1.0" encoding="UTF-8"?>
+<plist version="1.0">
+<dict>
+\t<!-- <key>XDays</key> in a comment -->
+\t<key>XDays</key>
+\t<dict>
+\t\t<key>NSStringLocalizedFormatKey</key>
+\t\t<string>%#@XDays@</string>
+\t\t<key>XDays</key>
+\t\t<dict>
+\t\t\t<key>NSStringFormatSpecTypeKey</key>
+\t\t\t<string>NSStringPluralRuleType</string>
+\t\t\t<key>NSStringFormatValueTypeKey</key>
+\t\t\t<string>d</string>
+\t\t\t<key>other</key>
+\t\t\t<string>%d days</string>
+\t\t</dict>
+\t</dict>
+</dict>
+</plist>
+"""
+
+
+class TestRenameStringsContent(unittest.TestCase):
+    """Only the keys of matching entries change."""
+
+    def test_renames_key_and_preserves_line(self):
+        content = '/* "About" */\n  "About"  =  "About";\n"Cancel" = "About";\n'
+        result, count = rename_strings_content(content, {"About": "AboutApp"})
+        self.assertEqual(result, '/* "About" */\n  "AboutApp"  =  "About";\n"Cancel" = "About";\n')
+        self.assertEqual(count, 1)
+
+    def test_renames_several_keys_in_one_pass(self):
+        content = '"A" = "a";\n"B" = "b";\n"C" = "c";\n'
+        result, count = rename_strings_content(content, {"A": "X", "C": "Z"})
+        self.assertEqual(result, '"X" = "a";\n"B" = "b";\n"Z" = "c";\n')
+        self.assertEqual(count, 2)
+
+    def test_renames_and_deletes_in_one_pass(self):
+        content = '"A" = "a";\n/* B */\n"B" = "b";\n"C" = "c";\n'
+        result, count = rename_strings_content(content, {"A": "X"}, frozenset({"B"}))
+        self.assertEqual(result, '"X" = "a";\n"C" = "c";\n')
+        self.assertEqual(count, 2)
+
+
+class TestRenameStringsdictContent(unittest.TestCase):
+    """Only top-level keys change."""
+
+    def test_renames_top_level_key_only(self):
+        result, count = rename_stringsdict_content(_STRINGSDICT, {"XDays": "DayCount"})
+        self.assertEqual(count, 1)
+        self.assertIn("\t<key>DayCount</key>\n\t<dict>", result)
+        self.assertIn("\t\t<key>XDays</key>", result)
+        self.assertIn("<!-- <key>XDays</key> in a comment -->", result)
+
+    def test_unmatched_content_is_unchanged(self):
+        result, count = rename_stringsdict_content(_STRINGSDICT, {"Other": "New"})
+        self.assertEqual(result, _STRINGSDICT)
+        self.assertEqual(count, 0)
+
+    def test_deletes_entry_with_comment(self):
+        content = _STRINGSDICT.replace(
+            "</dict>\n</plist>",
+            "\t<key>Other</key>\n\t<dict>\n\t\t<key>NSStringLocalizedFormatKey</key>\n\t</dict>\n</dict>\n</plist>",
+        )
+        result, count = rename_stringsdict_content(content, {"Other": "Renamed"}, frozenset({"XDays"}))
+        self.assertEqual(count, 2)
+        self.assertEqual(
+            result,
+            '<?xml version="1.0" encoding="UTF-8"?>\n<plist version="1.0">\n<dict>\n'
+            "\t<key>Renamed</key>\n\t<dict>\n\t\t<key>NSStringLocalizedFormatKey</key>\n\t</dict>\n"
+            "</dict>\n</plist>\n",
+        )
+
+
+class TestRenameSwiftSource(unittest.TestCase):
+    """References are rewritten by identifier."""
+
+    def test_identifier_renames(self):
+        self.assertEqual(
+            identifier_renames({"About": "AboutApp", "Name?": "Name"}),
+            {"about": "aboutApp"},
+        )
+
+    def test_rewrites_references_only(self):
+        source = (
+            "// Localizations.about\n"
+            'let s = "Localizations.about"\n'
+            "let a = Localizations.about + Localizations\n    .about\n"
+            "let b = Localizations.aboutSend\n"
+        )
+        result, count = rename_swift_source(source, {"about": "aboutApp"})
+        self.assertEqual(
+            result,
+            "// Localizations.about\n"
+            'let s = "Localizations.about"\n'
+            "let a = Localizations.aboutApp + Localizations\n    .aboutApp\n"
+            "let b = Localizations.aboutSend\n",
+        )
+        self.assertEqual(count, 2)
+
+    def test_count_swift_references(self):
+        source = "// Localizations.about\nText(Localizations.about)\nText(Localizations.cancel)\n"
+        self.assertEqual(count_swift_references(source, frozenset({"about"})), 1)
+
+
+class TestRenameKeys(unittest.TestCase):
+    """Integration tests across tables and Swift sources."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.localizations = os.path.join(self.root, "Localizations")
+        self.swift_dir = os.path.join(self.root, "Sources")
+        self._write("Localizations/en.lproj/Localizable.strings", '"About" = "About";\n"Cancel" = "Cancel";\n')
+        self._write("Localizations/en.lproj/Localizable.stringsdict", _STRINGSDICT)
+        self._write("Localizations/fr.lproj/Localizable.strings", '"About" = "À propos";\n')
+        self._write("Sources/View.swift", "Text(Localizations.about)\nText(Localizations.xDays(2))\n")
+        self._write("Sources/Other.swift", "Text(Localizations.cancel)\n")
+
+    def _write(self, relative_path: str, content: str) -> None:
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def _read(self, relative_path: str) -> str:
+        with open(os.path.join(self.root, relative_path), encoding="utf-8") as f:
+            return f.read()
+
+    def test_renames_everywhere(self):
+        changed = rename_keys(
+            self.localizations, {"About": "AboutApp", "XDays": "DayCount"}, [self.swift_dir], jobs=1
+        )
+        self.assertEqual(
+            [(os.path.relpath(c.path, self.root), c.count) for c in changed],
+            [
+                ("Localizations/en.lproj/Localizable.strings", 1),
+                ("Localizations/en.lproj/Localizable.stringsdict", 1),
+                ("Localizations/fr.lproj/Localizable.strings", 1),
+                ("Sources/View.swift", 2),
+            ],
+        )
+        self.assertEqual(self._read("Localizations/fr.lproj/Localizable.strings"), '"AboutApp" = "À propos";\n')
+        self.assertEqual(
+            self._read("Sources/View.swift"),
+            "Text(Localizations.aboutApp)\nText(Localizations.dayCount(2))\n",
+        )
+
+    def test_dry_run_does_not_write(self):
+        changed = rename_keys(self.localizations, {"About": "AboutApp"}, [self.swift_dir], dry_run=True, jobs=1)
+        self.assertEqual(len(changed), 3)
+        self.assertEqual(self._read("Localizations/fr.lproj/Localizable.strings"), '"About" = "À propos";\n')
+
+    def test_missing_key_is_rejected(self):
+        with self.assertRaisesRegex(RenameError, "Keys not found: Missing"):
+            rename_keys(self.localizations, {"Missing": "New"}, jobs=1)
+
+    def test_existing_key_is_rejected(self):
+        with self.assertRaisesRegex(RenameError, "already exists: Cancel"):
+            rename_keys(self.localizations, {"About": "Cancel"}, jobs=1)
+
+    def test_invalid_new_key_is_rejected(self):
+        for new in ["", 'Ab"out', "Ab\nout", " AboutApp"]:
+            with self.subTest(new=new), self.assertRaisesRegex(RenameError, "Invalid new key"):
+                rename_keys(self.localizations, {"About": new}, jobs=1)
+        self.assertEqual(self._read("Localizations/fr.lproj/Localizable.strings"), '"About" = "À propos";\n')
+
+    def test_escaped_new_key_is_accepted(self):
+        rename_keys(self.localizations, {"About": r'Ab\"out'}, jobs=1)
+        self.assertEqual(self._read("Localizations/fr.lproj/Localizable.strings"), '"Ab\\"out" = "À propos";\n')
+
+    def test_swapping_keys_is_allowed(self):
+        rename_keys(self.localizations, {"About": "Cancel", "Cancel": "About"}, jobs=1)
+        self.assertEqual(
+            self._read("Localizations/en.lproj/Localizable.strings"),
+            '"Cancel" = "About";\n"About" = "Cancel";\n',
+        )
+
+    def test_identifier_collision_is_rejected(self):
+        with self.assertRaisesRegex(RenameError, "collide"):
+            rename_keys(self.localizations, {"About": "Cancel?"}, jobs=1)
+
+    def test_renames_and_deletes_together(self):
+        changed = rename_keys(
+            self.localizations, {"Cancel": "Dismiss"}, [self.swift_dir], deletions={"About", "XDays"}, jobs=1
+        )
+        self.assertEqual(
+            sorted((os.path.relpath(c.path, self.root), c.count, c.dangling) for c in changed),
+            [
+                ("Localizations/en.lproj/Localizable.strings", 2, 0),
+                ("Localizations/en.lproj/Localizable.stringsdict", 1, 0),
+                ("Localizations/fr.lproj/Localizable.strings", 1, 0),
+                ("Sources/Other.swift", 1, 0),
+                ("Sources/View.swift", 0, 2),
+            ],
+        )
+        self.assertEqual(self._read("Localizations/en.lproj/Localizable.strings"), '"Dismiss" = "Cancel";\n')
+        self.assertEqual(self._read("Localizations/fr.lproj/Localizable.strings"), "")
+        self.assertNotIn("XDays", self._read("Localizations/en.lproj/Localizable.stringsdict"))
+        self.assertEqual(self._read("Sources/View.swift"), "Text(Localizations.about)\nText(Localizations.xDays(2))\n")
+
+    def test_renamed_and_deleted_key_is_rejected(self):
+        with self.assertRaisesRegex(RenameError, "both renamed and deleted: About"):
+            rename_keys(self.localizations, {"About": "AboutApp"}, deletions={"About"}, jobs=1)
+
+    def test_missing_deleted_key_is_rejected(self):
+        with self.assertRaisesRegex(RenameError, "Keys not found: Missing"):
+            rename_keys(self.localizations, {}, deletions={"Missing"}, jobs=1)
+
+    def test_rename_to_deleted_key_is_allowed(self):
+        rename_keys(self.localizations, {"Cancel": "About"}, deletions={"About"}, jobs=1)
+        self.assertEqual(self._read("Localizations/en.lproj/Localizable.strings"), '"About" = "Cancel";\n')
+
+    def test_write_failure_changes_nothing(self):
+        with mock.patch("strings_file_utils.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                rename_keys(self.localizations, {"About": "AboutApp"}, [self.swift_dir], jobs=1)
+        self.assertEqual(self._read("Localizations/fr.lproj/Localizable.strings"), '"About" = "À propos";\n')
+        self.assertEqual(self._read("Sources/View.swift"), "Text(Localizations.about)\nText(Localizations.xDays(2))\n")
+
+    def test_parallel_matches_serial(self):
+        serial = rename_keys(self.localizations, {"About": "AboutApp"}, [self.swift_dir], dry_run=True, jobs=1)
+        parallel = rename_keys(self.localizations, {"About": "AboutApp"}, [self.swift_dir], dry_run=True, jobs=2)
+        self.assertEqual(serial, parallel)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Tests for the size_report module."""
+
+import os
+import plistlib
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from size_report import measure_strings, measure_stringsdict, size_report
+from stringsdict_file_utils import PluralVariable, StringsdictEntry, render_stringsdict
+
+_DAYS = StringsdictEntry(
+    "XDays",
+    "%#@Days@",
+    [PluralVariable("Days", "d", {"one": "%d day", "other": "%d days"})],
+    "A number of days.",
+)
+
+
+class TestMeasureStrings(unittest.TestCase):
+    """Entry, comment and compiled sizes of .strings content."""
+
+    def test_empty_content(self):
+        key_bytes, comment_bytes, _ = measure_strings("")
+        self.assertEqual(key_bytes, {})
+        self.assertEqual(comment_bytes, 0)
+
+    def test_entry_bytes_include_line_ending(self):
+        key_bytes, _, _ = measure_strings('"a" = "A";\n')
+        self.assertEqual(key_bytes, {"a": 11})
+
+    def test_entry_bytes_are_utf8(self):
+        key_bytes, _, _ = measure_strings('"a" = "é";\n')
+        self.assertEqual(key_bytes, {"a": 12})
+
+    def test_comment_lines_counted_separately(self):
+        content = '/* Note */\n"a" = "A";\n\n// Other\n'
+        key_bytes, comment_bytes, _ = measure_strings(content)
+        self.assertEqual(key_bytes, {"a": 11})
+        self.assertEqual(comment_bytes, len("/* Note */\n") + len("// Other\n"))
+
+    def test_compiled_bytes_match_binary_plist(self):
+        _, _, compiled_bytes = measure_strings('"a" = "Say \\"hi\\"";\n')
+        expected = len(plistlib.dumps({"a": 'Say "hi"'}, fmt=plistlib.FMT_BINARY))
+        self.assertEqual(compiled_bytes, expected)
+
+
+class TestMeasureStringsdict(unittest.TestCase):
+    """Entry and comment sizes of .stringsdict files."""
+
+    def test_entry_and_comment_bytes(self):
+        f = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".stringsdict", delete=False, encoding="utf-8"
+        )
+        f.write(render_stringsdict([_DAYS]))
+        f.close()
+        self.addCleanup(os.unlink, f.name)
+
+        key_bytes, comment_bytes, compiled_bytes = measure_stringsdict(f.name)
+
+        self.assertEqual(list(key_bytes), ["XDays"])
+        self.assertGreater(key_bytes["XDays"], 0)
+        self.assertEqual(comment_bytes, len("<!-- A number of days. -->"))
+        self.assertGreater(compiled_bytes, 0)
+
+
+class TestSizeReport(unittest.TestCase):
+    """Integration tests across a localizations directory."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self._write("en.lproj/Localizable.strings", '"a" = "A";\n"long" = "Long value";\n')
+        self._write("en.lproj/Localizable.stringsdict", render_stringsdict([_DAYS]))
+        self._write("fr.lproj/Localizable.strings", '"a" = "Á";\n"long" = "Valeur longue";\n')
+        self._write("Base.lproj/Localizable.strings", "// Empty file.\n")
+
+    def _write(self, relative_path: str, content: str) -> None:
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_locales_measured_and_base_skipped(self):
+        report = size_report(self.root, jobs=1)
+        self.assertEqual([size.locale for size in report.locales], ["en", "fr"])
+        self.assertEqual(report.locales[0].entries, 3)
+        fr_content = '"a" = "Á";\n"long" = "Valeur longue";\n'
+        self.assertEqual(report.locales[1].strings_bytes, len(fr_content.encode("utf-8")))
+        self.assertEqual(report.locales[1].stringsdict_bytes, 0)
+
+    def test_top_keys_are_cumulative_across_locales(self):
+        report = size_report(self.root, top=2, jobs=1)
+        self.assertEqual(report.top_keys[0][0], "XDays")
+        self.assertEqual(
+            report.top_keys[1],
+            ("long", len('"long" = "Long value";\n') + len('"long" = "Valeur longue";\n')),
+        )
+
+    def test_json_totals(self):
+        report = size_report(self.root, jobs=1)
+        totals = report.to_json()["totals"]
+        self.assertEqual(totals["entries"], 5)
+        self.assertEqual(
+            totals["total_bytes"], sum(size.total_bytes for size in report.locales)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
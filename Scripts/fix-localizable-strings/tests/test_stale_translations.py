@@ -0,0 +1,169 @@
+"""Tests for the stale_translations module."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from stale_translations import (
+    find_stale,
+    fingerprint,
+    load_manifest,
+    manifest_path,
+    stale_translations,
+    updated_manifest,
+    write_manifest,
+)
+
+
+class TestFingerprint(unittest.TestCase):
+    """Fingerprints are short and stable."""
+
+    def test_is_stable(self):
+        self.assertEqual(fingerprint("Save"), fingerprint("Save"))
+
+    def test_differs_for_different_values(self):
+        self.assertNotEqual(fingerprint("Save"), fingerprint("Save…"))
+
+    def test_is_eight_hex_characters(self):
+        self.assertRegex(fingerprint("Save"), r"^[0-9a-f]{8}$")
+
+
+class TestManifest(unittest.TestCase):
+    """Manifests round-trip through a file."""
+
+    def test_round_trip(self):
+        fingerprints = {"A": (fingerprint("a"), fingerprint("x")), "B": (fingerprint("b"), fingerprint("y"))}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "manifest.json")
+            write_manifest(path, fingerprints)
+            self.assertEqual(load_manifest(path), fingerprints)
+
+    def test_missing_manifest_is_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(load_manifest(os.path.join(tmp, "missing.json")), {})
+
+
+class TestFindStale(unittest.TestCase):
+    """A translation is stale when the source changed but the translation did not."""
+
+    def setUp(self):
+        self.manifest = {
+            "About": (fingerprint("About"), fingerprint("À propos")),
+            "Save": (fingerprint("Save"), fingerprint("Enregistrer")),
+        }
+
+    def test_unchanged_source_is_not_stale(self):
+        source = {"About": fingerprint("About"), "Save": fingerprint("Save")}
+        values = {"About": "À propos", "Save": "Enregistrer"}
+        self.assertEqual(find_stale(values, source, self.manifest), ([], []))
+
+    def test_changed_source_with_old_translation_is_stale(self):
+        source = {"About": fingerprint("About us"), "Save": fingerprint("Save")}
+        values = {"About": "À propos", "Save": "Enregistrer"}
+        self.assertEqual(find_stale(values, source, self.manifest), (["About"], []))
+
+    def test_changed_source_with_new_translation_is_not_stale(self):
+        source = {"About": fingerprint("About us"), "Save": fingerprint("Save")}
+        values = {"About": "À propos de nous", "Save": "Enregistrer"}
+        self.assertEqual(find_stale(values, source, self.manifest), ([], []))
+
+    def test_key_missing_from_manifest_is_untracked(self):
+        source = {"About": fingerprint("About"), "New": fingerprint("New")}
+        values = {"About": "À propos", "New": "Nouveau"}
+        self.assertEqual(find_stale(values, source, self.manifest), ([], ["New"]))
+
+    def test_key_missing_from_source_is_ignored(self):
+        source = {"About": fingerprint("About")}
+        values = {"About": "À propos", "Removed": "Supprimé"}
+        self.assertEqual(find_stale(values, source, self.manifest), ([], []))
+
+
+class TestUpdatedManifest(unittest.TestCase):
+    """Only new and retranslated keys are recorded against the current source."""
+
+    def setUp(self):
+        self.manifest = {"About": (fingerprint("About"), fingerprint("À propos"))}
+        self.source = {"About": fingerprint("About us"), "OK": fingerprint("OK")}
+
+    def test_unchanged_translation_keeps_its_source_fingerprint(self):
+        updated = updated_manifest({"About": "À propos"}, self.source, self.manifest)
+        self.assertEqual(updated["About"], self.manifest["About"])
+
+    def test_changed_translation_records_the_current_source(self):
+        updated = updated_manifest({"About": "À propos de nous"}, self.source, self.manifest)
+        self.assertEqual(updated["About"], (fingerprint("About us"), fingerprint("À propos de nous")))
+
+    def test_new_key_records_the_current_source(self):
+        updated = updated_manifest({"OK": "D'accord"}, self.source, self.manifest)
+        self.assertEqual(updated, {"OK": (fingerprint("OK"), fingerprint("D'accord"))})
+
+    def test_key_missing_from_source_is_dropped(self):
+        self.assertEqual(updated_manifest({"Removed": "Supprimé"}, self.source, self.manifest), {})
+
+
+class TestStaleTranslations(unittest.TestCase):
+    """Integration tests across a localizations directory."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.manifests = os.path.join(self.root, "manifests")
+        self._write("en", '"About" = "About";\n"OK" = "OK";\n')
+        self._write("fr", '"About" = "À propos";\n"OK" = "D\'accord";\n')
+        self._write("de", '"About" = "Über";\n')
+
+    def _write(self, locale: str, content: str) -> None:
+        lproj_path = os.path.join(self.root, f"{locale}.lproj")
+        os.makedirs(lproj_path, exist_ok=True)
+        with open(os.path.join(lproj_path, "Localizable.strings"), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_without_manifests_every_key_is_untracked(self):
+        results = stale_translations(self.root, self.manifests, jobs=1)
+        self.assertEqual([r.locale for r in results], ["de", "fr"])
+        self.assertEqual([r.untracked for r in results], [["About"], ["About", "OK"]])
+        self.assertFalse(os.path.exists(self.manifests))
+
+    def test_update_writes_a_manifest_per_locale(self):
+        stale_translations(self.root, self.manifests, update=True, jobs=1)
+        self.assertTrue(os.path.isfile(manifest_path(self.manifests, "de")))
+        self.assertTrue(os.path.isfile(manifest_path(self.manifests, "fr")))
+        self.assertFalse(os.path.exists(manifest_path(self.manifests, "en")))
+        results = stale_translations(self.root, self.manifests, jobs=1)
+        self.assertTrue(all(not r.stale and not r.untracked for r in results))
+
+    def test_source_change_marks_old_translations_stale(self):
+        stale_translations(self.root, self.manifests, update=True, jobs=1)
+        self._write("en", '"About" = "About us";\n"OK" = "OK";\n')
+        self._write("de", '"About" = "Über uns";\n')
+        results = stale_translations(self.root, self.manifests, jobs=1)
+        self.assertEqual([r.stale for r in results], [[], ["About"]])
+
+    def test_update_after_a_source_change_keeps_stale_translations_stale(self):
+        stale_translations(self.root, self.manifests, update=True, jobs=1)
+        self._write("en", '"About" = "About us";\n"OK" = "OK";\n')
+        self._write("de", '"About" = "Über uns";\n')
+        results = stale_translations(self.root, self.manifests, update=True, jobs=1)
+        self.assertEqual([r.stale for r in results], [[], ["About"]])
+        results = stale_translations(self.root, self.manifests, jobs=1)
+        self.assertEqual([r.stale for r in results], [[], ["About"]])
+
+        self._write("fr", '"About" = "À propos de nous";\n"OK" = "D\'accord";\n')
+        stale_translations(self.root, self.manifests, update=True, jobs=1)
+        results = stale_translations(self.root, self.manifests, jobs=1)
+        self.assertEqual([r.stale for r in results], [[], []])
+
+    def test_parallel_matches_serial(self):
+        stale_translations(self.root, self.manifests, update=True, jobs=1)
+        self._write("en", '"About" = "About us";\n"OK" = "OK";\n')
+        serial = stale_translations(self.root, self.manifests, jobs=1)
+        parallel = stale_translations(self.root, self.manifests, jobs=2)
+        self.assertEqual(serial, parallel)
+
+
+if __name__ == "__main__":
+    unittest.main()
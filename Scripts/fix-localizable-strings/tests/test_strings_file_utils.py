@@ -1,12 +1,25 @@
 """Tests for the strings_file_utils module."""
 
 import os
+import shutil
 import sys
+import tempfile
 import unittest
+from unittest import mock
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from strings_file_utils import filter_entries
+from strings_file_utils import (
+    StringsEntry,
+    escape_value,
+    filter_entries,
+    find_locale_dirs,
+    iter_entries,
+    process_map,
+    replace_values,
+    unescape_value,
+    write_files,
+)
 
 # Keys accepted by the test predicate. "sentinel" is always kept to confirm
 # that filter_entries does not over-delete.
@@ -195,5 +208,175 @@ class TestFilterEntriesTrailingPending(unittest.TestCase):
         self.assertEqual(removed, [])
 
 
+class TestFilterEntriesRenames(unittest.TestCase):
+    """Kept entries are renamed in the same pass."""
+
+    def test_renames_kept_entries_only(self):
+        content = (
+            '/* About */\n'
+            '"about" = "About";\n'
+            '"remove_me" = "R";\n'
+        )
+        result, removed = filter_entries(
+            content, _should_keep, {"about": "about_app", "remove_me": "unused"}
+        )
+        self.assertEqual(result, '/* About */\n"about_app" = "About";\n')
+        self.assertEqual(removed, ["remove_me"])
+
+
+class TestReplaceValues(unittest.TestCase):
+    """Only the values of entry lines are rewritten."""
+
+    def test_replaces_values_and_preserves_layout(self):
+        content = '/* "A" = "x"; */\n  "A"  =  "x";  \n"B" = "y";\n\n'
+        result = replace_values(content, lambda key, value: value.upper() if key == "A" else None)
+        self.assertEqual(result, '/* "A" = "x"; */\n  "A"  =  "X";  \n"B" = "y";\n\n')
+
+    def test_receives_raw_keys_and_values(self):
+        seen = []
+        replace_values('"Say \\"hi\\"" = "a\\nb";\n', lambda key, value: seen.append((key, value)))
+        self.assertEqual(seen, [('Say \\"hi\\"', "a\\nb")])
+
+
+class TestIterEntries(unittest.TestCase):
+    """Entries are streamed with their preceding comment and line number."""
+
+    def _entries(self, content: str) -> list[StringsEntry]:
+        return list(iter_entries(content.splitlines(keepends=True)))
+
+    def test_empty_content_yields_nothing(self):
+        self.assertEqual(self._entries(""), [])
+
+    def test_entry_without_comment(self):
+        self.assertEqual(
+            self._entries('"About" = "About";\n'),
+            [StringsEntry("About", "About", None, 1)],
+        )
+
+    def test_value_is_returned_still_escaped(self):
+        entries = self._entries('"Quote" = "Say \\"hi\\"";\n')
+        self.assertEqual(entries[0].value, 'Say \\"hi\\"')
+
+    def test_block_comment_attached_to_following_entry(self):
+        content = (
+            '"a" = "A";\n'
+            '/* Describes b. */\n'
+            '"b" = "B";\n'
+        )
+        self.assertEqual(
+            self._entries(content),
+            [StringsEntry("a", "A", None, 1), StringsEntry("b", "B", "Describes b.", 3)],
+        )
+
+    def test_multi_line_block_comment_is_joined(self):
+        content = (
+            '/* First line\n'
+            '   second line */\n'
+            '"b" = "B";\n'
+        )
+        self.assertEqual(self._entries(content)[0].comment, "First line\nsecond line")
+
+    def test_line_comment_attached_to_following_entry(self):
+        content = '// Describes b.\n"b" = "B";\n'
+        self.assertEqual(self._entries(content)[0].comment, "Describes b.")
+
+    def test_blank_line_breaks_comment_association(self):
+        content = '/* File header */\n\n"b" = "B";\n'
+        self.assertEqual(self._entries(content), [StringsEntry("b", "B", None, 3)])
+
+
+class TestEscaping(unittest.TestCase):
+    """unescape_value and escape_value are inverses."""
+
+    def test_unescape_known_sequences(self):
+        self.assertEqual(unescape_value('a\\nb\\t\\"c\\"\\\\'), 'a\nb\t"c"\\')
+
+    def test_unescape_unicode_sequence(self):
+        self.assertEqual(unescape_value("caf\\U00e9"), "café")
+
+    def test_unescape_without_backslash_is_identity(self):
+        self.assertEqual(unescape_value("plain"), "plain")
+
+    def test_escape_round_trips(self):
+        raw = 'Line\\n\\"quoted\\" back\\\\slash'
+        self.assertEqual(escape_value(unescape_value(raw)), raw)
+
+
+class TestFindLocaleDirs(unittest.TestCase):
+    """Only *.lproj directories other than Base are returned, sorted."""
+
+    def test_lists_sorted_locales_and_skips_base(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        for name in ("fr.lproj", "Base.lproj", "en.lproj", "zh-Hans.lproj", "notes"):
+            os.makedirs(os.path.join(root, name))
+        open(os.path.join(root, "de.lproj"), "w").close()
+
+        result = find_locale_dirs(root)
+
+        self.assertEqual([locale for locale, _ in result], ["en", "fr", "zh-Hans"])
+        self.assertEqual(result[0][1], os.path.join(root, "en.lproj"))
+
+
+class TestProcessMap(unittest.TestCase):
+    """process_map preserves order in and out of worker processes."""
+
+    def test_serial_results_in_order(self):
+        self.assertEqual(process_map(abs, [-3, 1, -2], jobs=1), [3, 1, 2])
+
+    def test_parallel_results_in_order(self):
+        self.assertEqual(process_map(abs, [-3, 1, -2], jobs=2), [3, 1, 2])
+
+    def test_empty_input(self):
+        self.assertEqual(process_map(abs, [], jobs=2), [])
+
+
+class TestWriteFiles(unittest.TestCase):
+    """write_files changes every file or none of them."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.a = os.path.join(self.root, "a.strings")
+        self.b = os.path.join(self.root, "b.strings")
+        for path in (self.a, self.b):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("old")
+
+    def _read(self, path: str) -> str:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_writes_every_file(self):
+        write_files({self.a: "new a", self.b: "new b"})
+        self.assertEqual(self._read(self.a), "new a")
+        self.assertEqual(self._read(self.b), "new b")
+        self.assertEqual(sorted(os.listdir(self.root)), ["a.strings", "b.strings"])
+
+    def test_staging_failure_changes_nothing(self):
+        missing = os.path.join(self.root, "missing", "c.strings")
+        with self.assertRaises(OSError):
+            write_files({self.a: "new a", missing: "new c"})
+        self.assertEqual(self._read(self.a), "old")
+        self.assertEqual(sorted(os.listdir(self.root)), ["a.strings", "b.strings"])
+
+    def test_move_failure_restores_moved_files(self):
+        real_replace = os.replace
+        calls = []
+
+        def flaky_replace(src, dst):
+            calls.append(dst)
+            if len(calls) == 2:
+                raise OSError("disk full")
+            real_replace(src, dst)
+
+        with mock.patch("strings_file_utils.os.replace", side_effect=flaky_replace):
+            with self.assertRaises(OSError):
+                write_files({self.a: "new a", self.b: "new b"})
+        self.assertEqual(self._read(self.a), "old")
+        self.assertEqual(self._read(self.b), "old")
+        self.assertEqual(sorted(os.listdir(self.root)), ["a.strings", "b.strings"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,117 @@
+"""Tests for the stringsdict_file_utils module."""
+
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from stringsdict_file_utils import (
+    PluralVariable,
+    StringsdictEntry,
+    iter_stringsdict_entries,
+    render_stringsdict,
+)
+
+_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+\t<!-- A number of days. -->
+\t<key>XDays</key>
+\t<dict>
+\t\t<key>NSStringLocalizedFormatKey</key>
+\t\t<string>%#@Days@</string>
+\t\t<key>Days</key>
+\t\t<dict>
+\t\t\t<key>NSStringFormatSpecTypeKey</key>
+\t\t\t<string>NSStringPluralRuleType</string>
+\t\t\t<key>NSStringFormatValueTypeKey</key>
+\t\t\t<string>d</string>
+\t\t\t<key>one</key>
+\t\t\t<string>%d day</string>
+\t\t\t<key>other</key>
+\t\t\t<string>%d days</string>
+\t\t</dict>
+\t</dict>
+\t<key>XItems</key>
+\t<dict>
+\t\t<key>NSStringLocalizedFormatKey</key>
+\t\t<string>%#@Items@ &amp; more</string>
+\t\t<key>Items</key>
+\t\t<dict>
+\t\t\t<key>NSStringFormatSpecTypeKey</key>
+\t\t\t<string>NSStringPluralRuleType</string>
+\t\t\t<key>NSStringFormatValueTypeKey</key>
+\t\t\t<string>d</string>
+\t\t\t<key>other</key>
+\t\t\t<string>%d items</string>
+\t\t</dict>
+\t</dict>
+</dict>
+</plist>
+"""
+
+
+def _parse(content: str) -> list[StringsdictEntry]:
+    return list(iter_stringsdict_entries(io.BytesIO(content.encode("utf-8"))))
+
+
+class TestIterStringsdictEntries(unittest.TestCase):
+    """Top-level entries are parsed with their comment and plural forms."""
+
+    def test_parses_all_entries_in_order(self):
+        entries = _parse(_CONTENT)
+        self.assertEqual([e.key for e in entries], ["XDays", "XItems"])
+
+    def test_parses_format_and_variables(self):
+        entry = _parse(_CONTENT)[0]
+        self.assertEqual(entry.format, "%#@Days@")
+        self.assertEqual(
+            entry.variables,
+            [PluralVariable("Days", "d", {"one": "%d day", "other": "%d days"})],
+        )
+
+    def test_comment_attached_to_following_entry_only(self):
+        entries = _parse(_CONTENT)
+        self.assertEqual(entries[0].comment, "A number of days.")
+        self.assertIsNone(entries[1].comment)
+
+    def test_xml_entities_are_decoded(self):
+        self.assertEqual(_parse(_CONTENT)[1].format, "%#@Items@ & more")
+
+    def test_empty_dict_yields_nothing(self):
+        content = '<?xml version="1.0"?><plist version="1.0"><dict></dict></plist>'
+        self.assertEqual(_parse(content), [])
+
+
+class TestRenderStringsdict(unittest.TestCase):
+    """render_stringsdict writes the English source file layout."""
+
+    def test_round_trip_is_byte_identical(self):
+        self.assertEqual(render_stringsdict(_parse(_CONTENT)), _CONTENT)
+
+    def test_special_characters_are_escaped(self):
+        entry = StringsdictEntry(
+            "Key", "%#@V@ <b>", [PluralVariable("V", "d", {"other": "a & b"})], None
+        )
+        rendered = render_stringsdict([entry])
+        self.assertIn("<string>%#@V@ &lt;b&gt;</string>", rendered)
+        self.assertEqual(_parse(rendered), [entry])
+
+    def test_comment_is_written_without_entity_escaping(self):
+        entry = StringsdictEntry("Key", "%#@V@", [PluralVariable("V", "d", {"other": "x"})], "Tom & <Jerry>")
+        rendered = render_stringsdict([entry])
+        self.assertIn("<!-- Tom & <Jerry> -->", rendered)
+        self.assertEqual(_parse(rendered), [entry])
+
+    def test_double_hyphens_in_comment_are_broken_up(self):
+        entry = StringsdictEntry("Key", "%#@V@", [PluralVariable("V", "d", {"other": "x"})], "a -- b---c")
+        rendered = render_stringsdict([entry])
+        self.assertIn("<!-- a - - b- - -c -->", rendered)
+        self.assertEqual(_parse(rendered)[0].comment, "a - - b- - -c")
+
+
+if __name__ == "__main__":
+    unittest.main()
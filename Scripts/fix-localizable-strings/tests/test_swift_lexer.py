@@ -0,0 +1,159 @@
+"""Tests for the swift_lexer module."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from swift_lexer import LocalizationReference, find_localization_references, scan_swift_source
+
+
+def _identifiers(source: str) -> list[str]:
+    return [reference.identifier for reference in find_localization_references(source)]
+
+
+class TestFindLocalizationReferencesCode(unittest.TestCase):
+    """References in code are found with their offsets."""
+
+    def test_empty_source(self):
+        self.assertEqual(find_localization_references(""), [])
+
+    def test_reference_offsets_span_identifier(self):
+        source = "let a = Localizations.about"
+        self.assertEqual(
+            find_localization_references(source),
+            [LocalizationReference("about", 22, 27)],
+        )
+
+    def test_identifier_on_next_line(self):
+        source = "message: Localizations\n    .shareFilesAndData,"
+        self.assertEqual(_identifiers(source), ["shareFilesAndData"])
+
+    def test_references_in_source_order(self):
+        source = "Localizations.valueHasBeenCopied(Localizations.password)"
+        self.assertEqual(_identifiers(source), ["valueHasBeenCopied", "password"])
+
+    def test_longer_name_ending_in_localizations_is_ignored(self):
+        source = "Bundle.main.preferredLocalizations.first"
+        self.assertEqual(_identifiers(source), [])
+
+    def test_unicode_and_underscore_identifiers(self):
+        source = "Localizations.étéKey + Localizations._1Password"
+        self.assertEqual(_identifiers(source), ["étéKey", "_1Password"])
+
+    def test_qualified_reference(self):
+        self.assertEqual(_identifiers("BitwardenResources.Localizations.about"), ["about"])
+
+    def test_code_after_comments_and_strings_is_scanned(self):
+        source = 'let s = "text" // note\n/* block */ Localizations.about'
+        self.assertEqual(_identifiers(source), ["about"])
+
+
+class TestFindLocalizationReferencesComments(unittest.TestCase):
+    """References inside comments are ignored."""
+
+    def test_line_comment(self):
+        self.assertEqual(_identifiers("// Localizations.about\n"), [])
+
+    def test_doc_comment(self):
+        self.assertEqual(_identifiers("/// Uses `Localizations.about`.\nfunc f() {}"), [])
+
+    def test_block_comment(self):
+        self.assertEqual(_identifiers("/* Localizations.about */"), [])
+
+    def test_nested_block_comment(self):
+        source = "/* outer /* inner */ Localizations.about */ Localizations.cancel"
+        self.assertEqual(_identifiers(source), ["cancel"])
+
+    def test_unterminated_block_comment(self):
+        self.assertEqual(_identifiers("/* Localizations.about"), [])
+
+
+class TestFindLocalizationReferencesStrings(unittest.TestCase):
+    """References inside string literals are ignored, but not in interpolations."""
+
+    def test_string_literal(self):
+        self.assertEqual(_identifiers('let s = "Localizations.about"'), [])
+
+    def test_escaped_quote_does_not_end_string(self):
+        source = 'let s = "say \\"Localizations.about\\"" + Localizations.cancel'
+        self.assertEqual(_identifiers(source), ["cancel"])
+
+    def test_comment_marker_inside_string_is_not_a_comment(self):
+        source = 'let url = "https://bitwarden.com"; let a = Localizations.about'
+        self.assertEqual(_identifiers(source), ["about"])
+
+    def test_multiline_string(self):
+        source = 'let s = """\n  "quoted" Localizations.about\n  """\nLocalizations.cancel'
+        self.assertEqual(_identifiers(source), ["cancel"])
+
+    def test_raw_string(self):
+        source = 'let s = #"a "quote" Localizations.about"# + Localizations.cancel'
+        self.assertEqual(_identifiers(source), ["cancel"])
+
+    def test_raw_string_with_multiple_hashes(self):
+        source = 'let s = ##"ends with "# Localizations.about"## ; Localizations.cancel'
+        self.assertEqual(_identifiers(source), ["cancel"])
+
+    def test_raw_multiline_string(self):
+        source = 'let s = #"""\n"""Localizations.about\n"""#\nLocalizations.cancel'
+        self.assertEqual(_identifiers(source), ["cancel"])
+
+    def test_interpolation_is_scanned_as_code(self):
+        source = 'let s = "\\(Localizations.about) and \\(f(Localizations.cancel))"'
+        self.assertEqual(_identifiers(source), ["about", "cancel"])
+
+    def test_string_inside_interpolation(self):
+        source = 'let s = "\\(f("Localizations.about")) Localizations.edit" + Localizations.cancel'
+        self.assertEqual(_identifiers(source), ["cancel"])
+
+    def test_raw_string_interpolation(self):
+        source = 'let s = #"\\(Localizations.about) \\#(Localizations.cancel)"#'
+        self.assertEqual(_identifiers(source), ["cancel"])
+
+    def test_unterminated_string_ends_at_newline(self):
+        source = 'let s = "broken\nLocalizations.about'
+        self.assertEqual(_identifiers(source), ["about"])
+
+
+class TestScanSwiftSourceLiterals(unittest.TestCase):
+    """Constant string literals are collected alongside references."""
+
+    def _literals(self, source: str) -> set[str]:
+        return scan_swift_source(source).string_literals
+
+    def test_references_match_find_localization_references(self):
+        source = 'Localizations.about("x") // Localizations.cancel'
+        self.assertEqual(
+            scan_swift_source(source).references, find_localization_references(source)
+        )
+
+    def test_simple_literals(self):
+        source = 'NSLocalizedString("Key", comment: "") + String(localized: "Other")'
+        self.assertEqual(self._literals(source), {"Key", "", "Other"})
+
+    def test_escapes_are_kept_as_written(self):
+        self.assertEqual(self._literals('let s = "Say \\"hi\\""'), {'Say \\"hi\\"'})
+
+    def test_raw_literal(self):
+        self.assertEqual(self._literals('let s = #"a "b" c"#'), {'a "b" c'})
+
+    def test_interpolated_literal_is_not_constant(self):
+        self.assertEqual(self._literals('let s = "\\(count) items"'), set())
+
+    def test_literal_inside_interpolation_is_collected(self):
+        self.assertEqual(self._literals('let s = "\\(tr("Key")) items"'), {"Key"})
+
+    def test_multiline_literal_is_skipped(self):
+        self.assertEqual(self._literals('let s = """\nKey\n"""'), set())
+
+    def test_literal_in_comment_is_skipped(self):
+        self.assertEqual(self._literals('// tr("Key")\n/* "Other" */'), set())
+
+    def test_files_without_localizations_are_scanned(self):
+        self.assertEqual(self._literals('tr("Key")'), {"Key"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""Tests for the xcstrings_catalog module."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from stringsdict_file_utils import PluralVariable, StringsdictEntry, render_stringsdict
+from xcstrings_catalog import build_catalog, export_catalog, stringsdict_unit
+
+_DAYS = StringsdictEntry(
+    "XDays",
+    "%#@Days@",
+    [PluralVariable("Days", "d", {"one": "%d day", "other": "%d days"})],
+    "A number of days.",
+)
+
+
+class TestStringsdictUnit(unittest.TestCase):
+    """Stringsdict entries become units with plural substitutions."""
+
+    def test_bare_plural_keeps_variable_name(self):
+        unit = stringsdict_unit(_DAYS)
+        self.assertEqual(unit["stringUnit"]["value"], "%#@Days@")
+        substitution = unit["substitutions"]["Days"]
+        self.assertEqual(substitution["argNum"], 1)
+        self.assertEqual(substitution["formatSpecifier"], "d")
+        self.assertEqual(
+            substitution["variations"]["plural"]["one"]["stringUnit"]["value"], "%d day"
+        )
+
+    def test_positional_reference_sets_arg_num(self):
+        entry = StringsdictEntry(
+            "Grace",
+            "%2$#@Days@ by %1$@",
+            [PluralVariable("Days", "d", {"other": "%2$d days"})],
+            None,
+        )
+        self.assertEqual(stringsdict_unit(entry)["substitutions"]["Days"]["argNum"], 2)
+
+
+class TestBuildAndExportCatalog(unittest.TestCase):
+    """build_catalog and export_catalog round-trip a localizations directory."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.localizations = os.path.join(self.root, "Localizations")
+        self._write("Base.lproj/Localizable.strings", "// Empty file.\n")
+        self._write(
+            "en.lproj/Localizable.strings",
+            '"About" = "About";\n'
+            '/* Shown on the save button. */\n'
+            '"Save" = "Save \\"now\\"";\n',
+        )
+        self._write("en.lproj/Localizable.stringsdict", render_stringsdict([_DAYS]))
+        self._write(
+            "fr.lproj/Localizable.strings",
+            '"Save" = "Enregistrer";\n'
+            '"About" = "À propos";\n',
+        )
+        self.catalog_path = os.path.join(self.root, "Localizable.xcstrings")
+
+    def _write(self, relative_path: str, content: str) -> None:
+        path = os.path.join(self.localizations, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def _catalog(self) -> dict:
+        with open(self.catalog_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_summary_counts(self):
+        summary = build_catalog(self.localizations, self.catalog_path)
+        self.assertEqual(summary.keys, 3)
+        self.assertEqual(summary.locales, 2)
+        self.assertEqual(summary.units, 5)
+
+    def test_keys_follow_source_language_order(self):
+        build_catalog(self.localizations, self.catalog_path)
+        self.assertEqual(list(self._catalog()["strings"]), ["About", "Save", "XDays"])
+
+    def test_values_are_unescaped_and_comments_kept(self):
+        build_catalog(self.localizations, self.catalog_path)
+        save = self._catalog()["strings"]["Save"]
+        self.assertEqual(save["comment"], "Shown on the save button.")
+        self.assertEqual(
+            save["localizations"]["en"]["stringUnit"]["value"], 'Save "now"'
+        )
+        self.assertEqual(
+            save["localizations"]["fr"]["stringUnit"]["value"], "Enregistrer"
+        )
+
+    def test_catalog_header_and_version(self):
+        build_catalog(self.localizations, self.catalog_path)
+        catalog = self._catalog()
+        self.assertEqual(catalog["sourceLanguage"], "en")
+        self.assertEqual(catalog["version"], "1.0")
+
+    def test_export_reproduces_tables(self):
+        build_catalog(self.localizations, self.catalog_path)
+        output_dir = os.path.join(self.root, "export")
+
+        written = export_catalog(self.catalog_path, output_dir)
+
+        self.assertEqual(
+            [os.path.relpath(path, output_dir) for path in written],
+            [
+                os.path.join("en.lproj", "Localizable.strings"),
+                os.path.join("en.lproj", "Localizable.stringsdict"),
+                os.path.join("fr.lproj", "Localizable.strings"),
+            ],
+        )
+        with open(os.path.join(output_dir, "en.lproj", "Localizable.strings")) as f:
+            self.assertEqual(
+                f.read(),
+                '"About" = "About";\n'
+                '/* Shown on the save button. */\n'
+                '"Save" = "Save \\"now\\"";\n',
+            )
+        with open(os.path.join(output_dir, "en.lproj", "Localizable.stringsdict")) as f:
+            self.assertEqual(f.read(), render_stringsdict([_DAYS]))
+
+    def test_export_handles_bare_plural_variations(self):
+        catalog = {
+            "sourceLanguage": "en",
+            "strings": {
+                "XItems": {
+                    "localizations": {
+                        "en": {
+                            "variations": {
+                                "plural": {
+                                    "other": {"stringUnit": {"state": "translated", "value": "%d items"}}
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "version": "1.0",
+        }
+        with open(self.catalog_path, "w", encoding="utf-8") as f:
+            json.dump(catalog, f)
+        output_dir = os.path.join(self.root, "export")
+
+        export_catalog(self.catalog_path, output_dir)
+
+        with open(os.path.join(output_dir, "en.lproj", "Localizable.stringsdict")) as f:
+            content = f.read()
+        self.assertIn("<string>%#@XItems@</string>", content)
+        self.assertIn("<string>%d items</string>", content)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,314 @@
+"""
+xcstrings_catalog
+
+Migrates the per-locale Localizable.strings and Localizable.stringsdict files
+of a localizations directory into a single Xcode String Catalog
+(``.xcstrings``), and exports a catalog back into per-locale tables so the
+migration can be verified.
+
+The ``.lproj`` directories are grouped by locale while a catalog is grouped
+by key, so building one is a transpose. Rather than holding every locale in
+memory, each table is streamed into a temporary SQLite spool and the catalog
+is written key by key from a single ordered query over that spool.
+"""
+
+import itertools
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from strings_file_utils import escape_value, find_locale_dirs, iter_entries, unescape_value
+from stringsdict_file_utils import (
+    PLURAL_CATEGORIES,
+    PluralVariable,
+    StringsdictEntry,
+    iter_stringsdict_entries,
+    render_stringsdict,
+)
+
+# Matches a `%#@name@` or positional `%1$#@name@` variable reference in a
+# stringsdict format string.
+_VARIABLE_RE = re.compile(r'%(?:(?P<position>\d+)\$)?#@(?P<name>[^@]+)@')
+
+# Unit kinds stored in the spool. Stringsdict units sort first so that they
+# take precedence over a plain string with the same key, as they do at runtime.
+_KIND_STRINGSDICT = 0
+_KIND_STRINGS = 1
+
+
+class CatalogSummary(NamedTuple):
+    """Counts describing a catalog written by ``build_catalog``."""
+
+    keys: int
+    locales: int
+    units: int
+
+
+def _string_unit(value: str) -> dict:
+    return {"stringUnit": {"state": "translated", "value": value}}
+
+
+def _plural_variations(variable: PluralVariable) -> dict:
+    return {
+        "plural": {
+            category: _string_unit(value) for category, value in variable.forms.items()
+        }
+    }
+
+
+def stringsdict_unit(entry: StringsdictEntry) -> dict:
+    """Convert a stringsdict entry to a String Catalog localization unit.
+
+    The format string becomes the unit's value and each plural variable
+    becomes a ``substitutions`` entry with its plural ``variations``. This
+    keeps the variable names, so exporting the catalog reproduces the original
+    stringsdict exactly, including variables the format string does not
+    reference.
+
+    Args:
+        entry: A parsed stringsdict entry.
+
+    Returns:
+        The JSON-serializable localization unit.
+    """
+    positions: dict[str, int] = {}
+    for index, reference in enumerate(_VARIABLE_RE.finditer(entry.format), start=1):
+        position = reference.group("position")
+        positions.setdefault(reference.group("name"), int(position) if position else index)
+
+    substitutions: dict = {}
+    for index, variable in enumerate(entry.variables, start=1):
+        substitutions[variable.name] = {
+            "argNum": positions.get(variable.name, index),
+            "formatSpecifier": variable.value_type,
+            "variations": _plural_variations(variable),
+        }
+
+    unit = _string_unit(entry.format)
+    unit["substitutions"] = substitutions
+    return unit
+
+
+def _iter_units(
+    locale_dirs: list[tuple[str, str]], table: str
+) -> Iterator[tuple[str, str, int, str, str | None]]:
+    """Stream ``(key, locale, kind, unit_json, comment)`` rows for every table."""
+    for locale, lproj_path in locale_dirs:
+        strings_path = os.path.join(lproj_path, f"{table}.strings")
+        if os.path.isfile(strings_path):
+            with open(strings_path, encoding="utf-8") as f:
+                for entry in iter_entries(f):
+                    unit = _string_unit(unescape_value(entry.value))
+                    yield (
+                        unescape_value(entry.key),
+                        locale,
+                        _KIND_STRINGS,
+                        json.dumps(unit, ensure_ascii=False),
+                        entry.comment,
+                    )
+
+        stringsdict_path = os.path.join(lproj_path, f"{table}.stringsdict")
+        if os.path.isfile(stringsdict_path):
+            for entry in iter_stringsdict_entries(stringsdict_path):
+                yield (
+                    entry.key,
+                    locale,
+                    _KIND_STRINGSDICT,
+                    json.dumps(stringsdict_unit(entry), ensure_ascii=False),
+                    entry.comment,
+                )
+
+
+def _indent(text: str, prefix: str) -> str:
+    return "\n".join(prefix + line for line in text.splitlines())
+
+
+def _dumps(value) -> str:
+    # Xcode writes catalogs with two-space indentation and " : " separators.
+    return json.dumps(value, ensure_ascii=False, indent=2, separators=(",", " : "))
+
+
+def build_catalog(
+    localizations_dir: str,
+    output_path: str,
+    table: str = "Localizable",
+    source_language: str = "en",
+) -> CatalogSummary:
+    """Write a String Catalog built from every locale of a strings table.
+
+    Keys are written in the order they appear in the source language, followed
+    by any keys that only exist in other locales. Comments are taken from the
+    source language. Apart from the list of keys, memory use is bounded by the
+    largest single key's translations rather than by the total size of the
+    tables.
+
+    Args:
+        localizations_dir: A directory of ``*.lproj`` directories, such as
+            ``BitwardenResources/Localizations``.
+        output_path: Path of the ``.xcstrings`` file to write.
+        table: The table name shared by the ``.strings`` and ``.stringsdict``
+            files, without extension.
+        source_language: The development language of the table.
+
+    Returns:
+        A ``CatalogSummary`` of what was written.
+    """
+    # Only the key order and the source comments are kept in memory; the
+    # translations themselves live in the spool.
+    positions: dict[str, int] = {}
+    comments: dict[str, str] = {}
+    key_count = 0
+    unit_count = 0
+    locales: set[str] = set()
+
+    # The source language is spooled first so that it defines the key order.
+    locale_dirs = sorted(
+        find_locale_dirs(localizations_dir),
+        key=lambda item: item[0] != source_language,
+    )
+
+    def spool_rows() -> Iterator[tuple[int, str, int, str]]:
+        for key, locale, kind, unit, comment in _iter_units(locale_dirs, table):
+            position = positions.setdefault(key, len(positions))
+            if locale == source_language and comment:
+                comments.setdefault(key, comment)
+            yield position, locale, kind, unit
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        db = sqlite3.connect(os.path.join(spool_dir, "spool.sqlite"))
+        try:
+            db.execute(
+                "CREATE TABLE units (position INTEGER, locale TEXT, kind INTEGER, unit TEXT)"
+            )
+            db.executemany("INSERT INTO units VALUES (?, ?, ?, ?)", spool_rows())
+            cursor = db.execute(
+                "SELECT position, locale, unit FROM units "
+                "ORDER BY position, locale, kind, rowid"
+            )
+            keys = list(positions)
+
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write("{\n")
+                f.write(f'  "sourceLanguage" : {json.dumps(source_language)},\n')
+                f.write('  "strings" : {')
+                for position, group in itertools.groupby(cursor, key=lambda row: row[0]):
+                    key = keys[position]
+                    comment = comments.get(key)
+                    localizations: dict = {}
+                    for _, locale, unit in group:
+                        if locale not in localizations:
+                            localizations[locale] = json.loads(unit)
+                            locales.add(locale)
+                            unit_count += 1
+                    item: dict = {}
+                    if comment:
+                        item["comment"] = comment
+                    item["extractionState"] = "manual"
+                    item["localizations"] = localizations
+                    separator = ",\n" if key_count else "\n"
+                    f.write(f"{separator}    {json.dumps(key, ensure_ascii=False)} : ")
+                    f.write(_indent(_dumps(item), "    ").lstrip())
+                    key_count += 1
+                f.write("\n  },\n")
+                f.write('  "version" : "1.0"\n')
+                f.write("}\n")
+        finally:
+            db.close()
+
+    return CatalogSummary(key_count, len(locales), unit_count)
+
+
+def _unit_to_entry(key: str, unit: dict, comment: str | None):
+    """Convert a localization unit back to a strings or stringsdict entry.
+
+    Returns a ``(value, None)`` tuple for a plain string, or ``(None,
+    StringsdictEntry)`` for a unit with variations or substitutions.
+    """
+    if "variations" in unit:
+        plural = unit["variations"].get("plural", {})
+        forms = {
+            category: plural[category]["stringUnit"]["value"]
+            for category in PLURAL_CATEGORIES
+            if category in plural
+        }
+        # Xcode does not record a variable name or format specifier for a bare
+        # plural, so the key and "d" are used, which is what the English
+        # stringsdict does for simple counts.
+        variable = PluralVariable(key, "d", forms)
+        return None, StringsdictEntry(key, f"%#@{key}@", [variable], comment)
+
+    value = unit.get("stringUnit", {}).get("value", "")
+    if "substitutions" not in unit:
+        return value, None
+
+    variables = []
+    for name, substitution in unit["substitutions"].items():
+        plural = substitution.get("variations", {}).get("plural", {})
+        forms = {
+            category: plural[category]["stringUnit"]["value"]
+            for category in PLURAL_CATEGORIES
+            if category in plural
+        }
+        variables.append(
+            PluralVariable(name, substitution.get("formatSpecifier", "d"), forms)
+        )
+    return None, StringsdictEntry(key, value, variables, comment)
+
+
+def export_catalog(
+    catalog_path: str, output_dir: str, table: str = "Localizable"
+) -> list[str]:
+    """Write per-locale ``.strings`` and ``.stringsdict`` tables from a catalog.
+
+    This is the reverse of ``build_catalog`` and exists so that a migration can
+    be verified by comparing the exported tables with the originals. Every
+    locale receives the key's comment, matching the current layout where the
+    comments are copied into each locale's tables.
+
+    Args:
+        catalog_path: Path to the ``.xcstrings`` file to read.
+        output_dir: Directory in which to create ``<locale>.lproj``
+            directories.
+        table: The table name to write, without extension.
+
+    Returns:
+        The paths of the files written, sorted.
+    """
+    with open(catalog_path, encoding="utf-8") as f:
+        catalog = json.load(f)
+
+    strings_lines: dict[str, list[str]] = {}
+    stringsdict_entries: dict[str, list[StringsdictEntry]] = {}
+
+    for key, item in catalog.get("strings", {}).items():
+        comment = item.get("comment")
+        for locale, unit in item.get("localizations", {}).items():
+            value, plural_entry = _unit_to_entry(key, unit, comment)
+            if plural_entry is not None:
+                stringsdict_entries.setdefault(locale, []).append(plural_entry)
+                continue
+            lines = strings_lines.setdefault(locale, [])
+            if comment:
+                lines.append(f"/* {comment} */\n")
+            lines.append(f'"{escape_value(key)}" = "{escape_value(value)}";\n')
+
+    written: list[str] = []
+    for locale in sorted(strings_lines.keys() | stringsdict_entries.keys()):
+        lproj_path = os.path.join(output_dir, f"{locale}.lproj")
+        os.makedirs(lproj_path, exist_ok=True)
+        if locale in strings_lines:
+            path = os.path.join(lproj_path, f"{table}.strings")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("".join(strings_lines[locale]))
+            written.append(path)
+        if locale in stringsdict_entries:
+            path = os.path.join(lproj_path, f"{table}.stringsdict")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(render_stringsdict(stringsdict_entries[locale]))
+            written.append(path)
+
+    return written
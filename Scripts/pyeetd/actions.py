@@ -0,0 +1,166 @@
+"""
+Carrying out a policy's decisions.
+
+Everything that touches other processes goes through a `Killer`: sending
+signals, `sudo kill`, and reading and setting priorities. `DryRunKiller` does
+none of it and records what would have been done instead, so decisions can be
+replayed and benchmarked without touching a single process; see replay.py.
+"""
+
+import os
+import signal
+import subprocess
+
+from policy import Action
+
+
+class Killer:
+    """Signals and renices processes for real."""
+
+    def kill_group(self, pid: int) -> None:
+        os.killpg(pid, signal.SIGKILL)
+
+    def sudo_kill(self, pids: list[int]) -> str | None:
+        """Kill `pids` with a single `sudo kill`, returning the error if it failed."""
+        result = subprocess.run(['sudo', '-n', 'kill', '-SIGKILL', *map(str, pids)],
+                                capture_output=True, text=True, check=False)
+        return result.stderr.strip() if result.returncode != 0 else None
+
+    def send_signal(self, pid: int, signum: int) -> None:
+        os.kill(pid, signum)
+
+    def get_priority(self, pid: int) -> int:
+        return os.getpriority(os.PRIO_PROCESS, pid)
+
+    def set_priority(self, pid: int, nice: int) -> None:
+        os.setpriority(os.PRIO_PROCESS, pid, nice)
+
+    def sudo_renice(self, pid: int, nice: int) -> None:
+        subprocess.run(['sudo', 'renice', '-n', str(nice), '-p', str(pid)], capture_output=True, check=False)
+
+
+class DryRunKiller(Killer):
+    """Records what would be done instead of doing it.
+
+    `on_kill` is called with each PID that would be killed, so a simulated
+    process source can make it disappear.
+    """
+
+    def __init__(self, on_kill=None):
+        self.on_kill = on_kill
+        self.calls: list[tuple[str, int, int]] = []
+        self.priorities: dict[int, int] = {}
+
+    def kill_group(self, pid):
+        self.calls.append(("kill", pid, signal.SIGKILL))
+        if self.on_kill is not None:
+            self.on_kill(pid)
+
+    def sudo_kill(self, pids):
+        for pid in pids:
+            self.kill_group(pid)
+        return None
+
+    def send_signal(self, pid, signum):
+        self.calls.append(("signal", pid, signum))
+
+    def get_priority(self, pid):
+        return self.priorities.get(pid, 0)
+
+    def set_priority(self, pid, nice):
+        self.calls.append(("renice", pid, nice))
+        self.priorities[pid] = nice
+
+    def sudo_renice(self, pid, nice):
+        self.set_priority(pid, nice)
+
+
+def yeet(processes, killer: Killer):
+    """Kill processes, returning the log lines and the processes killed.
+
+    Processes we may not signal are killed with a single `sudo kill` for the
+    whole batch rather than one per process. If that fails, none of the batch
+    counts as killed.
+    """
+    output = []
+    killed = []
+    needs_sudo = []
+    for p in processes:
+        output.append(f"🤠 pyeetd: Stopping - {p.output_string}")
+        try:
+            killer.kill_group(p.pid)
+            killed.append(p)
+        except PermissionError:
+            needs_sudo.append(p)
+        except OSError as e:
+            output.append(f"😪 pyeetd: Failed to stop {p.pid} - {e}")
+    if needs_sudo:
+        pids = [p.pid for p in needs_sudo]
+        error = killer.sudo_kill(pids)
+        output.append(f"🔐 pyeetd with sudo - {' '.join(map(str, pids))}")
+        if error is None:
+            killed.extend(needs_sudo)
+        else:
+            output.append(f"😪 pyeetd: sudo kill failed - {error}")
+    return output, killed
+
+
+def throttle(decisions, throttler, now):
+    """Start throttling processes, returning the log lines and the decisions newly throttled."""
+    output = []
+    throttled = []
+    for d in decisions:
+        budget = 0 if d.action == Action.STOP else d.rule.cpu_budget
+        if throttler.throttle(d.process, budget, now):
+            throttled.append(d)
+            if budget:
+                output.append(f"🧊 pyeetd: Throttling to {budget}% CPU - {d.process.output_string}")
+            else:
+                output.append(f"✋ pyeetd: Pausing - {d.process.output_string}")
+    return output, throttled
+
+
+def renice(decisions, killer: Killer):
+    """Renice processes, returning the log lines and the processes reniced."""
+    output = []
+    reniced = []
+    for d in decisions:
+        p = d.process
+        try:
+            if killer.get_priority(p.pid) >= d.rule.nice:
+                continue
+            output.append(f"🐢 pyeetd: Renicing to {d.rule.nice} - {p.output_string}")
+            reniced.append(p)
+            try:
+                killer.set_priority(p.pid, d.rule.nice)
+            except PermissionError:
+                killer.sudo_renice(p.pid, d.rule.nice)
+                output.append(f"🔐 pyeetd with sudo - {p.pid}")
+        except OSError as e:
+            output.append(f"😪 pyeetd: Failed to renice {p.pid} - {e}")
+    return output, reniced
+
+
+def act(decisions, throttler, tracker, now, killer: Killer):
+    """Carry out a policy's decisions.
+
+    Returns the log lines and an `(Action, ProcessInfo)` event for each
+    process acted on. Processes already throttled or reniced by an earlier
+    poll aren't acted on again.
+    """
+    decisions = tracker.escalate(decisions, now)
+    by_action = {action: [] for action in Action}
+    for d in decisions:
+        by_action[d.action].append(d)
+    output = [f"👀 pyeetd: {d.rule.name} - {d.process.output_string}" for d in by_action[Action.LOG]]
+    yeet_output, killed = yeet([d.process for d in by_action[Action.KILL]], killer)
+    output.extend(yeet_output)
+    tracker.record_kills(killed, now)
+    throttle_output, throttled = throttle(by_action[Action.STOP] + by_action[Action.THROTTLE], throttler, now)
+    output.extend(throttle_output)
+    renice_output, reniced = renice(by_action[Action.RENICE], killer)
+    output.extend(renice_output)
+    events = [(Action.KILL, p) for p in killed]
+    events += [(d.action, d.process) for d in throttled]
+    events += [(Action.RENICE, p) for p in reniced]
+    return output, events
@@ -0,0 +1,76 @@
+"""
+Resource use per simulator device.
+
+Parallel testing runs several clones of a simulator at once, and one clone
+spinning can starve the others. `group_by_device` adds up CPU, memory and
+process counts per device and runtime, from the device UDID and runtime in
+each process's path (see `process_source.parse_simulator_path`).
+
+Apps and test runners run from their device's data directory, so they're
+attributed to the device. The runtime's own daemons run from the runtime and
+are shared by its devices; they're grouped under the runtime alone.
+"""
+
+from dataclasses import dataclass
+
+from process_source import ProcessInfo
+
+# The `device` a policy rule gives to target the busiest device.
+NOISIEST = "noisiest"
+
+
+@dataclass
+class DeviceUsage:
+    device: str | None
+    runtime: str | None
+    process_count: int = 0
+    # CPU% summed over the group's processes, over the last poll and over
+    # the sampling window.
+    cpu_percent: float = 0.0
+    avg_cpu_percent: float = 0.0
+    memory_percent: float = 0.0
+    rss: int = 0
+
+    @property
+    def label(self) -> str:
+        device = self.device[:8] if self.device else "shared"
+        return f"{device} ({self.runtime})" if self.runtime else device
+
+
+def group_by_device(processes: list[ProcessInfo]) -> list[DeviceUsage]:
+    """Add up simulator processes per device and runtime, busiest first."""
+    groups: dict[tuple[str | None, str | None], DeviceUsage] = {}
+    for p in processes:
+        device, runtime = p.device, p.runtime
+        if device is None and runtime is None:
+            continue
+        group = groups.get((device, runtime))
+        if group is None:
+            group = groups[(device, runtime)] = DeviceUsage(device, runtime)
+        group.process_count += 1
+        group.cpu_percent += p.cpu_now or 0.0
+        group.avg_cpu_percent += p.recent_cpu_percent
+        group.memory_percent += p.memory_percent
+        group.rss += p.rss
+    return sorted(groups.values(), key=lambda g: g.avg_cpu_percent, reverse=True)
+
+
+def noisiest_device(groups: list[DeviceUsage]) -> str | None:
+    """The UDID of the device using the most CPU over the window.
+
+    Only devices are compared, not shared runtime daemons, and there is no
+    noisiest device unless there are at least two to choose from.
+    """
+    devices = [g for g in groups if g.device is not None]
+    if len(devices) < 2:
+        return None
+    return max(devices, key=lambda g: g.avg_cpu_percent).device
+
+
+def format_devices(groups: list[DeviceUsage]) -> list[str]:
+    """Lines of a table of `groups`."""
+    output = ["CPU%\tAvgCPU%\tMemory%\tRSS\tProcesses\tDevice"]
+    for g in groups:
+        output.append(f"{g.cpu_percent:.1f}%\t{g.avg_cpu_percent:.1f}%\t{g.memory_percent:.1f}%"
+                      f"\t{g.rss / 1024 / 1024:.0f}MB\t{g.process_count}\t{g.label}")
+    return output
@@ -6,148 +6,269 @@ how to use:
 python Scripts/pyeetd/main.py & PYEETD_PID=$!
 ...
 kill $PYEETD_PID
+
+or, to watch processes only while a command runs:
+python Scripts/pyeetd/main.py [options] run -- xcodebuild test ...
+
+`run` starts the command, passes on SIGINT, SIGTERM, SIGHUP and SIGQUIT to
+it, stops when it exits and exits with its status, after printing the summary
+(which then includes the command's own CPU and memory use). The command's
+process tree is also recorded in the metrics; see supervisor.py.
+
+On SIGTERM, SIGHUP or SIGQUIT, as when a CI run is cancelled, pyeetd
+continues any processes it paused and prints a summary of the run before
+exiting. To also add the summary to the job summary, pass `--summary
+"$GITHUB_STEP_SUMMARY"` and `wait $PYEETD_PID` after the kill so the step
+doesn't end before it's written.
+
+options:
+--source auto|proc|ps   where to read processes from (default: auto, which
+                        reads /proc on Linux and runs ps elsewhere)
+--window SECONDS        how far back per process CPU% and memory growth are
+                        averaged, whatever the poll interval (default: 60)
+--policy PATH           a JSON or TOML policy file of rules saying what to do
+                        with which processes (default: kill the simulator and
+                        OS processes listed in policy.py); see policy.py
+--escalation throttle|backoff|none
+                        what to do with names that keep respawning after
+                        being killed (default: throttle); see respawn.py
+--respawn-threshold SECONDS
+                        how soon a respawn has to happen to count as fast
+                        (default: 30)
+--metrics PATH          write a record of every poll to PATH, as JSON Lines
+                        (.jsonl), CSV (.csv) or a Prometheus textfile
+                        (.prom); may be repeated; see metrics.py
+--metrics-top N         how many of the busiest processes each record holds
+                        (default: 5)
+--summary PATH          also write the end-of-run summary to PATH, as
+                        Markdown if PATH ends in .md or is
+                        $GITHUB_STEP_SUMMARY, otherwise as JSON; may be
+                        repeated; see summary.py
+--min-interval SECONDS, --max-interval SECONDS
+                        the poll interval range; pyeetd polls every 5 seconds,
+                        faster when busy and slower when idle (default: 1
+                        and 30); see scheduler.py
+--record PATH           append every raw process snapshot to PATH as JSON
+                        Lines, to replay later with replay.py; see
+                        recording.py
+--socket PATH           answer queries about the latest poll on a Unix
+                        socket at PATH, e.g. with
+                        `python Scripts/pyeetd/query.py PATH status`; see
+                        query.py
 """
 
-import os
+import argparse
+import math
 import signal
+import sys
 import time
-import subprocess
-import re
-from dataclasses import dataclass
-from enum import Enum
-
-OS_PROCESSES = {
-    "ecosystemanalyticsd"
-    "com.apple.ecosystemd",
-    "com.apple.metadata.mds",
-}
-
-SIMULATOR_PROCESSES = {
-    "AegirPoster",
-    "InfographPoster",
-    "CollectionsPoster",
-    "ExtragalacticPoster",
-    "KaleidoscopePoster",
-    "EmojiPosterExtension",
-    "AmbientPhotoFramePosterProvider",
-    "PhotosPosterProvider",
-    "AvatarPosterExtension",
-    "GradientPosterExtension",
-    "MonogramPosterExtension",
-    # "System/Library/PrivateFrameworks/SessionCore.framework/Support/liveactivitiesd",
-    # "Applications/News.app",
-    # "usr/libexec/icloudmailagent",
-    # "Applications/Family.app",
-    # "Applications/PosterBoard.app",
-    # "Applications/PassbookStub.app",
-}
-
-SIMULATOR_PATH_SEARCH_KEY = "simruntime/Contents/Resources/RuntimeRoot"
-
-# How long to sleep between checks in seconds
-SLEEP_DELAY = 5
+
+from actions import Killer, act
+from devices import format_devices, group_by_device
+from metrics import DEFAULT_TOP, MetricsRecorder, build_record, create_exporter
+from policy import PolicyError, default_policy, load_policy
+from process_source import SOURCES, ProcessSort, create_process_source, format_processes, sort_processes
+from query import QueryServer
+from recording import Snapshot, SnapshotWriter
+from respawn import DEFAULT_RESPAWN_THRESHOLD, ESCALATIONS, RespawnTracker
+from sampling import DEFAULT_WINDOW, ProcessSampler
+from scheduler import DEFAULT_BASE_INTERVAL, DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, AdaptiveScheduler
+from summary import RunSummary, format_text, write_report
+from supervisor import FORWARDED_SIGNALS, Supervisor, TreeUsage
+from throttle import Throttler
+
+# How long to sleep between checks in seconds, when neither busy nor idle;
+# see scheduler.py
+SLEEP_DELAY = DEFAULT_BASE_INTERVAL
 
 # How often to print process info (in seconds)
 PRINT_PROCESSES_INTERVAL = 60
 
-@dataclass
-class ProcessInfo:
-    pid: int
-    cpu_percent: float
-    memory_percent: float
-    name: str
-    is_simulator: bool
-
-    @property
-    def environment(self) -> str:
-        return "Simulator" if self.is_simulator else "OS"
-
-    @property
-    def output_string(self) -> str:
-        return f"{self.pid}\t{self.cpu_percent}%\t{self.memory_percent}%\t{self.name}\t{self.environment}"
-
-class ProcessSort(Enum):
-    CPU = "cpu"
-    MEMORY = "memory"
-
-def get_processes(sort_by=ProcessSort.CPU):
-    """Get all processes using ps command - equivalent to Swift's proc_listallpids"""
-    sorty_by = "-ero" if sort_by == ProcessSort.CPU else "-emo"
-    result = subprocess.run(['ps', sorty_by, 'pid,pcpu,pmem,comm'],
-                            capture_output=True, text=True, check=True)
-    processes = []
-
-    for line in result.stdout.splitlines()[1:]:  # Skip header
-        parts = line.strip().split(None, 3)
-        if len(parts) >= 3:
-            pid = int(parts[0])
-            cpu_percent = float(parts[1])
-            memory_percent = float(parts[2])
-            name = parts[3]
-            is_simulator = SIMULATOR_PATH_SEARCH_KEY in name
-            processes.append(ProcessInfo(pid, cpu_percent, memory_percent, name, is_simulator))
-
-    return processes
+# Signals that end pyeetd cleanly when it isn't running a command.
+EXIT_SIGNALS = (signal.SIGTERM, signal.SIGHUP, signal.SIGQUIT)
 
 def print_processes(processes, limit=-1):
-    output = []
-    output.append("================================")
-    output.append("⚡️ Processes sorted by CPU usage:")
-    output.append("PID\tCPU%\tMemory%\tName\tEnvironment")
-    limit = len(processes) if limit == -1 else limit
-    for p in processes[:limit]:
-        output.append(p.output_string)
-
-    output.append("--------------------------------")
-    output.append("🧠 Processes sorted by memory usage:")
-    output.append("PID\tCPU%\tMemory%\tName\tEnvironment")
-    processes_sorted_by_memory = sorted(processes, key=lambda x: x.memory_percent, reverse=True)
-    for p in processes_sorted_by_memory[:limit]:
-        output.append(p.output_string)
-
-    output.append("================================")
-    print("\n".join(output))
-
-def find_unwanted(processes):
-    yeeting = []
-    for p in processes:
-        process_target_list = SIMULATOR_PROCESSES if p.is_simulator else OS_PROCESSES
-        for k in process_target_list:
-            if k in p.name:
-                yeeting.append(p)
-    return yeeting
-
-def yeet(processes):
-    output = []
-    for p in processes:
-        try:
-            output.append(f"🤠 pyeetd: Stopping - {p.output_string}")
-            try:
-                os.killpg(p.pid, signal.SIGKILL)
-            except PermissionError:
-                subprocess.run(['sudo', 'kill', '-SIGKILL', str(p.pid)], capture_output=True, check=False)
-                output.append(f"🔐 pyeetd with sudo - {p.pid}")
-        except (OSError, ProcessLookupError) as e:
-            output.append(f"😪 pyeetd: Failed to stop {p.pid} - {e}")
-    return output
+    print(format_processes(processes, limit))
 
-def main():
-    print_cycles = PRINT_PROCESSES_INTERVAL // SLEEP_DELAY
-    i = 0
+def parse_args():
+    parser = argparse.ArgumentParser(description="Kill processes that slow down simulator tests.")
+    parser.add_argument("--source", choices=SOURCES, default="auto",
+                        help="Where to read processes from (default: auto).")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, metavar="SECONDS",
+                        help=f"Seconds per process to average over (default: {DEFAULT_WINDOW:.0f}).")
+    parser.add_argument("--policy", metavar="PATH",
+                        help="JSON or TOML policy file (default: the built-in kill lists).")
+    parser.add_argument("--escalation", choices=ESCALATIONS, default="throttle",
+                        help="What to do instead of killing names that keep respawning (default: throttle).")
+    parser.add_argument("--respawn-threshold", type=float, default=DEFAULT_RESPAWN_THRESHOLD, metavar="SECONDS",
+                        help=f"Respawns faster than this count towards escalation "
+                             f"(default: {DEFAULT_RESPAWN_THRESHOLD:.0f}).")
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL, metavar="SECONDS",
+                        help=f"Poll interval when busy (default: {DEFAULT_MIN_INTERVAL:g}).")
+    parser.add_argument("--max-interval", type=float, default=DEFAULT_MAX_INTERVAL, metavar="SECONDS",
+                        help=f"Longest poll interval when idle (default: {DEFAULT_MAX_INTERVAL:g}).")
+    parser.add_argument("--metrics", action="append", default=[], metavar="PATH",
+                        help="Write metrics to PATH: .jsonl, .csv or .prom (Prometheus textfile). May be repeated.")
+    parser.add_argument("--metrics-top", type=int, default=DEFAULT_TOP, metavar="N",
+                        help=f"How many of the busiest processes to record per poll (default: {DEFAULT_TOP}).")
+    parser.add_argument("--summary", action="append", default=[], metavar="PATH",
+                        help="Also write the end-of-run summary to PATH (.md or $GITHUB_STEP_SUMMARY: Markdown, "
+                             "otherwise JSON). May be repeated.")
+    parser.add_argument("--record", metavar="PATH",
+                        help="Append every raw process snapshot to PATH, for replay.py.")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="Serve the latest poll on a Unix socket at PATH; see query.py.")
+    subparsers = parser.add_subparsers(dest="mode", metavar="run")
+    run = subparsers.add_parser("run", help="Run a command, watching processes until it exits, "
+                                            "and exit with its status. Options go before run.")
+    run.add_argument("command", nargs=argparse.REMAINDER, help="The command to run, after --.")
+    args = parser.parse_args()
+    if args.mode == "run":
+        if args.command[:1] == ["--"]:
+            args.command = args.command[1:]
+        if not args.command:
+            run.error("give a command to run")
+    return args
+
+def sleep_until(deadline, throttler, wake=None):
+    """Sleep until `deadline` on the monotonic clock, stopping and continuing throttled processes on time.
+
+    Returns early once `wake`, a `threading.Event`, is set.
+    """
     while True:
+        now = time.monotonic()
+        throttler.tick(now)
+        if now >= deadline or (wake is not None and wake.is_set()):
+            return
+        delay = min(deadline, throttler.next_deadline()) - now
+        if wake is None:
+            time.sleep(delay)
+        else:
+            wake.wait(delay)
+
+def exit_on_signal(signum, frame):
+    # Raise SystemExit so `finally` blocks run, continuing throttled processes.
+    # This also interrupts `time.sleep`, so exiting never waits for a poll.
+    sys.exit(128 + signum)
+
+def main():
+    args = parse_args()
+    source = create_process_source(args.source)
+    sampler = ProcessSampler(args.window)
+    try:
+        policy = load_policy(args.policy) if args.policy else default_policy()
+    except (OSError, PolicyError) as e:
+        raise SystemExit(f"🤠 pyeetd: Invalid policy - {e}")
+    killer = Killer()
+    throttler = Throttler(killer.send_signal)
+    tracker = RespawnTracker(args.escalation, args.respawn_threshold, poll_interval=SLEEP_DELAY)
+    scheduler = AdaptiveScheduler(min(args.min_interval, SLEEP_DELAY), SLEEP_DELAY,
+                                  max(args.max_interval, SLEEP_DELAY))
+    try:
+        metrics = MetricsRecorder([create_exporter(path) for path in args.metrics])
+    except ValueError as e:
+        raise SystemExit(f"🤠 pyeetd: {e}")
+    try:
+        recorder = SnapshotWriter(args.record) if args.record else None
+    except OSError as e:
+        raise SystemExit(f"🤠 pyeetd: Can't record to {args.record} - {e}")
+    try:
+        server = QueryServer(args.socket) if args.socket else None
+    except OSError as e:
+        raise SystemExit(f"🤠 pyeetd: Can't serve on {args.socket} - {e}")
+    summary = RunSummary(time.time(), time.monotonic())
+    supervisor = usage = None
+    if args.mode == "run":
+        supervisor = Supervisor(args.command)
+        usage = TreeUsage()
+        for signum in FORWARDED_SIGNALS:
+            signal.signal(signum, supervisor.forward)
         try:
-            output = []
-            processes = get_processes(ProcessSort.CPU)
-            processes_to_yeet = find_unwanted(processes)
-            output.extend(yeet(processes_to_yeet))
-            output.append(f"🤠 {time.strftime('%Y-%m-%d %H:%M:%S')} - pyeetd {len(processes_to_yeet)} processes.")
+            supervisor.start()
+        except OSError as e:
+            print(f"😪 pyeetd: Can't run {args.command[0]} - {e}")
+            sys.exit(127)
+    else:
+        for signum in EXIT_SIGNALS:
+            signal.signal(signum, exit_on_signal)
+    print(f"🤠 pyeetd: Reading processes with {source.name}")
+    last_print = last_status = -math.inf
+    try:
+        while supervisor is None or not supervisor.exited.is_set():
+            now = time.monotonic()
+            try:
+                output = []
+                snapshot = source.snapshot()
+                processes = sort_processes(sampler.update(snapshot, now), ProcessSort.CPU)
+                devices = group_by_device(processes)
+                if usage is not None:
+                    usage.update(supervisor.tree(processes))
+                throttler.update(processes)
+                output.extend(tracker.observe(processes, now))
+                actions, events = act(policy.evaluate(processes, devices), throttler, tracker, now, killer)
+                acted_on = len(events)
+                output.extend(actions)
+                interval = scheduler.next_interval(processes, acted_on)
+                wall_time = time.time()
+                if recorder is not None:
+                    recorder.write(Snapshot(wall_time, now, scheduler.load, snapshot))
+                output.extend(metrics.record(build_record(wall_time, scheduler.load, interval, processes, events,
+                                                          args.metrics_top, devices, usage), now))
+                summary.update(processes, scheduler.load, events, wall_time)
+                if server is not None:
+                    server.publish(wall_time, scheduler.load, interval, processes, devices, events, tracker,
+                                   None if usage is None else usage.report(args.command, None))
+                # Fast polls only log when they act; otherwise keep to one
+                # status line per base interval.
+                if acted_on or now - last_status >= SLEEP_DELAY:
+                    output.append(f"🤠 {time.strftime('%Y-%m-%d %H:%M:%S')} - pyeetd {acted_on} processes. "
+                                  f"Load {scheduler.load:.2f}, next poll in {interval:g}s.")
+                    if usage is not None:
+                        output.append(f"🏃 pyeetd: Command using {usage.cpu_percent:.0f}% CPU, "
+                                      f"{usage.rss / 1024 / 1024:.0f} MB in {usage.process_count} processes.")
+                    last_status = now
+                if output:
+                    print("\n".join(output))
+                if now - last_print >= PRINT_PROCESSES_INTERVAL:
+                    print_processes(processes, 10)
+                    if devices:
+                        print("\n".join(["📱 Simulator devices by CPU usage:", *format_devices(devices[:10]),
+                                          "================================"]))
+                    if tracker.stats:
+                        print("\n".join(["🔁 Kills by name:", *tracker.table(now), "================================"]))
+                    last_print = now
+            except Exception as e:
+                print(f"🤠 pyeetd: Error in main loop - {e}")
+                interval = SLEEP_DELAY
+            sleep_until(now + interval, throttler, supervisor and supervisor.exited)
+    finally:
+        if supervisor is not None:
+            supervisor.stop()
+        released = throttler.release_all()
+        if released:
+            print(f"🤠 pyeetd: Continued {len(released)} throttled processes.")
+        # Close everything even if one fails, so the summary is always printed.
+        output = metrics.close()
+        for what, resource in (("recording", recorder), ("query socket", server)):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError as e:
+                    output.append(f"😪 pyeetd: Failed to close {what} - {e}")
+        if output:
             print("\n".join(output))
-            if i % print_cycles == 0:
-                print_processes(processes, 10)
-            i += 1
-        except Exception as e:
-            print(f"🤠 pyeetd: Error in main loop - {e}")
-        time.sleep(SLEEP_DELAY)
+        now = time.monotonic()
+        report = summary.report(now, tracker.reclaimed_cpu_seconds(now))
+        if usage is not None:
+            report["command"] = usage.report(args.command, supervisor.exit_status, supervisor.rusage)
+        print(format_text(report), flush=True)
+        for path in args.summary:
+            try:
+                write_report(report, path)
+            except OSError as e:
+                print(f"😪 pyeetd: Failed to write summary to {path} - {e}")
+    if supervisor is not None:
+        sys.exit(supervisor.exit_status)
 
 if __name__ == '__main__':
     main()
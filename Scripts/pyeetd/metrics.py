@@ -0,0 +1,346 @@
+"""
+Time-series metrics export for pyeetd.
+
+Every poll becomes one record of host load, the busiest processes, resource
+use per simulator device, what pyeetd did and, under `main.py run`, what the
+command's process tree used. `MetricsRecorder` keeps the most recent records in a bounded ring
+buffer and hands each one to its exporters, chosen by file extension:
+
+- `.jsonl`: one JSON object per poll;
+- `.csv`: one row per poll and top process, host columns repeated (per
+  device totals are left out, but each process has its device and runtime);
+- `.prom`: a Prometheus textfile (for node_exporter's textfile collector)
+  holding the latest values, rewritten atomically.
+
+Exporters buffer in memory and write at most every `flush_interval` seconds,
+plus once more on exit, so exporting never costs a write per poll.
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+
+from devices import DeviceUsage
+from process_source import ProcessInfo
+from supervisor import TreeUsage
+
+# How many records to keep in memory.
+DEFAULT_CAPACITY = 720
+
+# How many of the busiest processes to record per poll.
+DEFAULT_TOP = 5
+
+# The longest exporters hold records before writing them, in seconds.
+DEFAULT_FLUSH_INTERVAL = 10.0
+
+
+@dataclass
+class ProcessRecord:
+    pid: int
+    name: str
+    environment: str
+    cpu_percent: float | None
+    avg_cpu_percent: float | None
+    memory_percent: float
+    rss: int
+    device: str | None = None
+    runtime: str | None = None
+
+
+@dataclass
+class DeviceRecord:
+    device: str | None
+    runtime: str | None
+    process_count: int
+    cpu_percent: float
+    avg_cpu_percent: float
+    memory_percent: float
+    rss: int
+
+
+@dataclass
+class CommandRecord:
+    process_count: int
+    cpu_percent: float
+    rss: int
+
+
+@dataclass
+class ActionRecord:
+    action: str
+    pid: int
+    name: str
+
+
+@dataclass
+class MetricsRecord:
+    # Wall-clock time, in seconds since the epoch.
+    time: float
+    load: float
+    interval: float
+    process_count: int
+    # CPU% summed over every process, over the last poll.
+    total_cpu_percent: float
+    top: list[ProcessRecord] = field(default_factory=list)
+    actions: list[ActionRecord] = field(default_factory=list)
+    devices: list[DeviceRecord] = field(default_factory=list)
+    command: CommandRecord | None = None
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
+
+
+def build_record(wall_time, load, interval, processes: list[ProcessInfo], events, top=DEFAULT_TOP,
+                 devices: list[DeviceUsage] = (), command: TreeUsage | None = None) -> MetricsRecord:
+    """Build a record of one poll.
+
+    `events` are `(Action, ProcessInfo)` pairs for what pyeetd did this poll,
+    `devices` is the poll's `devices.group_by_device` and `command` is the
+    usage of the command pyeetd is running, if any.
+    """
+    busiest = sorted(processes, key=lambda p: p.cpu_now if p.cpu_now is not None else p.cpu_percent,
+                     reverse=True)[:top]
+    return MetricsRecord(
+        time=wall_time,
+        load=load,
+        interval=interval,
+        process_count=len(processes),
+        total_cpu_percent=round(sum(p.cpu_now for p in processes if p.cpu_now is not None), 1),
+        top=[ProcessRecord(p.pid, p.name, p.environment, _round(p.cpu_now), _round(p.cpu_window),
+                           p.memory_percent, p.rss, p.device, p.runtime)
+             for p in busiest],
+        actions=[ActionRecord(action.value, p.pid, p.name) for action, p in events],
+        devices=[DeviceRecord(d.device, d.runtime, d.process_count, round(d.cpu_percent, 1),
+                              round(d.avg_cpu_percent, 1), round(d.memory_percent, 1), d.rss)
+                 for d in devices],
+        command=None if command is None else CommandRecord(command.process_count, round(command.cpu_percent, 1),
+                                                           command.rss),
+    )
+
+
+class Exporter(ABC):
+    """Base class for exporters that buffer records and write them in batches.
+
+    The buffer is bounded too, so records are dropped rather than piling up if
+    writes keep failing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pending: deque[MetricsRecord] = deque(maxlen=DEFAULT_CAPACITY)
+
+    def add(self, record: MetricsRecord) -> None:
+        self.pending.append(record)
+
+    def flush(self) -> None:
+        if self.pending:
+            self.write(list(self.pending))
+            self.pending.clear()
+
+    @abstractmethod
+    def write(self, records: list[MetricsRecord]) -> None:
+        """Write `records`, oldest first."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class JsonlExporter(Exporter):
+    def write(self, records):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(asdict(record), separators=(",", ":")) + "\n" for record in records))
+
+
+class CsvExporter(Exporter):
+    FIELDS = ["time", "load", "interval", "process_count", "total_cpu_percent", "actions",
+              "pid", "name", "environment", "cpu_percent", "avg_cpu_percent", "memory_percent", "rss",
+              "device", "runtime", "command_processes", "command_cpu_percent", "command_rss"]
+
+    def write(self, records):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if new_file:
+            writer.writerow(self.FIELDS)
+        for record in records:
+            host = [record.time, record.load, record.interval, record.process_count,
+                    record.total_cpu_percent, len(record.actions)]
+            command = [] if record.command is None else [record.command.process_count,
+                                                         record.command.cpu_percent, record.command.rss]
+            for p in record.top or [None]:
+                process = [None] * 9 if p is None else [p.pid, p.name, p.environment, p.cpu_percent,
+                                                        p.avg_cpu_percent, p.memory_percent, p.rss,
+                                                        p.device, p.runtime]
+                writer.writerow(host + process + command)
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            f.write(buffer.getvalue())
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class PrometheusExporter(Exporter):
+    """Writes the latest record, plus action counters since start, as a Prometheus textfile."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.action_counts: Counter[tuple[str, str]] = Counter()
+
+    def add(self, record):
+        # Only the latest record is exported, but counters need every one.
+        self.action_counts.update((a.action, a.name) for a in record.actions)
+        self.pending.clear()
+        self.pending.append(record)
+
+    def write(self, records):
+        record = records[-1]
+        lines = [
+            "# HELP pyeetd_load1 One-minute load average.",
+            "# TYPE pyeetd_load1 gauge",
+            f"pyeetd_load1 {record.load}",
+            "# HELP pyeetd_total_cpu_percent CPU% summed over all processes over the last poll.",
+            "# TYPE pyeetd_total_cpu_percent gauge",
+            f"pyeetd_total_cpu_percent {record.total_cpu_percent}",
+            "# HELP pyeetd_processes Number of running processes.",
+            "# TYPE pyeetd_processes gauge",
+            f"pyeetd_processes {record.process_count}",
+            "# HELP pyeetd_poll_interval_seconds Delay before the next poll.",
+            "# TYPE pyeetd_poll_interval_seconds gauge",
+            f"pyeetd_poll_interval_seconds {record.interval}",
+            "# HELP pyeetd_process_cpu_percent CPU% of the busiest processes over the last poll, summed by name.",
+            "# TYPE pyeetd_process_cpu_percent gauge",
+        ]
+        # Labelled by name only: PIDs change with every respawn, and a
+        # series per PID would grow without bound.
+        cpu_percent: dict[str, float] = {}
+        rss: dict[str, int] = {}
+        for p in record.top:
+            if p.cpu_percent is not None:
+                cpu_percent[p.name] = cpu_percent.get(p.name, 0.0) + p.cpu_percent
+            rss[p.name] = rss.get(p.name, 0) + p.rss
+        lines += [f'pyeetd_process_cpu_percent{{name="{_label(name)}"}} {round(value, 1)}'
+                  for name, value in cpu_percent.items()]
+        lines += [
+            "# HELP pyeetd_process_rss_bytes Resident set size of the busiest processes, summed by name.",
+            "# TYPE pyeetd_process_rss_bytes gauge",
+        ]
+        lines += [f'pyeetd_process_rss_bytes{{name="{_label(name)}"}} {value}' for name, value in rss.items()]
+        lines += [
+            "# HELP pyeetd_device_cpu_percent CPU% of each simulator device over the last poll.",
+            "# TYPE pyeetd_device_cpu_percent gauge",
+        ]
+        devices = [(f'device="{_label(d.device or "shared")}",runtime="{_label(d.runtime or "")}"', d)
+                   for d in record.devices]
+        lines += [f"pyeetd_device_cpu_percent{{{labels}}} {d.cpu_percent}" for labels, d in devices]
+        lines += [
+            "# HELP pyeetd_device_rss_bytes Resident set size of each simulator device's processes.",
+            "# TYPE pyeetd_device_rss_bytes gauge",
+        ]
+        lines += [f"pyeetd_device_rss_bytes{{{labels}}} {d.rss}" for labels, d in devices]
+        lines += [
+            "# HELP pyeetd_device_processes Number of each simulator device's processes.",
+            "# TYPE pyeetd_device_processes gauge",
+        ]
+        lines += [f"pyeetd_device_processes{{{labels}}} {d.process_count}" for labels, d in devices]
+        if record.command is not None:
+            lines += [
+                "# HELP pyeetd_command_cpu_percent CPU% of the command pyeetd runs and its descendants.",
+                "# TYPE pyeetd_command_cpu_percent gauge",
+                f"pyeetd_command_cpu_percent {record.command.cpu_percent}",
+                "# HELP pyeetd_command_rss_bytes Resident set size of the command pyeetd runs and its descendants.",
+                "# TYPE pyeetd_command_rss_bytes gauge",
+                f"pyeetd_command_rss_bytes {record.command.rss}",
+                "# HELP pyeetd_command_processes Number of processes in the command's tree.",
+                "# TYPE pyeetd_command_processes gauge",
+                f"pyeetd_command_processes {record.command.process_count}",
+            ]
+        lines += [
+            "# HELP pyeetd_actions_total Processes acted on since pyeetd started.",
+            "# TYPE pyeetd_actions_total counter",
+        ]
+        lines += [f'pyeetd_actions_total{{action="{action}",name="{_label(name)}"}} {count}'
+                  for (action, name), count in sorted(self.action_counts.items())]
+        lines += [
+            "# HELP pyeetd_last_update_timestamp_seconds When these values were sampled.",
+            "# TYPE pyeetd_last_update_timestamp_seconds gauge",
+            f"pyeetd_last_update_timestamp_seconds {record.time}",
+        ]
+
+        # Rewrite atomically so the collector never reads a partial file.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".pyeetd-", suffix=".prom.tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            # mkstemp creates the file readable by its owner only, but the
+            # collector often runs as another user.
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+EXPORTERS = {".jsonl": JsonlExporter, ".csv": CsvExporter, ".prom": PrometheusExporter}
+
+
+def create_exporter(path) -> Exporter:
+    """Create an exporter for `path`, chosen by its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORTERS:
+        raise ValueError(f"Unknown metrics format for {path}; use one of {', '.join(EXPORTERS)}")
+    return EXPORTERS[extension](path)
+
+
+class MetricsRecorder:
+    """Keeps recent records in a ring buffer and feeds them to exporters.
+
+    An exporter whose write fails is reported once and then dropped, so a bad
+    path costs one message rather than a failed write every poll.
+    """
+
+    def __init__(self, exporters=(), capacity=DEFAULT_CAPACITY, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.exporters = list(exporters)
+        self.records: deque[MetricsRecord] = deque(maxlen=capacity)
+        self.flush_interval = flush_interval
+        self._last_flush = None
+
+    def record(self, record: MetricsRecord, now: float) -> list[str]:
+        """Add a record, writing buffered records if `flush_interval` has passed since the last write.
+
+        Returns a message for each exporter that failed and was dropped.
+        """
+        self.records.append(record)
+        for exporter in self.exporters:
+            exporter.add(record)
+        if self._last_flush is None:
+            self._last_flush = now
+            return []
+        if now - self._last_flush < self.flush_interval:
+            return []
+        self._last_flush = now
+        return self.flush()
+
+    def flush(self) -> list[str]:
+        return self._each(Exporter.flush)
+
+    def close(self) -> list[str]:
+        return self._each(Exporter.close)
+
+    def _each(self, method) -> list[str]:
+        output = []
+        for exporter in list(self.exporters):
+            try:
+                method(exporter)
+            except OSError as e:
+                self.exporters.remove(exporter)
+                output.append(f"😪 pyeetd: Failed to write metrics to {exporter.path}, "
+                              f"no longer exporting there - {e}")
+        return output
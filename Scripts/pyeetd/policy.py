@@ -0,0 +1,262 @@
+"""
+Policies that decide what pyeetd does to which processes.
+
+A policy is an ordered list of rules. Each process gets the action of the
+first rule it matches, if any. A rule matches a process when:
+
+- the process name contains one of the rule's patterns (a rule with no
+  patterns matches every name),
+- the process runs in the rule's environment ("simulator", "os" or "any"),
+- its CPU% averaged over the sampling window is at least `cpu_percent`, if
+  set (processes seen in fewer than two polls never match), and
+- its resident set is at least `rss_mb` megabytes, if set, and
+- it runs on the rule's `device`, if set: a simulator device UDID, a runtime
+  such as "iOS 18.0", or "noisiest" for whichever of several devices used
+  the most CPU over the sampling window; see devices.py.
+
+Actions:
+
+- "kill" kills the process's group.
+- "stop" pauses the process with SIGSTOP until it exits or pyeetd does.
+- "throttle" duty-cycles the process with SIGSTOP and SIGCONT so it gets at
+  most `cpu_budget` percent of a CPU; see throttle.py.
+- "renice" lowers the process's priority to `nice`.
+- "log" only reports the process.
+
+Policies are JSON, or TOML if the file name ends in `.toml`:
+
+    {
+        "rules": [
+            {"name": "posters", "environment": "simulator",
+             "patterns": ["AegirPoster", "PhotosPosterProvider"],
+             "action": "kill"},
+            {"name": "busy-os-daemons", "environment": "os",
+             "cpu_percent": 80, "action": "renice", "nice": 15},
+            {"name": "busy-simulator-daemons", "environment": "simulator",
+             "cpu_percent": 50, "action": "throttle", "cpu_budget": 20},
+            {"name": "noisy-clone", "device": "noisiest", "cpu_percent": 80,
+             "action": "renice", "nice": 15},
+            {"name": "big", "rss_mb": 2048, "action": "log"}
+        ]
+    }
+
+Without a policy file, pyeetd kills the processes in `SIMULATOR_PROCESSES`
+and `OS_PROCESSES`, as it always has.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+
+from devices import NOISIEST, group_by_device, noisiest_device
+from process_source import ProcessInfo
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+OS_PROCESSES = {
+    "ecosystemanalyticsd",
+    "com.apple.ecosystemd",
+    "com.apple.metadata.mds",
+}
+
+SIMULATOR_PROCESSES = {
+    "AegirPoster",
+    "InfographPoster",
+    "CollectionsPoster",
+    "ExtragalacticPoster",
+    "KaleidoscopePoster",
+    "EmojiPosterExtension",
+    "AmbientPhotoFramePosterProvider",
+    "PhotosPosterProvider",
+    "AvatarPosterExtension",
+    "GradientPosterExtension",
+    "MonogramPosterExtension",
+    # "System/Library/PrivateFrameworks/SessionCore.framework/Support/liveactivitiesd",
+    # "Applications/News.app",
+    # "usr/libexec/icloudmailagent",
+    # "Applications/Family.app",
+    # "Applications/PosterBoard.app",
+    # "Applications/PassbookStub.app",
+}
+
+ENVIRONMENTS = ("any", "simulator", "os")
+
+# The niceness `renice` rules apply when they don't set `nice`.
+DEFAULT_NICE = 10
+
+# The CPU% `throttle` rules allow when they don't set `cpu_budget`.
+DEFAULT_CPU_BUDGET = 25
+
+# How many distinct process names to remember rule matches for.
+CANDIDATE_CACHE_SIZE = 10000
+
+
+class PolicyError(Exception):
+    """Raised when a policy file is malformed."""
+
+
+class Action(Enum):
+    KILL = "kill"
+    STOP = "stop"
+    THROTTLE = "throttle"
+    RENICE = "renice"
+    LOG = "log"
+
+
+@dataclass
+class Rule:
+    name: str
+    action: Action
+    patterns: list[str] = field(default_factory=list)
+    environment: str = "any"
+    cpu_percent: float | None = None
+    rss_mb: float | None = None
+    nice: int = DEFAULT_NICE
+    cpu_budget: float = DEFAULT_CPU_BUDGET
+    device: str | None = None
+
+    def matches_thresholds(self, p: ProcessInfo, noisiest: str | None = None) -> bool:
+        if self.environment != "any" and (self.environment == "simulator") != p.is_simulator:
+            return False
+        if self.device is not None:
+            if self.device == NOISIEST:
+                if noisiest is None or p.device != noisiest:
+                    return False
+            elif self.device not in (p.device, p.runtime):
+                return False
+        if self.cpu_percent is not None and (p.cpu_window is None or p.cpu_window < self.cpu_percent):
+            return False
+        if self.rss_mb is not None and p.rss < self.rss_mb * 1024 * 1024:
+            return False
+        return True
+
+
+@dataclass
+class Decision:
+    process: ProcessInfo
+    rule: Rule
+
+    @property
+    def action(self) -> Action:
+        return self.rule.action
+
+
+class Policy:
+    """An ordered list of rules, compiled for evaluating whole snapshots.
+
+    Each rule's name patterns are compiled into one regular expression, so
+    finding the rules that can apply to a name is one search per rule. The
+    result is cached by name, and since the same processes show up snapshot
+    after snapshot, most lookups don't search at all.
+    """
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        self._matchers = tuple(
+            (index, re.compile("|".join(re.escape(pattern) for pattern in rule.patterns)) if rule.patterns else None)
+            for index, rule in enumerate(rules)
+        )
+        self._candidates: dict[str, tuple[int, ...]] = {}
+        self._needs_devices = any(rule.device == NOISIEST for rule in rules)
+
+    def candidates(self, name: str) -> tuple[int, ...]:
+        """The indexes of the rules whose patterns match `name`, in order."""
+        candidates = self._candidates.get(name)
+        if candidates is None:
+            if len(self._candidates) >= CANDIDATE_CACHE_SIZE:
+                self._candidates.clear()
+            candidates = self._candidates[name] = tuple(
+                index for index, matcher in self._matchers if matcher is None or matcher.search(name)
+            )
+        return candidates
+
+    def evaluate(self, processes: list[ProcessInfo], devices=None) -> list[Decision]:
+        """Decide what to do with each process, in one pass over the snapshot.
+
+        `devices` is the snapshot's `devices.group_by_device`, if the caller
+        already has it.
+        """
+        noisiest = None
+        if self._needs_devices:
+            noisiest = noisiest_device(group_by_device(processes) if devices is None else devices)
+        decisions = []
+        for p in processes:
+            for index in self.candidates(p.name):
+                rule = self.rules[index]
+                if rule.matches_thresholds(p, noisiest):
+                    decisions.append(Decision(p, rule))
+                    break
+        return decisions
+
+
+def default_policy() -> Policy:
+    return Policy([
+        Rule("simulator-processes", Action.KILL, sorted(SIMULATOR_PROCESSES), environment="simulator"),
+        Rule("os-processes", Action.KILL, sorted(OS_PROCESSES), environment="os"),
+    ])
+
+
+def _parse_rule(index: int, data) -> Rule:
+    if not isinstance(data, dict):
+        raise PolicyError(f"Rule {index} must be an object")
+    name = data.get("name", f"rule-{index}")
+    try:
+        action = Action(data.get("action"))
+    except ValueError:
+        raise PolicyError(f"{name}: action must be one of {', '.join(a.value for a in Action)}") from None
+    patterns = data.get("patterns", [])
+    if not isinstance(patterns, list) or not all(isinstance(p, str) and p for p in patterns):
+        raise PolicyError(f"{name}: patterns must be a list of non-empty strings")
+    environment = data.get("environment", "any")
+    if environment not in ENVIRONMENTS:
+        raise PolicyError(f"{name}: environment must be one of {', '.join(ENVIRONMENTS)}")
+    for threshold in ("cpu_percent", "rss_mb"):
+        value = data.get(threshold)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise PolicyError(f"{name}: {threshold} must be a number")
+    nice = data.get("nice", DEFAULT_NICE)
+    if isinstance(nice, bool) or not isinstance(nice, int) or not -20 <= nice <= 19:
+        raise PolicyError(f"{name}: nice must be an integer from -20 to 19")
+    cpu_budget = data.get("cpu_budget", DEFAULT_CPU_BUDGET)
+    if isinstance(cpu_budget, bool) or not isinstance(cpu_budget, (int, float)) or not 0 < cpu_budget < 100:
+        raise PolicyError(f"{name}: cpu_budget must be a number between 0 and 100")
+    device = data.get("device")
+    if device is not None and (not isinstance(device, str) or not device):
+        raise PolicyError(f"{name}: device must be a UDID, a runtime or \"{NOISIEST}\"")
+    unknown = set(data) - {
+        "name", "action", "patterns", "environment", "cpu_percent", "rss_mb", "nice", "cpu_budget", "device",
+    }
+    if unknown:
+        raise PolicyError(f"{name}: unknown fields {', '.join(sorted(unknown))}")
+    return Rule(
+        name, action, patterns, environment, data.get("cpu_percent"), data.get("rss_mb"), nice, cpu_budget,
+        device,
+    )
+
+
+def parse_policy(data) -> Policy:
+    """Build a policy from parsed JSON or TOML."""
+    if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+        raise PolicyError("A policy must have a list of rules")
+    return Policy([_parse_rule(index, rule) for index, rule in enumerate(data["rules"])])
+
+
+def load_policy(path: str) -> Policy:
+    """Load a JSON policy, or a TOML one if `path` ends in `.toml`."""
+    with open(path, "rb") as f:
+        content = f.read()
+    try:
+        if os.path.splitext(path)[1].lower() == ".toml":
+            if tomllib is None:
+                raise PolicyError("TOML policies need Python 3.11 or later")
+            data = tomllib.loads(content.decode())
+        else:
+            data = json.loads(content)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise PolicyError(f"Could not parse {path}: {e}") from e
+    return parse_policy(data)
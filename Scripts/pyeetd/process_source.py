@@ -0,0 +1,320 @@
+"""
+Process sources for pyeetd.
+
+A process source takes a snapshot of every running process as a list of
+`ProcessInfo` records. `ProcProcessSource` reads Linux's `/proc` directly;
+`PsProcessSource` parses the output of `ps` and works anywhere `ps` does,
+including the macOS runners.
+"""
+
+import os
+import re
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+
+SIMULATOR_PATH_SEARCH_KEY = "simruntime/Contents/Resources/RuntimeRoot"
+
+PROC_ROOT = "/proc"
+
+# Simulator devices keep their data under CoreSimulator/Devices/<UDID>, and
+# the clones made for parallel testing under XCTestDevices/<UDID>, so apps and
+# test runners installed on a device run from there.
+DEVICE_PATTERN = re.compile(r"/(?:Devices|XCTestDevices)/([0-9A-Fa-f]{8}-(?:[0-9A-Fa-f]{4}-){3}[0-9A-Fa-f]{12})/")
+
+# The runtime's daemons run from its RuntimeRoot, e.g.
+# .../Runtimes/iOS 18.0.simruntime/Contents/Resources/RuntimeRoot/usr/libexec/...
+RUNTIME_PATTERN = re.compile(r"/Runtimes/([^/]+)\.simruntime/")
+
+
+@lru_cache(maxsize=10000)
+def parse_simulator_path(name: str) -> tuple[str | None, str | None]:
+    """The simulator device UDID and runtime a process runs from, where its path shows them.
+
+    Daemons shared by every device of a runtime only have a runtime.
+    """
+    device = DEVICE_PATTERN.search(name)
+    runtime = RUNTIME_PATTERN.search(name)
+    return (device.group(1).upper() if device else None, runtime.group(1) if runtime else None)
+
+
+@dataclass
+class ProcessInfo:
+    pid: int
+    cpu_percent: float
+    memory_percent: float
+    name: str
+    is_simulator: bool
+    # Total CPU time used so far, in seconds.
+    cpu_time: float = 0.0
+    # Resident set size, in bytes.
+    rss: int = 0
+    # When the process started, in seconds since the epoch.
+    start_time: float = 0.0
+    # The parent's PID.
+    ppid: int = 0
+    # Filled in by `sampling.ProcessSampler` from the difference between
+    # samples: CPU% over the last poll interval and over the whole window,
+    # and how fast the resident set grew over the window in bytes/second.
+    # None until there are two samples.
+    cpu_now: float | None = None
+    cpu_window: float | None = None
+    rss_rate: float | None = None
+
+    @property
+    def key(self) -> tuple[int, float]:
+        """Identifies the process even if its PID is later reused."""
+        return (self.pid, self.start_time)
+
+    @property
+    def recent_cpu_percent(self) -> float:
+        """CPU% over the sampling window, or the source's figure before there is one."""
+        if self.cpu_window is not None:
+            return self.cpu_window
+        return self.cpu_percent
+
+    @property
+    def device(self) -> str | None:
+        return parse_simulator_path(self.name)[0]
+
+    @property
+    def runtime(self) -> str | None:
+        return parse_simulator_path(self.name)[1]
+
+    @property
+    def environment(self) -> str:
+        return "Simulator" if self.is_simulator else "OS"
+
+    @property
+    def output_string(self) -> str:
+        cpu_now = "-" if self.cpu_now is None else f"{self.cpu_now:.1f}%"
+        cpu_window = "-" if self.cpu_window is None else f"{self.cpu_window:.1f}%"
+        rss_rate = "-" if self.rss_rate is None else f"{self.rss_rate / 1024:+.0f}KB/s"
+        return (f"{self.pid}\t{cpu_now}\t{cpu_window}\t{self.memory_percent}%\t{rss_rate}"
+                f"\t{self.name}\t{self.environment}")
+
+
+class ProcessSort(Enum):
+    CPU = "cpu"
+    MEMORY = "memory"
+
+
+def sort_processes(processes: list[ProcessInfo], sort_by=ProcessSort.CPU) -> list[ProcessInfo]:
+    """Sort processes busiest first, by recent CPU% or by memory%."""
+    if sort_by == ProcessSort.CPU:
+        return sorted(processes, key=lambda p: p.recent_cpu_percent, reverse=True)
+    return sorted(processes, key=lambda p: p.memory_percent, reverse=True)
+
+
+# CPU% is over the last poll and averaged over the sampling window; RSSΔ is
+# how fast the resident set grew over the window.
+PROCESS_HEADER = "PID\tCPU%\tAvgCPU%\tMemory%\tRSSΔ\tName\tEnvironment"
+
+
+def format_processes(processes: list[ProcessInfo], limit=-1) -> str:
+    """Tables of the busiest processes by CPU and by memory, `processes` being sorted by CPU."""
+    output = []
+    output.append("================================")
+    output.append("⚡️ Processes sorted by CPU usage:")
+    output.append(PROCESS_HEADER)
+    limit = len(processes) if limit == -1 else limit
+    for p in processes[:limit]:
+        output.append(p.output_string)
+
+    output.append("--------------------------------")
+    output.append("🧠 Processes sorted by memory usage:")
+    output.append(PROCESS_HEADER)
+    processes_sorted_by_memory = sort_processes(processes, ProcessSort.MEMORY)
+    for p in processes_sorted_by_memory[:limit]:
+        output.append(p.output_string)
+
+    output.append("================================")
+    return "\n".join(output)
+
+
+class ProcessSource(ABC):
+    """Base class for process sources."""
+
+    name = ""
+
+    @abstractmethod
+    def snapshot(self) -> list[ProcessInfo]:
+        """Return every running process, in no particular order."""
+
+    def get_processes(self, sort_by=ProcessSort.CPU) -> list[ProcessInfo]:
+        """Return every running process, busiest first."""
+        return sort_processes(self.snapshot(), sort_by)
+
+
+class PsProcessSource(ProcessSource):
+    """Reads processes from `ps`, forking it once per snapshot.
+
+    The flags are the BSD `ps` flags used on the macOS runners, where `-r`
+    and `-m` sort by CPU and memory.
+    """
+
+    name = "ps"
+
+    def snapshot(self) -> list[ProcessInfo]:
+        return self._run_ps("-ero")
+
+    def get_processes(self, sort_by=ProcessSort.CPU) -> list[ProcessInfo]:
+        return sort_processes(self._run_ps("-ero" if sort_by == ProcessSort.CPU else "-emo"), sort_by)
+
+    @staticmethod
+    def parse_cpu_time(text: str) -> float:
+        """Parse a `ps` `time` column: `[[DD-]HH:]MM:SS[.ss]`."""
+        days, _, clock = text.rpartition("-")
+        seconds = 0.0
+        for part in clock.split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds + (int(days) * 86400 if days else 0)
+
+    def _run_ps(self, flags: str) -> list[ProcessInfo]:
+        # lstart is five words, e.g. "Mon Oct 19 08:20:27 2026", in the C locale.
+        result = subprocess.run(['ps', flags, 'pid,ppid,pcpu,pmem,rss,time,lstart,comm'],
+                                capture_output=True, text=True, check=True,
+                                env={**os.environ, "LC_ALL": "C"})
+        processes = []
+        for line in result.stdout.splitlines()[1:]:  # Skip header
+            parts = line.strip().split(None, 11)
+            if len(parts) == 12:
+                name = parts[11]
+                start = time.strptime(" ".join(parts[6:11]), "%a %b %d %H:%M:%S %Y")
+                processes.append(ProcessInfo(
+                    pid=int(parts[0]),
+                    cpu_percent=float(parts[2]),
+                    memory_percent=float(parts[3]),
+                    name=name,
+                    is_simulator=SIMULATOR_PATH_SEARCH_KEY in name,
+                    cpu_time=self.parse_cpu_time(parts[5]),
+                    rss=int(parts[4]) * 1024,
+                    start_time=time.mktime(start),
+                    ppid=int(parts[1]),
+                ))
+        return processes
+
+
+class ProcProcessSource(ProcessSource):
+    """Reads processes from Linux's `/proc` without forking.
+
+    Each snapshot reads one `/proc/<pid>/stat` per process, which holds the
+    parent, CPU times, start time and resident set size. A process's name comes from
+    its `cmdline`, which is read once per process and cached by PID and start
+    time, since it almost never changes.
+
+    CPU% and memory% are computed the way `ps` computes `pcpu` and `pmem`:
+    CPU time over the process's lifetime, and resident memory over total
+    memory.
+    """
+
+    name = "proc"
+
+    def __init__(self, root=PROC_ROOT):
+        self.root = root
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.memory_total = self._read_memory_total()
+        self.boot_time = self._read_boot_time()
+        self._names: dict[tuple[int, int], str] = {}
+
+    @classmethod
+    def is_available(cls, root=PROC_ROOT) -> bool:
+        return os.path.isfile(os.path.join(root, "self", "stat"))
+
+    def _read_memory_total(self) -> int:
+        with open(os.path.join(self.root, "meminfo"), "rb") as f:
+            for line in f:
+                if line.startswith(b"MemTotal:"):
+                    return int(line.split()[1]) * 1024
+        raise OSError("MemTotal not found in meminfo")
+
+    def _read_boot_time(self) -> float:
+        with open(os.path.join(self.root, "stat"), "rb") as f:
+            for line in f:
+                if line.startswith(b"btime "):
+                    return float(line.split()[1])
+        raise OSError("btime not found in stat")
+
+    def _read_uptime(self) -> float:
+        with open(os.path.join(self.root, "uptime"), "rb") as f:
+            return float(f.read().split()[0])
+
+    def _read_name(self, pid: int, comm: str) -> str:
+        try:
+            with open(os.path.join(self.root, str(pid), "cmdline"), "rb") as f:
+                argv0 = f.read().split(b"\0", 1)[0]
+        except OSError:
+            argv0 = b""
+        # Kernel threads and zombies have no command line.
+        return argv0.decode(errors="replace") if argv0 else comm
+
+    def snapshot(self) -> list[ProcessInfo]:
+        uptime = self._read_uptime()
+        names: dict[tuple[int, int], str] = {}
+        processes = []
+        for entry in os.listdir(self.root):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.root, entry, "stat"), "rb") as f:
+                    stat = f.read()
+            except OSError:
+                continue  # The process exited since listdir.
+            pid = int(entry)
+            # The command name is in parentheses and may itself contain
+            # spaces and parentheses, so split after the last one.
+            comm_end = stat.rfind(b")")
+            comm = stat[stat.find(b"(") + 1:comm_end].decode(errors="replace")
+            # Fields from the process state (field 3) on; see proc(5).
+            fields = stat[comm_end + 2:].split()
+            ppid = int(fields[1])
+            cpu_ticks = int(fields[11]) + int(fields[12])
+            start_ticks = int(fields[19])
+            rss_pages = int(fields[21])
+
+            name_key = (pid, start_ticks)
+            name = self._names.get(name_key)
+            if name is None:
+                name = self._read_name(pid, comm)
+            names[name_key] = name
+
+            cpu_time = cpu_ticks / self.clock_ticks
+            started = start_ticks / self.clock_ticks
+            elapsed = uptime - started
+            cpu_percent = cpu_time / elapsed * 100 if elapsed > 0 else 0.0
+            rss = rss_pages * self.page_size
+            processes.append(ProcessInfo(
+                pid=pid,
+                cpu_percent=round(cpu_percent, 1),
+                memory_percent=round(rss / self.memory_total * 100, 1),
+                name=name,
+                is_simulator=SIMULATOR_PATH_SEARCH_KEY in name,
+                cpu_time=cpu_time,
+                rss=rss,
+                start_time=self.boot_time + started,
+                ppid=ppid,
+            ))
+        # Only keep names of processes that still exist.
+        self._names = names
+        return processes
+
+
+SOURCES = ("auto", ProcProcessSource.name, PsProcessSource.name)
+
+
+def create_process_source(name="auto") -> ProcessSource:
+    """Create a process source by name.
+
+    "auto" reads `/proc` where it exists and falls back to `ps` elsewhere.
+    """
+    if name == "auto":
+        name = ProcProcessSource.name if ProcProcessSource.is_available() else PsProcessSource.name
+    if name == ProcProcessSource.name:
+        return ProcProcessSource()
+    if name == PsProcessSource.name:
+        return PsProcessSource()
+    raise ValueError(f"Unknown process source: {name}")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Asking a running pyeetd what it sees.
+
+With `--socket PATH`, pyeetd serves its latest view on a Unix domain socket.
+A client connects, sends one JSON request line and gets one JSON response
+line back:
+
+    {"query": "status"}             load, CPU use and process count now
+    {"query": "snapshot", "limit": 20}
+                                    the busiest processes, by CPU over the
+                                    last poll
+    {"query": "stats", "limit": 10} load and CPU over recent polls, the
+                                    busiest processes over the sampling
+                                    window, and use per simulator device
+    {"query": "kills", "limit": 50} what pyeetd did to which processes
+                                    recently, and kill counts per name
+
+Errors come back as {"error": "..."}. From a shell, e.g. before deciding to
+retry a flaky test:
+
+python Scripts/pyeetd/query.py "$RUNNER_TEMP/pyeetd.sock" status
+
+The server runs on daemon threads, one per connection. After each poll the
+main loop publishes its view as a new immutable `QueryState` in a single
+assignment, and requests are answered from whichever state is current, so a
+slow or stuck client can never hold up sampling.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+from devices import DeviceUsage
+from process_source import ProcessInfo
+
+QUERIES = ("status", "snapshot", "stats", "kills")
+
+DEFAULT_LIMIT = 20
+
+# How many polls of load history and how many actions to keep.
+HISTORY_SIZE = 120
+EVENT_HISTORY_SIZE = 200
+
+# How long a client has to send its request, in seconds.
+CLIENT_TIMEOUT = 2.0
+
+# The longest request accepted, in bytes.
+MAX_REQUEST = 4096
+
+
+@dataclass(frozen=True)
+class Poll:
+    time: float
+    load: float
+    total_cpu_percent: float
+    process_count: int
+
+
+@dataclass(frozen=True)
+class QueryState:
+    time: float
+    load: float
+    interval: float
+    # Sorted by CPU over the sampling window, as the main loop sorts them.
+    processes: list[ProcessInfo] = field(default_factory=list)
+    devices: list[DeviceUsage] = field(default_factory=list)
+    history: tuple[Poll, ...] = ()
+    events: tuple[dict, ...] = ()
+    kills: tuple[dict, ...] = ()
+    command: dict | None = None
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
+
+
+def _process(p: ProcessInfo) -> dict:
+    return {
+        "pid": p.pid,
+        "ppid": p.ppid,
+        "name": p.name,
+        "environment": p.environment,
+        "device": p.device,
+        "runtime": p.runtime,
+        "cpu_percent": _round(p.cpu_now),
+        "avg_cpu_percent": _round(p.cpu_window),
+        "memory_percent": p.memory_percent,
+        "rss": p.rss,
+        "rss_rate": _round(p.rss_rate),
+    }
+
+
+def _status(state: QueryState) -> dict:
+    total_cpu_percent = sum(p.cpu_now for p in state.processes if p.cpu_now is not None)
+    cpu_count = os.cpu_count() or 1
+    return {
+        "time": state.time,
+        "load": state.load,
+        "cpu_count": cpu_count,
+        "total_cpu_percent": round(total_cpu_percent, 1),
+        # As the scheduler reckons it: the higher of load and CPU use, per CPU.
+        "pressure": round(max(state.load, total_cpu_percent / 100) / cpu_count, 2),
+        "process_count": len(state.processes),
+        "next_poll_in": state.interval,
+        "command": state.command,
+    }
+
+
+def answer(state: QueryState | None, request) -> dict:
+    """The response to a parsed request, given the latest state."""
+    if not isinstance(request, dict) or request.get("query") not in QUERIES:
+        return {"error": f"query must be one of {', '.join(QUERIES)}"}
+    limit = request.get("limit", DEFAULT_LIMIT)
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        return {"error": "limit must be a positive integer"}
+    if state is None:
+        return {"error": "no poll has finished yet"}
+
+    query = request["query"]
+    if query == "status":
+        return _status(state)
+    if query == "snapshot":
+        busiest = sorted(state.processes, key=lambda p: p.cpu_now or 0.0, reverse=True)[:limit]
+        return {"time": state.time, "processes": [_process(p) for p in busiest]}
+    if query == "stats":
+        history = state.history
+        return {
+            "time": state.time,
+            "polls": len(history),
+            "since": history[0].time if history else state.time,
+            "load": {"mean": round(sum(p.load for p in history) / len(history), 2) if history else 0.0,
+                     "peak": round(max((p.load for p in history), default=0.0), 2)},
+            "total_cpu_percent": {
+                "mean": round(sum(p.total_cpu_percent for p in history) / len(history), 1) if history else 0.0,
+                "peak": max((p.total_cpu_percent for p in history), default=0.0),
+            },
+            "top_cpu": [_process(p) for p in state.processes[:limit]],
+            "devices": [{"device": d.device, "runtime": d.runtime, "process_count": d.process_count,
+                         "cpu_percent": round(d.cpu_percent, 1), "avg_cpu_percent": round(d.avg_cpu_percent, 1),
+                         "memory_percent": round(d.memory_percent, 1), "rss": d.rss}
+                        for d in state.devices[:limit]],
+        }
+    return {"time": state.time, "events": list(state.events[-limit:]), "kills": list(state.kills[:limit])}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    timeout = CLIENT_TIMEOUT
+
+    def handle(self):
+        try:
+            line = self.rfile.readline(MAX_REQUEST)
+            request = json.loads(line)
+        except (OSError, ValueError):
+            response = {"error": "send one JSON object per connection, on one line"}
+        else:
+            response = answer(self.server.state, request)
+        try:
+            self.wfile.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+        except OSError:
+            pass  # The client went away.
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    state: QueryState | None = None
+
+
+class QueryServer:
+    """Serves the latest `QueryState` on a Unix socket from background threads.
+
+    Only `publish` is called from the main loop, and it only builds the new
+    state and swaps it in; everything else happens on the server's threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # A socket left behind by a pyeetd that was killed would make bind fail.
+        try:
+            if stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        self._server = _Server(path, _Handler)
+        self._history: deque[Poll] = deque(maxlen=HISTORY_SIZE)
+        self._events: deque[dict] = deque(maxlen=EVENT_HISTORY_SIZE)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="pyeetd-query", daemon=True)
+        self._thread.start()
+
+    def publish(self, wall_time, load, interval, processes, devices, events, tracker, command=None) -> None:
+        """Make a poll's results the ones queries see.
+
+        `events` are the poll's `(Action, ProcessInfo)` pairs, `tracker` the
+        `respawn.RespawnTracker` and `command` the report of the command
+        pyeetd runs, if any.
+        """
+        total_cpu_percent = round(sum(p.cpu_now for p in processes if p.cpu_now is not None), 1)
+        self._history.append(Poll(wall_time, load, total_cpu_percent, len(processes)))
+        self._events.extend({"time": wall_time, "action": action.value, "pid": p.pid, "name": p.name}
+                            for action, p in events)
+        kills = tuple(
+            {"name": s.name, "kills": s.kills, "respawns": s.respawns, "median_respawn": s.median_respawn_time,
+             "reclaimed_cpu_seconds": round(s.reclaimed_cpu_seconds, 1), "escalated": s.escalated}
+            for s in sorted(tracker.stats.values(), key=lambda s: s.kills, reverse=True)
+        )
+        self._server.state = QueryState(wall_time, load, interval, processes, devices, tuple(self._history),
+                                        tuple(self._events), kills, command)
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def query(path, request: dict, timeout=5.0) -> dict:
+    """Send a request to a running pyeetd and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(path)
+        client.sendall(json.dumps(request).encode() + b"\n")
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ask a running pyeetd what it sees.")
+    parser.add_argument("socket", help="The path pyeetd was given with --socket.")
+    parser.add_argument("query", nargs="?", choices=QUERIES, default="status")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT,
+                        help=f"Most items to list (default: {DEFAULT_LIMIT}).")
+    args = parser.parse_args()
+    try:
+        response = query(args.socket, {"query": args.query, "limit": args.limit})
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"🤠 pyeetd: Can't query {args.socket} - {e}")
+    json.dump(response, sys.stdout, indent=2)
+    print()
+    if "error" in response:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
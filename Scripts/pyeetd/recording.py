@@ -0,0 +1,66 @@
+"""
+Recording process snapshots for replay.
+
+`SnapshotWriter` saves every raw snapshot pyeetd takes, before sampling, as
+one JSON line:
+
+    {"time": 1760862027.1, "monotonic": 5120.4, "load": 3.2,
+     "processes": [[pid, cpu_percent, memory_percent, name, is_simulator,
+                    cpu_time, rss, start_time, ppid], ...]}
+
+Processes are stored as arrays in `FIELDS` order rather than objects, which
+halves the size of a recording. Fields added later go at the end, so older
+recordings still read, with defaults for what they lack. `read_snapshots`
+reads a recording back; see replay.py.
+"""
+
+import json
+from dataclasses import dataclass
+
+from process_source import ProcessInfo
+
+FIELDS = ("pid", "cpu_percent", "memory_percent", "name", "is_simulator", "cpu_time", "rss", "start_time", "ppid")
+
+
+@dataclass
+class Snapshot:
+    # Wall-clock time, in seconds since the epoch.
+    time: float
+    # Monotonic time, which sampling and respawn tracking run on.
+    monotonic: float
+    load: float
+    processes: list[ProcessInfo]
+
+
+class SnapshotWriter:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, snapshot: Snapshot) -> None:
+        record = {
+            "time": snapshot.time,
+            "monotonic": snapshot.monotonic,
+            "load": snapshot.load,
+            "processes": [[getattr(p, name) for name in FIELDS] for p in snapshot.processes],
+        }
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_snapshots(path):
+    """Yield the snapshots in a recording, in order.
+
+    A truncated last line, as left by a recording that was killed mid-write,
+    is skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            processes = [ProcessInfo(**dict(zip(FIELDS, values))) for values in record["processes"]]
+            yield Snapshot(record["time"], record["monotonic"], record.get("load", 0.0), processes)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Replays process snapshots through pyeetd's policy engine, without touching
+any process.
+
+how to use:
+python Scripts/pyeetd/main.py --record snapshots.jsonl
+python Scripts/pyeetd/replay.py snapshots.jsonl --policy policy.json
+python Scripts/pyeetd/replay.py --synthetic 500 1000 2000 5000
+
+Each snapshot goes through sampling, respawn tracking, the policy, escalation
+and the process tables just as in main.py, but kills, signals and renices go
+to a `DryRunKiller` and time is the snapshots' own: a recording's timestamps,
+or for synthetic snapshots a simulated clock that advances by whatever poll
+interval the scheduler picks. So an hour's recording replays in seconds, and
+replays are repeatable.
+
+Synthetic snapshots have the given number of processes, a few of them the
+simulator and OS daemons pyeetd kills by default, which come back a few
+seconds after being killed, as launchd would bring them back.
+
+For each snapshot size it reports what was decided and what each cycle cost:
+`Policy` is `Policy.evaluate` alone, `Cycle` is everything else on top.
+
+options:
+--policy PATH           a JSON or TOML policy file (default: the built-in
+                        kill lists); see policy.py
+--synthetic N [N ...]   replay generated snapshots of N processes each,
+                        instead of a recording
+--cycles N              how many synthetic snapshots per size (default: 60)
+--seed N                seed for generating synthetic snapshots (default: 0)
+--verbose               print what would be done, as main.py would
+--window, --escalation, --respawn-threshold, --min-interval, --max-interval
+                        as for main.py
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+
+from actions import DryRunKiller, act
+from devices import format_devices, group_by_device
+from policy import OS_PROCESSES, Action, SIMULATOR_PROCESSES, PolicyError, default_policy, load_policy
+from process_source import ProcessInfo, ProcessSort, format_processes, sort_processes
+from recording import Snapshot, read_snapshots
+from respawn import DEFAULT_RESPAWN_THRESHOLD, ESCALATIONS, RespawnTracker
+from sampling import DEFAULT_WINDOW, ProcessSampler
+from scheduler import DEFAULT_BASE_INTERVAL, DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, AdaptiveScheduler
+from summary import short_name
+from throttle import Throttler
+
+DEFAULT_CYCLES = 60
+
+# Where simulated processes appear to run from.
+SYNTHETIC_RUNTIME_ROOT = ("/Library/Developer/CoreSimulator/Volumes/iOS_22A3351/Library/Developer/CoreSimulator"
+                          "/Profiles/Runtimes/iOS 18.0.simruntime/Contents/Resources/RuntimeRoot")
+
+# Where simulated devices' data lives.
+SYNTHETIC_DEVICES = "/Users/runner/Library/Developer/XCTestDevices"
+
+# Wall-clock time of the start of synthetic replays.
+SYNTHETIC_EPOCH = 1_760_000_000.0
+
+# How long launchd takes to bring back a killed synthetic daemon, in seconds.
+SYNTHETIC_RESPAWN_DELAY = 3.0
+
+# Total memory of the synthetic machine, in bytes.
+SYNTHETIC_MEMORY = 64 * 1024 ** 3
+
+
+@dataclass
+class SyntheticProcess:
+    pid: int
+    name: str
+    is_simulator: bool
+    start_time: float
+    # CPU% the process uses while running.
+    cpu_rate: float
+    rss: int
+    # Whether launchd brings it back after it's killed.
+    respawns: bool
+    ppid: int = 1
+
+
+class SyntheticProcessSource:
+    """Generates snapshots of `count` made-up processes on a simulated clock.
+
+    Every few hundred processes get a simulated device running an app and
+    its test runner, and a device's worth of the daemons in
+    `SIMULATOR_PROCESSES`; there's one of each of `OS_PROCESSES`. The rest
+    are mostly idle, with a few busy ones.
+    """
+
+    def __init__(self, count: int, seed=0, respawn_delay=SYNTHETIC_RESPAWN_DELAY):
+        self.random = random.Random(seed)
+        self.respawn_delay = respawn_delay
+        self.now = 0.0
+        self._next_pid = 100
+        self.processes: dict[int, SyntheticProcess] = {}
+        self._respawning: list[tuple[float, SyntheticProcess]] = []
+
+        extensions = f"{SYNTHETIC_RUNTIME_ROOT}/System/Library/ExtensionKit/Extensions"
+        unwanted = [(name, False, 1) for name in sorted(OS_PROCESSES)]
+        apps = []
+        for device_index in range(max(1, count // 250)):
+            # Each device's daemons are children of its launchd_sim, which
+            # isn't simulated itself; PIDs below 100 are never used otherwise.
+            launchd_sim = 10 + device_index
+            unwanted += [(f"{extensions}/{name}.appex/{name}", True, launchd_sim)
+                         for name in sorted(SIMULATOR_PROCESSES)]
+            device = f"{SYNTHETIC_DEVICES}/{self._uuid()}/data/Containers/Bundle/Application"
+            apps += [f"{device}/{self._uuid()}/Bitwarden.app/Bitwarden",
+                     f"{device}/{self._uuid()}/BitwardenTests-Runner.app/BitwardenTests-Runner"]
+        # Everything starts up to an hour before the replay.
+        for name, is_simulator, ppid in unwanted[:count]:
+            self._spawn(name, is_simulator, self.random.uniform(30, 100), respawns=True,
+                        age=self.random.uniform(0, 3600), ppid=ppid)
+        for name in apps[:count - len(self.processes)]:
+            self._spawn(name, False, self.random.uniform(5, 100), respawns=False, age=self.random.uniform(0, 600))
+        for i in range(count - len(self.processes)):
+            is_simulator = self.random.random() < 0.5
+            if is_simulator:
+                name = f"{SYNTHETIC_RUNTIME_ROOT}/usr/libexec/simdaemon{i}"
+            else:
+                name = f"/usr/libexec/daemon{i}"
+            busy = self.random.random()
+            cpu_rate = (self.random.uniform(50, 100) if busy < 0.02 else
+                        self.random.uniform(1, 20) if busy < 0.1 else self.random.uniform(0, 1))
+            self._spawn(name, is_simulator, cpu_rate, respawns=False, age=self.random.uniform(0, 3600))
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.random.getrandbits(128))).upper()
+
+    def _spawn(self, name, is_simulator, cpu_rate, respawns, age=0.0, ppid=1) -> None:
+        pid = self._next_pid
+        self._next_pid += 1
+        rss = self.random.randint(1, 64) * 1024 * 1024
+        self.processes[pid] = SyntheticProcess(pid, name, is_simulator, self.now - age, cpu_rate, rss, respawns,
+                                               ppid)
+
+    def kill(self, pid: int) -> None:
+        process = self.processes.pop(pid, None)
+        if process is not None and process.respawns:
+            self._respawning.append((self.now + self.respawn_delay, process))
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+        due = [process for time, process in self._respawning if time <= self.now]
+        self._respawning = [(time, process) for time, process in self._respawning if time > self.now]
+        for process in due:
+            self._spawn(process.name, process.is_simulator, process.cpu_rate, respawns=True, ppid=process.ppid)
+
+    def snapshot(self) -> Snapshot:
+        processes = []
+        for s in self.processes.values():
+            cpu_time = (self.now - s.start_time) * s.cpu_rate / 100
+            processes.append(ProcessInfo(
+                pid=s.pid,
+                cpu_percent=round(s.cpu_rate, 1),
+                memory_percent=round(s.rss / SYNTHETIC_MEMORY * 100, 1),
+                name=s.name,
+                is_simulator=s.is_simulator,
+                cpu_time=cpu_time,
+                rss=s.rss,
+                start_time=SYNTHETIC_EPOCH + s.start_time,
+                ppid=s.ppid,
+            ))
+        load = sum(s.cpu_rate for s in self.processes.values()) / 100
+        return Snapshot(SYNTHETIC_EPOCH + self.now, self.now, load, processes)
+
+
+@dataclass
+class CycleCost:
+    processes: int
+    # Seconds spent in `Policy.evaluate`, and in the whole cycle.
+    policy: float
+    cycle: float
+
+
+class Replay:
+    """Runs snapshots through the same steps as main.py's loop, with a `DryRunKiller`."""
+
+    def __init__(self, policy, window=DEFAULT_WINDOW, escalation="throttle",
+                 respawn_threshold=DEFAULT_RESPAWN_THRESHOLD, min_interval=DEFAULT_MIN_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL, on_kill=None):
+        self.policy = policy
+        self.killer = DryRunKiller(on_kill)
+        self.sampler = ProcessSampler(window)
+        self.throttler = Throttler(self.killer.send_signal)
+        self.tracker = RespawnTracker(escalation, respawn_threshold, poll_interval=DEFAULT_BASE_INTERVAL)
+        self.load = 0.0
+        self.scheduler = AdaptiveScheduler(min(min_interval, DEFAULT_BASE_INTERVAL), DEFAULT_BASE_INTERVAL,
+                                           max(max_interval, DEFAULT_BASE_INTERVAL), read_load=lambda: self.load)
+        self.interval = DEFAULT_BASE_INTERVAL
+        self.now = 0.0
+        self.decisions: Counter[tuple[str, str, str]] = Counter()
+        self.costs: list[CycleCost] = []
+
+    def step(self, snapshot: Snapshot) -> list[str]:
+        """Replay one snapshot, returning the lines main.py would log."""
+        now = self.now = snapshot.monotonic
+        self.load = snapshot.load
+        self.throttler.tick(now)
+        start = time.perf_counter()
+        processes = sort_processes(self.sampler.update(snapshot.processes, now), ProcessSort.CPU)
+        devices = group_by_device(processes)
+        self.throttler.update(processes)
+        output = self.tracker.observe(processes, now)
+        policy_start = time.perf_counter()
+        decisions = self.policy.evaluate(processes, devices)
+        policy_cost = time.perf_counter() - policy_start
+        rules = {d.process.key: d.rule.name for d in decisions}
+        actions, events = act(decisions, self.throttler, self.tracker, now, self.killer)
+        output.extend(actions)
+        self.interval = self.scheduler.next_interval(processes, len(events))
+        format_processes(processes, 10)
+        format_devices(devices[:10])
+        self.costs.append(CycleCost(len(processes), policy_cost, time.perf_counter() - start))
+        # Escalated kills keep the rule that picked them.
+        self.decisions.update((action.value, rules.get(p.key, "-"), p.name) for action, p in events)
+        self.decisions.update((d.action.value, d.rule.name, d.process.name) for d in decisions if d.action == Action.LOG)
+        return output
+
+    def finish(self) -> list[str]:
+        """Continue throttled processes, as main.py does on exit, returning the lines it would log."""
+        released = self.throttler.release_all()
+        return [f"🤠 pyeetd: Continued {len(released)} throttled processes."] if released else []
+
+
+def _milliseconds(seconds: list[float]) -> str:
+    p95 = statistics.quantiles(seconds, n=20, method="inclusive")[18] if len(seconds) > 1 else seconds[0]
+    return f"{statistics.mean(seconds) * 1000:.2f}\t{p95 * 1000:.2f}\t{max(seconds) * 1000:.2f}"
+
+
+def format_costs(replay: Replay) -> str:
+    lines = ["Processes\tCycles\tPolicy ms (mean/p95/max)\tCycle ms (mean/p95/max)"]
+    lines.append(f"{round(statistics.mean(c.processes for c in replay.costs))}\t{len(replay.costs)}"
+                 f"\t{_milliseconds([c.policy for c in replay.costs])}"
+                 f"\t{_milliseconds([c.cycle for c in replay.costs])}")
+    return "\n".join(lines)
+
+
+def format_decisions(replay: Replay, limit=20) -> str:
+    if not replay.decisions:
+        return "No decisions."
+    lines = ["Count\tAction\tRule\tName"]
+    for (action, rule, name), count in replay.decisions.most_common(limit):
+        lines.append(f"{count}\t{action}\t{rule}\t{short_name(name)}")
+    return "\n".join(lines)
+
+
+def report(title: str, replay: Replay) -> None:
+    print("================================")
+    print(f"📼 {title}")
+    print(format_costs(replay))
+    print("--------------------------------")
+    print(format_decisions(replay))
+    if replay.tracker.stats:
+        print("--------------------------------")
+        print("\n".join(replay.tracker.table(replay.now)))
+    print("================================")
+
+
+def log(snapshot: Snapshot, output: list[str]) -> None:
+    if output:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(snapshot.time))
+        print("\n".join(f"{stamp} {line}" for line in output))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay process snapshots through a pyeetd policy.")
+    parser.add_argument("recording", nargs="?", help="A recording made with main.py --record.")
+    parser.add_argument("--synthetic", type=int, nargs="+", metavar="N",
+                        help="Replay generated snapshots of N processes each instead of a recording.")
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES,
+                        help=f"Synthetic snapshots per size (default: {DEFAULT_CYCLES}).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic snapshots (default: 0).")
+    parser.add_argument("--policy", metavar="PATH",
+                        help="JSON or TOML policy file (default: the built-in kill lists).")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, metavar="SECONDS")
+    parser.add_argument("--escalation", choices=ESCALATIONS, default="throttle")
+    parser.add_argument("--respawn-threshold", type=float, default=DEFAULT_RESPAWN_THRESHOLD, metavar="SECONDS")
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL, metavar="SECONDS")
+    parser.add_argument("--max-interval", type=float, default=DEFAULT_MAX_INTERVAL, metavar="SECONDS")
+    parser.add_argument("--verbose", action="store_true", help="Print what would be done.")
+    args = parser.parse_args()
+    if (args.recording is None) == (args.synthetic is None):
+        parser.error("give either a recording or --synthetic")
+    return args
+
+
+def main():
+    args = parse_args()
+    try:
+        policy = load_policy(args.policy) if args.policy else default_policy()
+    except (OSError, PolicyError) as e:
+        raise SystemExit(f"📼 pyeetd replay: Invalid policy - {e}")
+
+    def create_replay(on_kill=None):
+        return Replay(policy, args.window, args.escalation, args.respawn_threshold,
+                      args.min_interval, args.max_interval, on_kill)
+
+    if args.recording is not None:
+        replay = create_replay()
+        try:
+            for snapshot in read_snapshots(args.recording):
+                output = replay.step(snapshot)
+                if args.verbose:
+                    log(snapshot, output)
+        except (OSError, KeyError, TypeError) as e:
+            raise SystemExit(f"📼 pyeetd replay: Can't read {args.recording} - {e}")
+        if not replay.costs:
+            raise SystemExit(f"📼 pyeetd replay: No snapshots in {args.recording}")
+        output = replay.finish()
+        if args.verbose:
+            log(snapshot, output)
+        report(f"Replayed {args.recording}", replay)
+        return
+
+    for count in args.synthetic:
+        source = SyntheticProcessSource(count, args.seed)
+        replay = create_replay(source.kill)
+        for _ in range(args.cycles):
+            snapshot = source.snapshot()
+            output = replay.step(snapshot)
+            if args.verbose:
+                log(snapshot, output)
+            source.advance(replay.interval)
+        output = replay.finish()
+        if args.verbose:
+            log(snapshot, output)
+        report(f"{count} synthetic processes, {source.now:.0f}s simulated", replay)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Respawn tracking and kill-rate accounting for pyeetd.
+
+launchd restarts many of the daemons pyeetd kills, often within seconds, and
+each restart costs CPU. `RespawnTracker` keeps per-name bookkeeping of how
+often a name is killed, how quickly it comes back and roughly how much CPU
+the kills saved, and escalates names that keep respawning quickly: either to
+throttling, which keeps the process alive but starved, or to killing with an
+exponential backoff between kills, capped at `MAX_BACKOFF`. A name that
+then stays down longer than the respawn threshold is de-escalated.
+
+Reclaimed CPU is estimated per kill as the killed process's windowed CPU rate
+times how long the name stayed gone, minus the CPU the replacement used
+starting up (its CPU time when first seen). It goes negative when killing a
+name costs more than it saves.
+
+Every kill waits for its own respawn. Kills are tracked per instance of a
+name: its simulator device where the path shows one, otherwise its parent,
+which for a runtime's daemons is the launchd_sim of the simulator they run
+in. A process that wasn't in the previous snapshot takes the oldest
+outstanding kill of its instance, so several simulators killing the same
+daemon count one respawn per kill, and a name escalates when one instance
+keeps respawning rather than when several respawn once each.
+"""
+
+import statistics
+from collections import deque
+from dataclasses import dataclass, field, replace
+
+from policy import Action, Decision
+from process_source import ProcessInfo
+
+ESCALATIONS = ("throttle", "backoff", "none")
+
+# A respawn within this many seconds of the kill counts as a fast respawn.
+DEFAULT_RESPAWN_THRESHOLD = 30.0
+
+# How many fast respawns of one instance in a row escalate a name.
+DEFAULT_ESCALATE_AFTER = 3
+
+# The longest wait between kills of a name under backoff escalation, in seconds.
+MAX_BACKOFF = 600.0
+
+# How many respawn times to keep per name.
+RESPAWN_HISTORY = 32
+
+
+@dataclass
+class PendingKill:
+    time: float
+    cpu_rate: float
+
+
+@dataclass
+class NameStats:
+    name: str
+    kills: int = 0
+    respawns: int = 0
+    reclaimed_cpu_seconds: float = 0.0
+    respawn_times: deque[float] = field(default_factory=lambda: deque(maxlen=RESPAWN_HISTORY))
+    escalated: bool = False
+    # For backoff escalation: when the name may next be killed, and how long
+    # the wait after that kill will be.
+    next_kill_time: float = 0.0
+    backoff: float = 0.0
+
+    @property
+    def median_respawn_time(self) -> float | None:
+        return statistics.median(self.respawn_times) if self.respawn_times else None
+
+
+def _instance(p: ProcessInfo) -> tuple[str, str | int]:
+    return (p.name, p.device or p.ppid)
+
+
+class RespawnTracker:
+    """Tracks kills per process name and escalates names that respawn too fast."""
+
+    def __init__(self, escalation="throttle", respawn_threshold=DEFAULT_RESPAWN_THRESHOLD,
+                 escalate_after=DEFAULT_ESCALATE_AFTER, poll_interval=5.0):
+        if escalation not in ESCALATIONS:
+            raise ValueError(f"Unknown escalation: {escalation}")
+        self.escalation = escalation
+        self.respawn_threshold = respawn_threshold
+        self.escalate_after = escalate_after
+        self.poll_interval = poll_interval
+        self.stats: dict[str, NameStats] = {}
+        # Outstanding kills per instance, oldest first, and each instance's
+        # fast respawns in a row.
+        self._pending: dict[tuple[str, str | int], deque[PendingKill]] = {}
+        self._fast_respawns: dict[tuple[str, str | int], int] = {}
+        self._previous_keys: set[tuple[int, float]] = set()
+
+    def _stats(self, name: str) -> NameStats:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = NameStats(name)
+        return stats
+
+    def observe(self, processes: list[ProcessInfo], now: float) -> list[str]:
+        """Notice respawns of killed names in a new snapshot.
+
+        Returns log lines for names that were escalated or de-escalated as a
+        result.
+        """
+        output = []
+        previous_keys = self._previous_keys
+        self._previous_keys = {p.key for p in processes}
+        if not self._pending:
+            return output
+        for p in processes:
+            if p.key in previous_keys:
+                continue
+            instance = _instance(p)
+            pending_kills = self._pending.get(instance)
+            if pending_kills is None:
+                continue
+            pending = pending_kills.popleft()
+            if not pending_kills:
+                del self._pending[instance]
+            stats = self._stats(p.name)
+            downtime = now - pending.time
+            stats.respawns += 1
+            stats.respawn_times.append(downtime)
+            stats.reclaimed_cpu_seconds += pending.cpu_rate * downtime - p.cpu_time
+            if downtime > self.respawn_threshold:
+                self._fast_respawns.pop(instance, None)
+                if stats.escalated:
+                    stats.escalated = False
+                    stats.next_kill_time = stats.backoff = 0.0
+                    output.append(f"📉 pyeetd: {p.name} stayed down {downtime:.0f}s; killing it again")
+                continue
+            fast_respawns = self._fast_respawns[instance] = self._fast_respawns.get(instance, 0) + 1
+            if self.escalation != "none" and not stats.escalated and fast_respawns >= self.escalate_after:
+                stats.escalated = True
+                stats.backoff = self.poll_interval * 2
+                instead = "throttling" if self.escalation == "throttle" else "backing off"
+                output.append(f"📈 pyeetd: {p.name} respawned {fast_respawns} times within "
+                              f"{self.respawn_threshold:.0f}s; {instead} instead of killing")
+        return output
+
+    def record_kills(self, processes: list[ProcessInfo], now: float) -> None:
+        """Record that `processes` were just killed."""
+        for p in processes:
+            stats = self._stats(p.name)
+            stats.kills += 1
+            if stats.escalated:
+                stats.next_kill_time = now + stats.backoff
+                stats.backoff = min(stats.backoff * 2, MAX_BACKOFF)
+            self._pending.setdefault(_instance(p), deque()).append(
+                PendingKill(now, p.recent_cpu_percent / 100))
+
+    def escalate(self, decisions: list[Decision], now: float) -> list[Decision]:
+        """Replace or drop kill decisions for escalated names."""
+        result = []
+        for d in decisions:
+            stats = self.stats.get(d.process.name)
+            if d.action != Action.KILL or stats is None or not stats.escalated:
+                result.append(d)
+            elif self.escalation == "throttle":
+                result.append(Decision(d.process, replace(d.rule, action=Action.THROTTLE)))
+            elif now >= stats.next_kill_time:
+                result.append(d)
+        return result
+
+    def reclaimed_cpu_seconds(self, now: float) -> float:
+        """Total estimated CPU-seconds reclaimed, counting names still gone up to `now`."""
+        total = sum(stats.reclaimed_cpu_seconds for stats in self.stats.values())
+        total += sum(pending.cpu_rate * (now - pending.time)
+                     for pending_kills in self._pending.values() for pending in pending_kills)
+        return total
+
+    def table(self, now: float, limit=10) -> list[str]:
+        """Lines of a table of the most killed names."""
+        pending_reclaimed: dict[str, float] = {}
+        for (name, _), pending_kills in self._pending.items():
+            pending_reclaimed[name] = pending_reclaimed.get(name, 0.0) + sum(
+                pending.cpu_rate * (now - pending.time) for pending in pending_kills)
+        output = ["Kills\tRespawns\tMedianRespawn\tReclaimedCPU\tEscalated\tName"]
+        for stats in sorted(self.stats.values(), key=lambda s: s.kills, reverse=True)[:limit]:
+            reclaimed = stats.reclaimed_cpu_seconds + pending_reclaimed.get(stats.name, 0.0)
+            median = "-" if stats.median_respawn_time is None else f"{stats.median_respawn_time:.0f}s"
+            output.append(f"{stats.kills}\t{stats.respawns}\t{median}\t{reclaimed:.1f}s"
+                          f"\t{'yes' if stats.escalated else 'no'}\t{stats.name}")
+        return output
@@ -0,0 +1,86 @@
+"""
+Delta-based CPU and memory sampling for pyeetd.
+
+`ps` reports CPU% as an average over a process's lifetime (or a slowly
+decaying one on macOS), so a daemon that has just started spinning looks idle
+and one that has calmed down still looks hot. `ProcessSampler` keeps the last
+samples of each process's CPU time and resident set size over a window of
+time and derives CPU% and memory growth from the differences between them
+instead. The window is a duration rather than a number of samples, since the
+adaptive scheduler polls anywhere from every second to every half minute, and
+a policy threshold should mean the same whatever the poll interval.
+"""
+
+import time
+from collections import deque
+from typing import NamedTuple
+
+from process_source import ProcessInfo
+
+# How far back CPU% and memory growth are averaged, in seconds.
+DEFAULT_WINDOW = 60.0
+
+
+class Sample(NamedTuple):
+    timestamp: float
+    cpu_time: float
+    rss: int
+
+
+class ProcessSampler:
+    """Keeps the samples of each process from the last `window` seconds.
+
+    Samples older than the window are dropped, except that the last two are
+    always kept, so a poll interval longer than the window still gives a
+    rate. Processes are keyed by PID and start time, so a reused PID starts a
+    fresh history rather than inheriting the previous process's. Histories of
+    processes that are gone are dropped on the next update, so memory is
+    bounded by the number of live processes times the polls in a window.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        if window <= 0:
+            raise ValueError("The sampling window must be longer than zero seconds")
+        self.window = window
+        self.histories: dict[tuple[int, float], deque[Sample]] = {}
+
+    def update(self, processes: list[ProcessInfo], now: float | None = None) -> list[ProcessInfo]:
+        """Record a snapshot and fill in each process's `cpu_now`, `cpu_window` and `rss_rate`.
+
+        `now` defaults to the monotonic clock; replays pass simulated time.
+        Returns `processes` for chaining.
+        """
+        now = time.monotonic() if now is None else now
+        start = now - self.window
+        histories = {}
+        for p in processes:
+            history = self.histories.get(p.key)
+            if history is None:
+                history = deque()
+            history.append(Sample(now, p.cpu_time, p.rss))
+            while len(history) > 2 and history[0].timestamp < start:
+                history.popleft()
+            histories[p.key] = history
+
+            if len(history) < 2:
+                continue
+            previous, first = history[-2], history[0]
+            p.cpu_now = _cpu_percent(previous, history[-1])
+            p.cpu_window = _cpu_percent(first, history[-1])
+            elapsed = now - first.timestamp
+            p.rss_rate = (p.rss - first.rss) / elapsed if elapsed > 0 else 0.0
+        self.histories = histories
+        return processes
+
+    def history(self, p: ProcessInfo) -> list[Sample]:
+        """The samples currently held for a process, oldest first."""
+        return list(self.histories.get(p.key, ()))
+
+
+def _cpu_percent(start: Sample, end: Sample) -> float:
+    elapsed = end.timestamp - start.timestamp
+    if elapsed <= 0:
+        return 0.0
+    # CPU time can only go backwards if the source rounds differently
+    # between samples; never report negative usage.
+    return max(end.cpu_time - start.cpu_time, 0.0) / elapsed * 100
@@ -0,0 +1,76 @@
+"""
+Adaptive polling for pyeetd.
+
+Polling every few seconds is wasted work on an idle runner and too slow while
+simulators are booting and spawning the daemons pyeetd is after.
+`AdaptiveScheduler` picks the delay before the next poll from how busy the
+machine is and whether the last polls had to act on anything:
+
+- busy (load or CPU use at or above `busy_load` per CPU) or recently acted:
+  poll every `min_interval` seconds;
+- quiet (below `quiet_load` per CPU, nothing acted on for `quiet_polls`
+  polls): back off by `backoff` per poll, up to `max_interval`;
+- otherwise: poll every `base_interval` seconds.
+"""
+
+import os
+
+from process_source import ProcessInfo
+
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_BASE_INTERVAL = 5.0
+DEFAULT_MAX_INTERVAL = 30.0
+
+
+def read_load_average() -> float:
+    """The one-minute load average, from `os.getloadavg` or `/proc/loadavg`."""
+    try:
+        return os.getloadavg()[0]
+    except OSError:
+        with open("/proc/loadavg") as f:
+            return float(f.read().split()[0])
+
+
+class AdaptiveScheduler:
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, base_interval=DEFAULT_BASE_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL, busy_load=0.9, quiet_load=0.3, quiet_polls=6,
+                 backoff=1.5, cpu_count=None, read_load=read_load_average):
+        if not 0 < min_interval <= base_interval <= max_interval:
+            raise ValueError("Intervals must satisfy 0 < min <= base <= max")
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.busy_load = busy_load
+        self.quiet_load = quiet_load
+        self.quiet_polls = quiet_polls
+        self.backoff = backoff
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.read_load = read_load
+        self.interval = base_interval
+        self.polls_since_action = 0
+        self.load = 0.0
+
+    def pressure(self, processes: list[ProcessInfo]) -> float:
+        """How busy the machine is per CPU.
+
+        The load average lags by up to a minute, so the CPU use summed over
+        the last poll is taken into account too; whichever is higher wins.
+        """
+        try:
+            self.load = self.read_load()
+        except OSError:
+            self.load = 0.0
+        cpu_now = sum(p.cpu_now for p in processes if p.cpu_now is not None) / 100
+        return max(self.load, cpu_now) / self.cpu_count
+
+    def next_interval(self, processes: list[ProcessInfo], acted_on: int) -> float:
+        """Decide how long to wait before the next poll."""
+        self.polls_since_action = 0 if acted_on else self.polls_since_action + 1
+        pressure = self.pressure(processes)
+        if acted_on or pressure >= self.busy_load:
+            self.interval = self.min_interval
+        elif pressure < self.quiet_load and self.polls_since_action >= self.quiet_polls:
+            self.interval = min(max(self.interval, self.base_interval) * self.backoff, self.max_interval)
+        else:
+            self.interval = self.base_interval
+        return self.interval
@@ -0,0 +1,199 @@
+"""
+End-of-run summary for pyeetd.
+
+`RunSummary` aggregates every poll as it happens: peak and mean load, the
+CPU time each process name used while pyeetd watched, each name's peak and
+mean resident set, and what pyeetd did to which names. On exit the report
+is printed and can also be written as JSON or Markdown, e.g. to
+`$GITHUB_STEP_SUMMARY`, to tell at a glance whether a slow run was down to a
+contended runner.
+
+Under `main.py run`, the report also has a `command` section with the exit
+status and usage of the command pyeetd ran; see supervisor.py.
+
+Memory is bounded by the number of distinct process names plus the number of
+live processes, not by the length of the run.
+"""
+
+import json
+import os
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from process_source import ProcessInfo
+
+# How many names each table in the report lists.
+DEFAULT_TOP = 10
+
+
+@dataclass
+class NameUsage:
+    cpu_seconds: float = 0.0
+    peak_rss: int = 0
+    rss_total: int = 0
+    samples: int = 0
+
+
+class RunSummary:
+    def __init__(self, start_time: float, now: float):
+        # Wall-clock start, for the report, and monotonic start, for durations.
+        self.start_time = start_time
+        self.start = now
+        self.polls = 0
+        self.load_total = 0.0
+        self.peak_load = 0.0
+        self.peak_load_time = start_time
+        self.usage: dict[str, NameUsage] = defaultdict(NameUsage)
+        self.actions: Counter[tuple[str, str]] = Counter()
+        # CPU time of each live process when first and last seen.
+        self._cpu_times: dict[tuple[int, float], tuple[str, float, float]] = {}
+
+    def update(self, processes: list[ProcessInfo], load: float, events, wall_time: float) -> None:
+        """Add a poll. `events` are `(Action, ProcessInfo)` pairs for what pyeetd did."""
+        self.polls += 1
+        self.load_total += load
+        if load > self.peak_load:
+            self.peak_load = load
+            self.peak_load_time = wall_time
+
+        cpu_times = {}
+        for p in processes:
+            previous = self._cpu_times.pop(p.key, None)
+            first = p.cpu_time if previous is None else previous[1]
+            cpu_times[p.key] = (p.name, first, p.cpu_time)
+            usage = self.usage[p.name]
+            usage.peak_rss = max(usage.peak_rss, p.rss)
+            usage.rss_total += p.rss
+            usage.samples += 1
+        # Whatever is left has exited; bank the CPU time it used.
+        for name, first, last in self._cpu_times.values():
+            self.usage[name].cpu_seconds += last - first
+        self._cpu_times = cpu_times
+
+        self.actions.update((action.value, p.name) for action, p in events)
+
+    def _cpu_seconds(self) -> dict[str, float]:
+        totals = {name: usage.cpu_seconds for name, usage in self.usage.items()}
+        for name, first, last in self._cpu_times.values():
+            totals[name] += last - first
+        return totals
+
+    def report(self, now: float, reclaimed_cpu_seconds=0.0, top=DEFAULT_TOP) -> dict:
+        """The summary as plain data, ready for JSON."""
+        cpu_seconds = self._cpu_seconds()
+        busiest = sorted(((name, seconds) for name, seconds in cpu_seconds.items() if seconds > 0),
+                         key=lambda item: item[1], reverse=True)[:top]
+        biggest = sorted(((name, usage) for name, usage in self.usage.items() if usage.peak_rss > 0),
+                         key=lambda item: item[1].peak_rss, reverse=True)[:top]
+        actions_by_name = defaultdict(dict)
+        for (action, name), count in self.actions.items():
+            actions_by_name[name][action] = count
+        return {
+            "start_time": self.start_time,
+            "duration_seconds": round(now - self.start, 1),
+            "polls": self.polls,
+            "load": {
+                "mean": round(self.load_total / self.polls, 2) if self.polls else 0.0,
+                "peak": round(self.peak_load, 2),
+                "peak_time": self.peak_load_time,
+            },
+            "top_cpu": [{"name": name, "cpu_seconds": round(seconds, 1)} for name, seconds in busiest],
+            "top_memory": [
+                {"name": name, "peak_rss": usage.peak_rss, "mean_rss": usage.rss_total // usage.samples}
+                for name, usage in biggest
+            ],
+            "actions": [
+                {"name": name, **counts}
+                for name, counts in sorted(actions_by_name.items(), key=lambda item: -sum(item[1].values()))
+            ],
+            "reclaimed_cpu_seconds": round(reclaimed_cpu_seconds, 1),
+        }
+
+
+def short_name(name: str) -> str:
+    """The last component of a process's path, for tables."""
+    return os.path.basename(name.rstrip("/")) or name
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / 1024 / 1024:.0f} MB"
+
+
+def format_text(report: dict) -> str:
+    lines = [
+        "================================",
+        f"📋 pyeetd summary: {report['duration_seconds']:.0f}s, {report['polls']} polls",
+        f"Load: mean {report['load']['mean']}, peak {report['load']['peak']}",
+        f"Reclaimed CPU: {report['reclaimed_cpu_seconds']}s",
+    ]
+    if "command" in report:
+        command = report["command"]
+        lines += [
+            f"🏃 {command['command']}: exit status {command['exit_status']}",
+            f"CPU: {command['cpu_seconds']}s, mean {command['mean_cpu_percent']}%, peak {command['peak_cpu_percent']}%",
+            f"Memory: peak {_megabytes(command['peak_rss'])} in {command['peak_processes']} processes",
+        ]
+    lines += [
+        "⚡️ Most CPU time:",
+        *(f"{item['cpu_seconds']}s\t{short_name(item['name'])}" for item in report["top_cpu"]),
+        "🧠 Largest peak memory:",
+        *(f"{_megabytes(item['peak_rss'])}\t{_megabytes(item['mean_rss'])} mean\t{short_name(item['name'])}"
+          for item in report["top_memory"]),
+    ]
+    if report["actions"]:
+        lines.append("🤠 Acted on:")
+        for item in report["actions"]:
+            counts = ", ".join(f"{action} {count}" for action, count in item.items() if action != "name")
+            lines.append(f"{counts}\t{short_name(item['name'])}")
+    lines.append("================================")
+    return "\n".join(lines)
+
+
+def format_markdown(report: dict) -> str:
+    lines = [
+        "### pyeetd summary",
+        "",
+        f"{report['duration_seconds']:.0f}s, {report['polls']} polls. "
+        f"Load mean **{report['load']['mean']}**, peak **{report['load']['peak']}**. "
+        f"Reclaimed **{report['reclaimed_cpu_seconds']}** CPU-seconds.",
+        "",
+    ]
+    if "command" in report:
+        command = report["command"]
+        lines += [
+            f"`{command['command']}` exited with status **{command['exit_status']}** after using "
+            f"**{command['cpu_seconds']}** CPU-seconds (mean {command['mean_cpu_percent']}%, "
+            f"peak {command['peak_cpu_percent']}%) and at most {_megabytes(command['peak_rss'])} "
+            f"in {command['peak_processes']} processes.",
+            "",
+        ]
+    lines += [
+        "| Process | CPU seconds |",
+        "| --- | ---: |",
+        *(f"| `{short_name(item['name'])}` | {item['cpu_seconds']} |" for item in report["top_cpu"]),
+        "",
+        "| Process | Peak memory | Mean memory |",
+        "| --- | ---: | ---: |",
+        *(f"| `{short_name(item['name'])}` | {_megabytes(item['peak_rss'])} | {_megabytes(item['mean_rss'])} |"
+          for item in report["top_memory"]),
+    ]
+    if report["actions"]:
+        lines += ["", "| Process | Actions |", "| --- | --- |"]
+        for item in report["actions"]:
+            counts = ", ".join(f"{action} {count}" for action, count in item.items() if action != "name")
+            lines.append(f"| `{short_name(item['name'])}` | {counts} |")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(report: dict, path: str) -> None:
+    """Write a report as JSON, or as Markdown if `path` ends in `.md`.
+
+    Markdown is appended, so several reports can share `$GITHUB_STEP_SUMMARY`.
+    """
+    if os.path.splitext(path)[1].lower() == ".md" or path == os.environ.get("GITHUB_STEP_SUMMARY"):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(format_markdown(report))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
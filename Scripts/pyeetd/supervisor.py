@@ -0,0 +1,145 @@
+"""
+Running a command under pyeetd.
+
+`main.py run -- COMMAND...` starts COMMAND, watches processes for as long as
+it runs, and exits with its status, so pyeetd can't outlive the step it
+protects and its data covers exactly that step. `Supervisor` starts the
+command in its own process group and forwards the signals pyeetd gets to the
+whole group, as a shell would. `TreeUsage` follows the CPU and memory used by
+the command and everything it started, as found through parent PIDs.
+"""
+
+import os
+import shlex
+import signal
+import subprocess
+import threading
+
+from process_source import ProcessInfo
+
+# Signals passed on to the command rather than handled by pyeetd.
+FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGHUP, signal.SIGQUIT)
+
+# How long to wait for the command to exit if pyeetd has to stop it, in seconds.
+STOP_TIMEOUT = 10.0
+
+
+class Supervisor:
+    def __init__(self, command: list[str]):
+        self.command = command
+        self.process: subprocess.Popen | None = None
+        # Set once the command has exited.
+        self.exited = threading.Event()
+        # The command's resource usage, including every descendant it waited
+        # for, once it has exited.
+        self.rusage = None
+
+    def start(self) -> None:
+        """Start the command; raises OSError if it can't be run."""
+        self.process = subprocess.Popen(self.command, start_new_session=True)
+        # Wait on a thread so the main loop can sleep on `exited`, waking as
+        # soon as the command exits instead of polling for it.
+        threading.Thread(target=self._wait, name="pyeetd-supervisor", daemon=True).start()
+
+    def _wait(self) -> None:
+        # wait4 rather than Popen.wait, for the exited command's rusage.
+        _, status, self.rusage = os.wait4(self.process.pid, 0)
+        self.process.returncode = os.waitstatus_to_exitcode(status)
+        self.exited.set()
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def forward(self, signum, frame) -> None:
+        """Signal handler passing the signal on to the command's process group."""
+        if self.process is None or self.exited.is_set():
+            return
+        try:
+            os.killpg(self.process.pid, signum)
+        except OSError:
+            pass  # Already gone.
+
+    def stop(self) -> None:
+        """Terminate the command if it's still running, for when pyeetd itself fails."""
+        if self.process is None or self.exited.is_set():
+            return
+        self.forward(signal.SIGTERM, None)
+        if not self.exited.wait(STOP_TIMEOUT):
+            self.forward(signal.SIGKILL, None)
+            self.exited.wait()
+
+    @property
+    def exit_status(self) -> int:
+        """The command's exit status as a shell reports it: 128 plus the signal if it was killed."""
+        returncode = self.process.returncode
+        return 128 - returncode if returncode < 0 else returncode
+
+    def tree(self, processes: list[ProcessInfo]) -> list[ProcessInfo]:
+        """The command and all its running descendants."""
+        children: dict[int, list[ProcessInfo]] = {}
+        root = None
+        for p in processes:
+            children.setdefault(p.ppid, []).append(p)
+            if p.pid == self.pid:
+                root = p
+        if root is None:
+            return []
+        tree = [root]
+        for p in tree:
+            tree.extend(children.get(p.pid, ()))
+        return tree
+
+
+class TreeUsage:
+    """CPU and memory used by a process tree over time.
+
+    Every process in the tree started after the command did, so each one's
+    whole CPU time counts, up to when it was last seen. Children that start
+    and exit between two polls are missed, but once the command has exited
+    its rusage counts every descendant it waited for, and the report uses
+    whichever total is higher.
+    """
+
+    def __init__(self):
+        self.polls = 0
+        self.process_count = 0
+        self.peak_process_count = 0
+        self.cpu_percent = 0.0
+        self.cpu_percent_total = 0.0
+        self.peak_cpu_percent = 0.0
+        self.rss = 0
+        self.peak_rss = 0
+        self.cpu_seconds = 0.0
+        # CPU time of each live process when last seen.
+        self._cpu_times: dict[tuple[int, float], float] = {}
+
+    def update(self, tree: list[ProcessInfo]) -> None:
+        self.polls += 1
+        self.process_count = len(tree)
+        self.peak_process_count = max(self.peak_process_count, self.process_count)
+        self.cpu_percent = sum(p.cpu_now for p in tree if p.cpu_now is not None)
+        self.cpu_percent_total += self.cpu_percent
+        self.peak_cpu_percent = max(self.peak_cpu_percent, self.cpu_percent)
+        self.rss = sum(p.rss for p in tree)
+        self.peak_rss = max(self.peak_rss, self.rss)
+
+        cpu_times = {p.key: p.cpu_time for p in tree}
+        # Whatever is gone has exited; bank the CPU time it used.
+        self.cpu_seconds += sum(cpu_time for key, cpu_time in self._cpu_times.items() if key not in cpu_times)
+        self._cpu_times = cpu_times
+
+    def report(self, command: list[str], exit_status: int | None, rusage=None) -> dict:
+        """The command's usage as plain data, ready for JSON."""
+        cpu_seconds = self.cpu_seconds + sum(self._cpu_times.values())
+        if rusage is not None:
+            cpu_seconds = max(cpu_seconds, rusage.ru_utime + rusage.ru_stime)
+        return {
+            "command": shlex.join(command),
+            "exit_status": exit_status,
+            "cpu_seconds": round(cpu_seconds, 1),
+            "mean_cpu_percent": round(self.cpu_percent_total / self.polls, 1) if self.polls else 0.0,
+            "peak_cpu_percent": round(self.peak_cpu_percent, 1),
+            "peak_rss": self.peak_rss,
+            "peak_processes": self.peak_process_count,
+        }
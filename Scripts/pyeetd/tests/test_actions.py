@@ -0,0 +1,56 @@
+"""Tests for the actions module."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from actions import DryRunKiller, yeet
+from process_source import ProcessInfo
+
+
+def process(pid):
+    return ProcessInfo(pid=pid, cpu_percent=0.0, memory_percent=0.0, name="daemon", is_simulator=False)
+
+
+class ForbiddenKiller(DryRunKiller):
+    """A killer that may not signal anything itself."""
+
+    def __init__(self, sudo_error=None):
+        super().__init__()
+        self.sudo_error = sudo_error
+        self.sudo_pids = []
+
+    def kill_group(self, pid):
+        raise PermissionError("Operation not permitted")
+
+    def sudo_kill(self, pids):
+        self.sudo_pids.append(pids)
+        return self.sudo_error
+
+
+class TestYeet(unittest.TestCase):
+    """Only processes actually killed are reported killed."""
+
+    def test_kills_every_process(self):
+        killer = DryRunKiller()
+        _, killed = yeet([process(1), process(2)], killer)
+        self.assertEqual([p.pid for p in killed], [1, 2])
+        self.assertEqual([call[1] for call in killer.calls], [1, 2])
+
+    def test_sudo_kills_the_batch_at_once(self):
+        killer = ForbiddenKiller()
+        _, killed = yeet([process(1), process(2)], killer)
+        self.assertEqual(killer.sudo_pids, [[1, 2]])
+        self.assertEqual([p.pid for p in killed], [1, 2])
+
+    def test_failed_sudo_kill_kills_nothing(self):
+        killer = ForbiddenKiller(sudo_error="sudo: a password is required")
+        output, killed = yeet([process(1), process(2)], killer)
+        self.assertEqual(killed, [])
+        self.assertIn("😪 pyeetd: sudo kill failed - sudo: a password is required", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the devices module and simulator path parsing."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from devices import group_by_device, noisiest_device
+from process_source import ProcessInfo, parse_simulator_path
+
+UDID = "0A1B2C3D-4E5F-6789-ABCD-EF0123456789"
+OTHER_UDID = "11111111-2222-3333-4444-555555555555"
+DEVICES = "/Users/runner/Library/Developer/CoreSimulator/Devices"
+XCTEST_DEVICES = "/Users/runner/Library/Developer/XCTestDevices"
+RUNTIME_ROOT = ("/Library/Developer/CoreSimulator/Profiles/Runtimes/iOS 18.0.simruntime"
+                "/Contents/Resources/RuntimeRoot")
+
+
+def app_path(udid, devices=DEVICES):
+    return f"{devices}/{udid}/data/Containers/Bundle/Application/X/Bitwarden.app/Bitwarden"
+
+
+def process(pid, name, cpu_window=0.0, cpu_now=None, rss=0, memory_percent=0.0):
+    return ProcessInfo(pid=pid, cpu_percent=0.0, memory_percent=memory_percent, name=name, is_simulator=True,
+                       rss=rss, cpu_now=cpu_now, cpu_window=cpu_window)
+
+
+class TestParseSimulatorPath(unittest.TestCase):
+    """Device UDIDs and runtimes come from a process's path."""
+
+    def test_core_simulator_device(self):
+        self.assertEqual(parse_simulator_path(app_path(UDID)), (UDID, None))
+
+    def test_xctest_device_clone(self):
+        self.assertEqual(parse_simulator_path(app_path(OTHER_UDID, XCTEST_DEVICES)), (OTHER_UDID, None))
+
+    def test_udid_is_uppercased(self):
+        self.assertEqual(parse_simulator_path(app_path(UDID.lower()))[0], UDID)
+
+    def test_runtime_daemon(self):
+        self.assertEqual(parse_simulator_path(f"{RUNTIME_ROOT}/usr/libexec/AegirPoster"), (None, "iOS 18.0"))
+
+    def test_device_inside_a_runtime_path(self):
+        name = f"{RUNTIME_ROOT}/usr/libexec/x --data {DEVICES}/{UDID}/data"
+        self.assertEqual(parse_simulator_path(name), (UDID, "iOS 18.0"))
+
+    def test_malformed_udid_and_plain_processes(self):
+        self.assertEqual(parse_simulator_path(f"{DEVICES}/not-a-udid/data/app"), (None, None))
+        self.assertEqual(parse_simulator_path(f"{DEVICES}/{UDID}"), (None, None))
+        self.assertEqual(parse_simulator_path("/sbin/launchd"), (None, None))
+
+
+class TestGroupByDevice(unittest.TestCase):
+    """Simulator processes are added up per device and runtime, busiest first."""
+
+    def setUp(self):
+        self.groups = group_by_device([
+            process(1, app_path(UDID), cpu_window=10.0, cpu_now=20.0, rss=100, memory_percent=1.0),
+            process(2, app_path(UDID), cpu_window=5.0, rss=50, memory_percent=0.5),
+            process(3, app_path(OTHER_UDID, XCTEST_DEVICES), cpu_window=40.0, cpu_now=30.0, rss=10),
+            process(4, f"{RUNTIME_ROOT}/usr/libexec/AegirPoster", cpu_window=25.0),
+            process(5, "/sbin/launchd", cpu_window=99.0),
+        ])
+
+    def test_groups_in_cpu_order(self):
+        self.assertEqual([(g.device, g.runtime) for g in self.groups],
+                         [(OTHER_UDID, None), (None, "iOS 18.0"), (UDID, None)])
+
+    def test_totals(self):
+        group = self.groups[2]
+        self.assertEqual(group.process_count, 2)
+        self.assertEqual(group.cpu_percent, 20.0)
+        self.assertEqual(group.avg_cpu_percent, 15.0)
+        self.assertEqual(group.memory_percent, 1.5)
+        self.assertEqual(group.rss, 150)
+
+    def test_labels(self):
+        self.assertEqual([g.label for g in self.groups], ["11111111", "shared (iOS 18.0)", "0A1B2C3D"])
+
+    def test_no_simulator_processes(self):
+        self.assertEqual(group_by_device([process(1, "/sbin/launchd")]), [])
+
+
+class TestNoisiestDevice(unittest.TestCase):
+    """The noisiest device is only picked among two or more devices."""
+
+    def test_busiest_device_over_the_window(self):
+        groups = group_by_device([
+            process(1, app_path(UDID), cpu_window=30.0, cpu_now=90.0),
+            process(2, app_path(OTHER_UDID), cpu_window=40.0, cpu_now=1.0),
+        ])
+        self.assertEqual(noisiest_device(groups), OTHER_UDID)
+
+    def test_shared_runtime_daemons_are_not_devices(self):
+        groups = group_by_device([
+            process(1, app_path(UDID), cpu_window=30.0),
+            process(2, app_path(OTHER_UDID), cpu_window=20.0),
+            process(3, f"{RUNTIME_ROOT}/usr/libexec/AegirPoster", cpu_window=90.0),
+        ])
+        self.assertEqual(noisiest_device(groups), UDID)
+
+    def test_single_device_is_not_noisiest(self):
+        groups = group_by_device([
+            process(1, app_path(UDID), cpu_window=30.0),
+            process(2, f"{RUNTIME_ROOT}/usr/libexec/AegirPoster", cpu_window=90.0),
+        ])
+        self.assertIsNone(noisiest_device(groups))
+
+
+if __name__ == "__main__":
+    unittest.main()
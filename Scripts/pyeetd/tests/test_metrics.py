@@ -0,0 +1,83 @@
+"""Tests for the metrics module."""
+
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from metrics import JsonlExporter, MetricsRecord, MetricsRecorder, PrometheusExporter, ProcessRecord
+
+
+def record(*top):
+    return MetricsRecord(time=1.0, load=2.0, interval=5.0, process_count=len(top), total_cpu_percent=0.0,
+                         top=list(top))
+
+
+class TestPrometheusExporter(unittest.TestCase):
+    """The textfile is readable by the collector and has bounded series."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "pyeetd.prom")
+
+    def _write(self, *top) -> str:
+        exporter = PrometheusExporter(self.path)
+        exporter.add(record(*top))
+        exporter.flush()
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_file_is_readable_by_everyone(self):
+        self._write()
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o644)
+
+    def test_processes_are_summed_by_name(self):
+        content = self._write(
+            ProcessRecord(1, "AegirPoster", "Simulator", 30.0, 30.0, 0.1, 1000),
+            ProcessRecord(2, "AegirPoster", "Simulator", 20.0, 20.0, 0.1, 2000),
+            ProcessRecord(3, "launchd", "OS", None, None, 0.1, 500),
+        )
+        self.assertNotIn("pid=", content)
+        self.assertIn('pyeetd_process_cpu_percent{name="AegirPoster"} 50.0\n', content)
+        self.assertIn('pyeetd_process_rss_bytes{name="AegirPoster"} 3000\n', content)
+        self.assertIn('pyeetd_process_rss_bytes{name="launchd"} 500\n', content)
+        self.assertNotIn('pyeetd_process_cpu_percent{name="launchd"}', content)
+
+    def test_leaves_no_temporary_files(self):
+        self._write()
+        self.assertEqual(os.listdir(self.dir.name), ["pyeetd.prom"])
+
+
+class TestMetricsRecorder(unittest.TestCase):
+    """A failing exporter is reported once and dropped; the others carry on."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "pyeetd.jsonl")
+        self.broken = JsonlExporter(os.path.join(self.dir.name, "missing", "pyeetd.jsonl"))
+        self.recorder = MetricsRecorder([self.broken, JsonlExporter(self.path)], flush_interval=10.0)
+
+    def test_failed_write_is_reported_once(self):
+        self.assertEqual(self.recorder.record(record(), 0.0), [])
+        [message] = self.recorder.record(record(), 10.0)
+        self.assertIn(f"Failed to write metrics to {self.broken.path}", message)
+        self.assertEqual(self.recorder.record(record(), 20.0), [])
+        self.assertNotIn(self.broken, self.recorder.exporters)
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+    def test_close_reports_instead_of_raising(self):
+        self.recorder.record(record(), 0.0)
+        [message] = self.recorder.close()
+        self.assertIn("Failed to write metrics", message)
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
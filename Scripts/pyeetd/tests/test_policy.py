@@ -0,0 +1,102 @@
+"""Tests for the policy module."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from policy import Action, Policy, PolicyError, Rule, default_policy, parse_policy
+from process_source import ProcessInfo
+
+RUNTIME_ROOT = ("/Library/Developer/CoreSimulator/Profiles/Runtimes/iOS 18.0.simruntime"
+                "/Contents/Resources/RuntimeRoot")
+
+
+def process(name, cpu_window=None, is_simulator=True, rss=0, pid=1):
+    p = ProcessInfo(pid=pid, cpu_percent=0.0, memory_percent=0.0, name=name, is_simulator=is_simulator, rss=rss)
+    p.cpu_window = cpu_window
+    return p
+
+
+class TestCandidates(unittest.TestCase):
+    """Every rule whose patterns occur in a name is a candidate."""
+
+    def test_rules_with_patterns_at_the_same_position_are_all_candidates(self):
+        policy = Policy([
+            Rule("busy-aegir", Action.THROTTLE, ["Aegir"], cpu_percent=50),
+            Rule("posters", Action.KILL, ["AegirPoster"]),
+        ])
+        self.assertEqual(policy.candidates(f"{RUNTIME_ROOT}/AegirPoster"), (0, 1))
+
+    def test_rules_without_patterns_match_every_name(self):
+        policy = Policy([Rule("posters", Action.KILL, ["Poster"]), Rule("everything", Action.LOG)])
+        self.assertEqual(policy.candidates("/usr/libexec/launchd"), (1,))
+
+    def test_patterns_are_literal(self):
+        policy = Policy([Rule("dotted", Action.KILL, ["com.apple.mds"])])
+        self.assertEqual(policy.candidates("comXappleXmds"), ())
+        self.assertEqual(policy.candidates("/usr/libexec/com.apple.mds"), (0,))
+
+
+class TestEvaluate(unittest.TestCase):
+    """Each process gets the action of the first rule it fully matches."""
+
+    def test_later_rule_applies_when_an_overlapping_earlier_one_misses_its_threshold(self):
+        policy = Policy([
+            Rule("busy-aegir", Action.THROTTLE, ["Aegir"], cpu_percent=50),
+            Rule("posters", Action.KILL, ["AegirPoster"]),
+        ])
+        idle = process(f"{RUNTIME_ROOT}/AegirPoster", cpu_window=1.0)
+        [decision] = policy.evaluate([idle])
+        self.assertEqual(decision.rule.name, "posters")
+        self.assertEqual(decision.action, Action.KILL)
+
+    def test_first_matching_rule_wins(self):
+        policy = Policy([
+            Rule("busy-aegir", Action.THROTTLE, ["Aegir"], cpu_percent=50),
+            Rule("posters", Action.KILL, ["AegirPoster"]),
+        ])
+        busy = process(f"{RUNTIME_ROOT}/AegirPoster", cpu_window=90.0)
+        [decision] = policy.evaluate([busy])
+        self.assertEqual(decision.action, Action.THROTTLE)
+
+    def test_cpu_threshold_needs_a_window(self):
+        policy = Policy([Rule("busy", Action.RENICE, cpu_percent=50)])
+        self.assertEqual(policy.evaluate([process("/usr/libexec/busy")]), [])
+        self.assertEqual(len(policy.evaluate([process("/usr/libexec/busy", cpu_window=50.0)])), 1)
+
+    def test_rss_threshold(self):
+        policy = Policy([Rule("big", Action.LOG, rss_mb=1)])
+        small = process("small", rss=1024, pid=1)
+        big = process("big", rss=2 * 1024 * 1024, pid=2)
+        self.assertEqual([d.process for d in policy.evaluate([small, big])], [big])
+
+    def test_environment(self):
+        policy = default_policy()
+        simulator = process(f"{RUNTIME_ROOT}/AegirPoster", is_simulator=True, pid=1)
+        os_process = process("/System/AegirPoster", is_simulator=False, pid=2)
+        self.assertEqual([d.process for d in policy.evaluate([simulator, os_process])], [simulator])
+
+
+class TestParsePolicy(unittest.TestCase):
+    """Policies are validated as they're parsed."""
+
+    def test_rules_keep_their_order(self):
+        policy = parse_policy({"rules": [
+            {"name": "a", "action": "log", "patterns": ["x"]},
+            {"name": "b", "action": "kill"},
+        ]})
+        self.assertEqual([r.name for r in policy.rules], ["a", "b"])
+
+    def test_unknown_action_is_rejected(self):
+        with self.assertRaisesRegex(PolicyError, "a: action must be one of"):
+            parse_policy({"rules": [{"name": "a", "action": "explode"}]})
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaisesRegex(PolicyError, "unknown fields cpu"):
+            parse_policy({"rules": [{"name": "a", "action": "log", "cpu": 5}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Tests for the process_source module."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from process_source import ProcProcessSource, PsProcessSource
+
+RUNTIME_ROOT = ("/Library/Developer/CoreSimulator/Profiles/Runtimes/iOS 18.0.simruntime"
+                "/Contents/Resources/RuntimeRoot")
+BOOT_TIME = 1_700_000_000
+
+
+def stat_line(pid, comm, ppid=1, utime=0, stime=0, start=0, rss=0):
+    """A `/proc/<pid>/stat` line with the fields pyeetd reads; see proc(5)."""
+    return (f"{pid} ({comm}) S {ppid} {pid} {pid} 0 -1 4194560 0 0 0 0 {utime} {stime} 0 0 20 0 1 0 "
+            f"{start} 1000000 {rss} 18446744073709551615 0 0 0\n")
+
+
+class TestProcProcessSource(unittest.TestCase):
+    """Processes are read from a fake `/proc` root."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.root = self.dir.name
+        self._write("meminfo", "MemTotal:        1048576 kB\nMemFree:          524288 kB\n")
+        self._write("stat", f"cpu  1 2 3 4\nintr 0\nbtime {BOOT_TIME}\nprocesses 10\n")
+        self._write("uptime", "50.00 100.00\n")
+        self._write("self/stat", stat_line(1, "python3"))
+
+    def _write(self, relative_path, content):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def _source(self):
+        source = ProcProcessSource(self.root)
+        source.clock_ticks = 100
+        source.page_size = 4096
+        return source
+
+    def _snapshot(self, source=None):
+        return {p.pid: p for p in (source or self._source()).snapshot()}
+
+    def test_is_available(self):
+        self.assertTrue(ProcProcessSource.is_available(self.root))
+        self.assertFalse(ProcProcessSource.is_available(os.path.join(self.root, "missing")))
+
+    def test_reads_stat_fields(self):
+        self._write("42/stat", stat_line(42, "SpringBoard", ppid=7, utime=300, stime=100, start=1000, rss=256))
+        self._write("42/cmdline", f"{RUNTIME_ROOT}/System/Library/CoreServices/SpringBoard.app/SpringBoard\0-x\0")
+        [p] = self._snapshot().values()
+        self.assertEqual(p.pid, 42)
+        self.assertEqual(p.ppid, 7)
+        self.assertEqual(p.name, f"{RUNTIME_ROOT}/System/Library/CoreServices/SpringBoard.app/SpringBoard")
+        self.assertTrue(p.is_simulator)
+        # 400 ticks of CPU over the 40s since it started, 10s after boot.
+        self.assertEqual(p.cpu_time, 4.0)
+        self.assertEqual(p.cpu_percent, 10.0)
+        self.assertEqual(p.start_time, BOOT_TIME + 10.0)
+        self.assertEqual(p.rss, 256 * 4096)
+        self.assertEqual(p.memory_percent, 0.1)
+
+    def test_command_name_with_spaces_and_parentheses(self):
+        self._write("43/stat", stat_line(43, "kworker) (0:1 x", ppid=2, utime=5, start=100, rss=1))
+        p = self._snapshot()[43]
+        # Without a command line, the name falls back to comm.
+        self.assertEqual(p.name, "kworker) (0:1 x")
+        self.assertEqual(p.ppid, 2)
+        self.assertEqual(p.cpu_time, 0.05)
+        self.assertEqual(p.rss, 4096)
+        self.assertFalse(p.is_simulator)
+
+    def test_non_process_entries_are_skipped(self):
+        self._write("44/stat", stat_line(44, "launchd_sim"))
+        os.makedirs(os.path.join(self.root, "45"))  # Exited between listdir and open.
+        self.assertEqual(sorted(self._snapshot()), [44])
+
+    def test_names_are_cached_per_process(self):
+        self._write("46/stat", stat_line(46, "sh", start=100))
+        self._write("46/cmdline", "/bin/sh\0")
+        source = self._source()
+        self.assertEqual(self._snapshot(source)[46].name, "/bin/sh")
+        self._write("46/cmdline", "/bin/bash\0")
+        self.assertEqual(self._snapshot(source)[46].name, "/bin/sh")
+        # A new process with the same PID has a new start time.
+        self._write("46/stat", stat_line(46, "bash", start=200))
+        self.assertEqual(self._snapshot(source)[46].name, "/bin/bash")
+
+    def test_missing_btime_is_an_error(self):
+        self._write("stat", "cpu  1 2 3 4\n")
+        with self.assertRaisesRegex(OSError, "btime"):
+            ProcProcessSource(self.root)
+
+
+PS_OUTPUT = """\
+  PID  PPID  %CPU %MEM    RSS      TIME STARTED                  COMM
+    1     0   0.0  0.1  10240   1:02.50 Mon Oct 19 08:20:27 2026 /sbin/launchd
+  512     1  85.3  1.2 204800 2-03:00:00 Sun Oct 18 23:59:59 2026 {runtime}/usr/libexec/Aegir Poster
+"""
+
+
+class TestPsProcessSource(unittest.TestCase):
+    """Processes are parsed from `ps` output."""
+
+    def _snapshot(self):
+        result = subprocess.CompletedProcess([], 0, stdout=PS_OUTPUT.format(runtime=RUNTIME_ROOT), stderr="")
+        with mock.patch("subprocess.run", return_value=result) as run:
+            processes = PsProcessSource().snapshot()
+        self.assertEqual(run.call_args.kwargs["env"]["LC_ALL"], "C")
+        return processes
+
+    def test_parses_columns(self):
+        launchd, poster = self._snapshot()
+        self.assertEqual((launchd.pid, launchd.ppid, launchd.name), (1, 0, "/sbin/launchd"))
+        self.assertEqual((launchd.cpu_percent, launchd.memory_percent, launchd.rss), (0.0, 0.1, 10240 * 1024))
+        self.assertEqual(poster.name, f"{RUNTIME_ROOT}/usr/libexec/Aegir Poster")
+        self.assertTrue(poster.is_simulator)
+        self.assertEqual(poster.cpu_percent, 85.3)
+
+    def test_parses_lstart(self):
+        launchd, poster = self._snapshot()
+        self.assertEqual(launchd.start_time,
+                         time.mktime(time.strptime("2026-10-19 08:20:27", "%Y-%m-%d %H:%M:%S")))
+        self.assertEqual(poster.start_time,
+                         time.mktime(time.strptime("2026-10-18 23:59:59", "%Y-%m-%d %H:%M:%S")))
+
+    def test_parses_cpu_time(self):
+        launchd, poster = self._snapshot()
+        self.assertEqual(launchd.cpu_time, 62.5)
+        self.assertEqual(poster.cpu_time, 2 * 86400 + 3 * 3600)
+        self.assertEqual(PsProcessSource.parse_cpu_time("01:00:00"), 3600.0)
+        self.assertEqual(PsProcessSource.parse_cpu_time("0:00.01"), 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
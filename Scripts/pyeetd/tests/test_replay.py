@@ -0,0 +1,149 @@
+"""Tests of pyeetd's whole poll cycle, driven through the replay harness."""
+
+import os
+import signal
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from policy import SIMULATOR_PROCESSES, Action, default_policy, parse_policy
+from process_source import ProcessInfo
+from recording import Snapshot
+from replay import Replay, SyntheticProcessSource
+from respawn import DEFAULT_ESCALATE_AFTER
+
+RUNTIME_ROOT = ("/Library/Developer/CoreSimulator/Profiles/Runtimes/iOS 18.0.simruntime"
+                "/Contents/Resources/RuntimeRoot")
+MB = 1024 * 1024
+
+
+def snapshot(now, processes, load=0.0):
+    """A snapshot at `now` of `(pid, name, cpu_rate, rss)` processes, all started at 0."""
+    return Snapshot(now, now, load, [
+        ProcessInfo(pid=pid, cpu_percent=cpu_rate, memory_percent=0.0, name=f"{RUNTIME_ROOT}/{name}",
+                    is_simulator=True, cpu_time=now * cpu_rate / 100, rss=rss)
+        for pid, name, cpu_rate, rss in processes
+    ])
+
+
+class TestPolicyOrder(unittest.TestCase):
+    """Each process gets the first rule whose pattern and thresholds it matches."""
+
+    def setUp(self):
+        self.replay = Replay(parse_policy({"rules": [
+            {"name": "busy-aegir", "patterns": ["Aegir"], "cpu_percent": 50, "action": "throttle"},
+            {"name": "big-posters", "patterns": ["AegirPoster"], "rss_mb": 100, "action": "kill"},
+            {"name": "posters", "patterns": ["Poster"], "action": "log"},
+        ]}))
+        self.processes = [
+            (100, "AegirPoster", 90.0, 10 * MB),
+            (101, "AegirPoster", 1.0, 200 * MB),
+            (102, "CollectionsPoster", 90.0, 10 * MB),
+        ]
+
+    def _decisions(self, now):
+        self.replay.decisions.clear()
+        self.replay.step(snapshot(now, self.processes))
+        return {(action, rule) for action, rule, _ in self.replay.decisions}
+
+    def test_cpu_thresholds_need_two_polls(self):
+        self.assertEqual(self._decisions(0.0), {("kill", "big-posters"), ("log", "posters")})
+
+    def test_later_rules_apply_when_earlier_thresholds_miss(self):
+        self._decisions(0.0)
+        self.assertEqual(self._decisions(5.0),
+                         {("throttle", "busy-aegir"), ("kill", "big-posters"), ("log", "posters")})
+
+    def test_killed_and_throttled_processes(self):
+        self._decisions(0.0)
+        self._decisions(5.0)
+        calls = self.replay.killer.calls
+        self.assertIn(("kill", 101, signal.SIGKILL), calls)
+        self.assertIn(("signal", 100, signal.SIGSTOP), calls)
+        self.assertFalse(any(pid == 102 for _, pid, _ in calls))
+
+
+class TestThrottleRelease(unittest.TestCase):
+    """Every process pyeetd stopped is continued when it exits."""
+
+    def test_finish_continues_stopped_processes(self):
+        replay = Replay(parse_policy({"rules": [
+            {"name": "pause", "patterns": ["AegirPoster"], "action": "stop"},
+            {"name": "throttle", "patterns": ["CollectionsPoster"], "action": "throttle", "cpu_budget": 10},
+        ]}))
+        replay.step(snapshot(0.0, [(100, "AegirPoster", 50.0, 0), (101, "CollectionsPoster", 50.0, 0)]))
+        replay.killer.calls.clear()
+
+        output = replay.finish()
+
+        self.assertEqual(output, ["🤠 pyeetd: Continued 2 throttled processes."])
+        self.assertEqual(sorted(replay.killer.calls),
+                         [("signal", 100, signal.SIGCONT), ("signal", 101, signal.SIGCONT)])
+        self.assertEqual(replay.throttler.throttled, {})
+
+    def test_finish_without_throttling_logs_nothing(self):
+        replay = Replay(default_policy())
+        replay.step(snapshot(0.0, [(100, "launchd_sim", 1.0, 0)]))
+        self.assertEqual(replay.finish(), [])
+
+
+class TestRespawnEscalation(unittest.TestCase):
+    """Daemons that keep respawning in every simulator are throttled instead of killed."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.source = SyntheticProcessSource(1000, seed=0)
+        cls.replay = Replay(default_policy(), on_kill=cls.source.kill)
+        for _ in range(60):
+            cls.replay.step(cls.source.snapshot())
+            cls.source.advance(cls.replay.interval)
+        cls.devices = 1000 // 250
+
+    def _stats(self, name):
+        [stats] = [s for s in self.replay.tracker.stats.values() if s.name.endswith(f"/{name}")]
+        return stats
+
+    def test_every_kill_in_every_simulator_gets_its_respawn(self):
+        for name in SIMULATOR_PROCESSES:
+            stats = self._stats(name)
+            self.assertEqual(stats.respawns, stats.kills, name)
+
+    def test_escalates_after_repeated_fast_respawns(self):
+        for name in SIMULATOR_PROCESSES:
+            stats = self._stats(name)
+            self.assertTrue(stats.escalated, name)
+            self.assertEqual(stats.kills, DEFAULT_ESCALATE_AFTER * self.devices, name)
+
+    def test_escalated_daemons_are_throttled(self):
+        throttled = {name for action, _, name in self.replay.decisions if action == Action.THROTTLE.value}
+        for name in SIMULATOR_PROCESSES:
+            self.assertTrue(any(n.endswith(f"/{name}") for n in throttled), name)
+
+
+class TestSamplingWindow(unittest.TestCase):
+    """The sampling window spans the same time however fast the scheduler polls."""
+
+    def test_idle_polls_back_off_without_stretching_the_window(self):
+        replay = Replay(parse_policy({"rules": []}), window=60)
+        now = 0.0
+        intervals = set()
+        while now < 600:
+            replay.step(snapshot(now, [(100, "AegirPoster", 1.0, 0)]))
+            intervals.add(replay.interval)
+            now += replay.interval
+        self.assertGreater(max(intervals), 5.0)
+        for history in replay.sampler.histories.values():
+            self.assertTrue(len(history) == 2 or history[-1].timestamp - history[0].timestamp <= 60)
+
+    def test_cpu_window_follows_time_not_polls(self):
+        replay = Replay(parse_policy({"rules": []}), window=60)
+        processes = [(100, "AegirPoster", 50.0, 0)]
+        for now in range(0, 121, 1):
+            replay.step(snapshot(float(now), processes, load=100.0))
+        [history] = replay.sampler.histories.values()
+        self.assertAlmostEqual(history[-1].timestamp - history[0].timestamp, 60.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Tests for the respawn module."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from policy import Action, Decision, Rule
+from process_source import ProcessInfo
+from respawn import MAX_BACKOFF, RespawnTracker
+
+NAME = "/usr/libexec/AegirPoster"
+
+
+def process(pid, ppid=1, cpu_time=0.0, name=NAME):
+    return ProcessInfo(pid=pid, cpu_percent=50.0, memory_percent=0.0, name=name, is_simulator=True,
+                       cpu_time=cpu_time, start_time=float(pid), ppid=ppid)
+
+
+class TestRespawnTracker(unittest.TestCase):
+    """Each kill waits for its own respawn, per instance of a name."""
+
+    def test_respawn_is_counted_with_its_downtime(self):
+        tracker = RespawnTracker()
+        killed = process(100)
+        tracker.observe([killed], 0.0)
+        tracker.record_kills([killed], 0.0)
+        tracker.observe([killed], 1.0)
+        self.assertEqual(tracker.stats[NAME].respawns, 0)
+        tracker.observe([process(101)], 4.0)
+        stats = tracker.stats[NAME]
+        self.assertEqual((stats.kills, stats.respawns), (1, 1))
+        self.assertEqual(list(stats.respawn_times), [4.0])
+
+    def test_every_simulator_counts_its_own_respawn(self):
+        tracker = RespawnTracker()
+        killed = [process(100, ppid=10), process(101, ppid=11), process(102, ppid=12)]
+        tracker.observe(killed, 0.0)
+        tracker.record_kills(killed, 0.0)
+        tracker.observe([process(200, ppid=10), process(201, ppid=11), process(202, ppid=12)], 3.0)
+        self.assertEqual(tracker.stats[NAME].respawns, 3)
+
+    def test_survivors_are_not_respawns(self):
+        tracker = RespawnTracker()
+        killed, survivor = process(100, ppid=10), process(101, ppid=10)
+        tracker.observe([killed, survivor], 0.0)
+        tracker.record_kills([killed], 0.0)
+        tracker.observe([survivor], 3.0)
+        self.assertEqual(tracker.stats[NAME].respawns, 0)
+
+    def test_escalates_after_fast_respawns_of_one_instance(self):
+        tracker = RespawnTracker(escalate_after=3)
+        pid = 100
+        current = process(pid)
+        now = 0.0
+        output = tracker.observe([current], now)
+        for _ in range(3):
+            self.assertEqual(output, [])
+            tracker.record_kills([current], now)
+            pid += 1
+            now += 3.0
+            current = process(pid)
+            output = tracker.observe([current], now)
+        self.assertTrue(tracker.stats[NAME].escalated)
+        self.assertEqual(len(output), 1)
+        self.assertIn("respawned 3 times", output[0])
+
+    def test_one_respawn_each_in_several_simulators_does_not_escalate(self):
+        tracker = RespawnTracker(escalate_after=3)
+        killed = [process(100 + i, ppid=10 + i) for i in range(4)]
+        tracker.observe(killed, 0.0)
+        tracker.record_kills(killed, 0.0)
+        tracker.observe([process(200 + i, ppid=10 + i) for i in range(4)], 3.0)
+        self.assertFalse(tracker.stats[NAME].escalated)
+
+    def test_slow_respawn_resets_the_streak(self):
+        tracker = RespawnTracker(escalate_after=2, respawn_threshold=10)
+        first, second, third = process(100), process(101), process(102)
+        tracker.observe([first], 0.0)
+        tracker.record_kills([first], 0.0)
+        tracker.observe([second], 3.0)
+        tracker.record_kills([second], 3.0)
+        tracker.observe([third], 60.0)
+        self.assertFalse(tracker.stats[NAME].escalated)
+
+    def test_escalated_kills_become_throttles(self):
+        tracker = RespawnTracker("throttle")
+        tracker._stats(NAME).escalated = True
+        decision = Decision(process(100), Rule("posters", Action.KILL, ["AegirPoster"]))
+        [escalated] = tracker.escalate([decision], 0.0)
+        self.assertEqual(escalated.action, Action.THROTTLE)
+        self.assertEqual(escalated.rule.name, "posters")
+
+    def test_backoff_drops_kills_until_the_wait_is_over(self):
+        tracker = RespawnTracker("backoff", poll_interval=5.0)
+        stats = tracker._stats(NAME)
+        stats.escalated = True
+        stats.backoff = 10.0
+        tracker.record_kills([process(100)], 0.0)
+        decision = Decision(process(101), Rule("posters", Action.KILL))
+        self.assertEqual(tracker.escalate([decision], 5.0), [])
+        self.assertEqual(tracker.escalate([decision], 10.0), [decision])
+        self.assertEqual(stats.backoff, 20.0)
+
+    def test_backoff_is_capped(self):
+        tracker = RespawnTracker("backoff", poll_interval=5.0)
+        stats = tracker._stats(NAME)
+        stats.escalated = True
+        stats.backoff = 10.0
+        for pid in range(100, 130):
+            tracker.record_kills([process(pid)], 0.0)
+        self.assertEqual(stats.backoff, MAX_BACKOFF)
+        self.assertEqual(stats.next_kill_time, MAX_BACKOFF)
+
+    def test_staying_down_past_the_threshold_de_escalates(self):
+        tracker = RespawnTracker("backoff", respawn_threshold=10, escalate_after=1)
+        first = process(100)
+        tracker.observe([first], 0.0)
+        tracker.record_kills([first], 0.0)
+        second = process(101)
+        tracker.observe([second], 3.0)
+        stats = tracker.stats[NAME]
+        self.assertTrue(stats.escalated)
+        tracker.record_kills([second], 3.0)
+        [output] = tracker.observe([process(102)], 60.0)
+        self.assertIn("stayed down 57s", output)
+        self.assertFalse(stats.escalated)
+        decision = Decision(process(102), Rule("posters", Action.KILL))
+        self.assertEqual(tracker.escalate([decision], 60.0), [decision])
+
+
+if __name__ == "__main__":
+    unittest.main()
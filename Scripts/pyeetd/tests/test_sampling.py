@@ -0,0 +1,71 @@
+"""Tests for the sampling module."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from process_source import ProcessInfo
+from sampling import ProcessSampler
+
+
+def process(cpu_time, rss=0, pid=1, start_time=0.0):
+    return ProcessInfo(pid=pid, cpu_percent=0.0, memory_percent=0.0, name="daemon", is_simulator=False,
+                       cpu_time=cpu_time, rss=rss, start_time=start_time)
+
+
+class TestProcessSampler(unittest.TestCase):
+    """CPU% and memory growth come from samples within the window."""
+
+    def test_first_sample_has_no_rates(self):
+        p = ProcessSampler(60).update([process(10.0)], now=0.0)[0]
+        self.assertIsNone(p.cpu_now)
+        self.assertIsNone(p.cpu_window)
+        self.assertIsNone(p.rss_rate)
+
+    def test_rates_from_differences(self):
+        sampler = ProcessSampler(60)
+        sampler.update([process(0.0, rss=0)], now=0.0)
+        sampler.update([process(1.0, rss=1000)], now=2.0)
+        p = sampler.update([process(4.0, rss=4000)], now=4.0)[0]
+        self.assertAlmostEqual(p.cpu_now, 150.0)
+        self.assertAlmostEqual(p.cpu_window, 100.0)
+        self.assertAlmostEqual(p.rss_rate, 1000.0)
+
+    def test_window_is_a_duration_whatever_the_poll_interval(self):
+        # Busy for the first half minute, idle after: one second polls and
+        # ten second polls see the same 60 second window.
+        for interval in (1.0, 10.0):
+            with self.subTest(interval=interval):
+                sampler = ProcessSampler(60)
+                now, cpu_time = 0.0, 0.0
+                while now < 120:
+                    p = sampler.update([process(cpu_time)], now=now)[0]
+                    if now < 30:
+                        cpu_time += interval
+                    now += interval
+                self.assertAlmostEqual(p.cpu_window, 0.0)
+                history = sampler.history(p)
+                self.assertGreaterEqual(history[0].timestamp, history[-1].timestamp - 60)
+
+    def test_polls_longer_than_the_window_still_give_a_rate(self):
+        sampler = ProcessSampler(10)
+        sampler.update([process(0.0)], now=0.0)
+        p = sampler.update([process(15.0)], now=30.0)[0]
+        self.assertAlmostEqual(p.cpu_window, 50.0)
+        self.assertEqual(len(sampler.history(p)), 2)
+
+    def test_reused_pid_starts_a_fresh_history(self):
+        sampler = ProcessSampler(60)
+        sampler.update([process(100.0, start_time=1.0)], now=0.0)
+        p = sampler.update([process(1.0, start_time=2.0)], now=5.0)[0]
+        self.assertIsNone(p.cpu_window)
+
+    def test_window_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            ProcessSampler(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Throttling processes with SIGSTOP and SIGCONT instead of killing them.
+
+Killed simulator daemons are often respawned straight away, so killing them
+just makes them pay their startup cost again. `Throttler` instead duty-cycles
+each process: in every period it lets the process run for its CPU budget's
+share of the period and keeps it stopped for the rest. A budget of zero keeps
+the process stopped.
+
+Throttling is sticky: a throttled process's CPU% drops below the thresholds
+that picked it, so it stays throttled until it exits rather than flapping.
+Every throttled process is sent SIGCONT by `release_all`, which pyeetd calls
+on exit; only a SIGKILL of pyeetd itself can leave a process stopped.
+"""
+
+import math
+import os
+import signal
+from dataclasses import dataclass
+
+from process_source import ProcessInfo
+
+# The length of one stop/continue cycle, in seconds. Shorter periods track the
+# budget more smoothly at the cost of more signals.
+THROTTLE_PERIOD = 1.0
+
+
+@dataclass
+class Throttled:
+    process: ProcessInfo
+    budget: float
+    stopped: bool = False
+    next_toggle: float = 0.0
+
+    @property
+    def run_time(self) -> float:
+        return THROTTLE_PERIOD * self.budget / 100
+
+    @property
+    def stop_time(self) -> float:
+        return THROTTLE_PERIOD - self.run_time
+
+
+class Throttler:
+    """Duty-cycles processes to CPU budgets, driven by the main loop calling `tick`."""
+
+    def __init__(self, send_signal=os.kill):
+        self._send_signal = send_signal
+        self.throttled: dict[tuple[int, float], Throttled] = {}
+
+    def throttle(self, p: ProcessInfo, budget: float, now: float) -> bool:
+        """Start throttling a process to `budget` percent of a CPU.
+
+        Returns whether the process was newly throttled, as opposed to
+        already being throttled or having exited.
+        """
+        if p.key in self.throttled:
+            return False
+        entry = Throttled(p, budget, next_toggle=now)
+        self.throttled[p.key] = entry
+        self._toggle(entry, now)
+        return p.key in self.throttled
+
+    def update(self, processes: list[ProcessInfo]) -> None:
+        """Forget processes that are no longer running."""
+        running = {p.key for p in processes}
+        for key in [key for key in self.throttled if key not in running]:
+            del self.throttled[key]
+
+    def next_deadline(self) -> float:
+        """When `tick` next needs to run, or infinity if nothing is throttled."""
+        return min((entry.next_toggle for entry in self.throttled.values()), default=math.inf)
+
+    def tick(self, now: float) -> None:
+        """Stop or continue every process whose run or stop time is up."""
+        for entry in list(self.throttled.values()):
+            if entry.next_toggle <= now:
+                self._toggle(entry, now)
+
+    def release_all(self) -> list[ProcessInfo]:
+        """Continue every throttled process and stop tracking them."""
+        released = []
+        for entry in self.throttled.values():
+            if entry.stopped:
+                try:
+                    self._send_signal(entry.process.pid, signal.SIGCONT)
+                except OSError:
+                    pass  # Exited while stopped.
+            released.append(entry.process)
+        self.throttled.clear()
+        return released
+
+    def _toggle(self, entry: Throttled, now: float) -> None:
+        stop = not entry.stopped
+        try:
+            self._send_signal(entry.process.pid, signal.SIGSTOP if stop else signal.SIGCONT)
+        except OSError:
+            # Gone, or not ours to signal; either way it can't be throttled.
+            del self.throttled[entry.process.key]
+            return
+        entry.stopped = stop
+        if stop:
+            # A zero budget stays stopped until released.
+            entry.next_toggle = now + entry.stop_time if entry.run_time > 0 else math.inf
+        else:
+            entry.next_toggle = now + entry.run_time
@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+# Runs the Python unit tests for pyeetd.
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+cd "${SCRIPT_DIR}/pyeetd"
+python3 -m unittest discover -s tests -v